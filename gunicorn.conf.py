@@ -0,0 +1,34 @@
+"""
+Gunicorn settings of the production profile, overridable from the environment.
+
+WSGI (default) runs threaded workers; every thread keeps one persistent
+database connection, so workers * threads must stay below the Postgres
+max_connections. For ASGI set:
+
+    GUNICORN_APP=train_station_api_service.asgi:application
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+    DB_CONN_MAX_AGE=0
+"""
+import multiprocessing
+import os
+
+
+wsgi_app = os.environ.get("GUNICORN_APP", "train_station_api_service.wsgi:application")
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(
+    os.environ.get("GUNICORN_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 9))
+)
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Restart workers now and then so the in-process indexes and any leaked
+# memory don't grow without bound; jitter keeps them from restarting at once
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = timeout
+keepalive = 5
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
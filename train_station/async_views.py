@@ -0,0 +1,262 @@
+import math
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from train_station.caching import (
+    conditional_response,
+    make_etag,
+    response_cache,
+    set_validators,
+)
+from train_station.fast_serializers import JourneySummaryValuesSerializer
+from train_station.models import Journey, JourneySummary
+from train_station.planner import Connection, plan_itineraries
+from train_station.serializers import (
+    ItinerarySerializer,
+    JourneyDetailSerializer,
+    JourneyPlanQuerySerializer,
+    JourneySeatMapSerializer,
+    JourneySummarySerializer,
+)
+from train_station.timetable import get_timetable
+from train_station.views import (
+    JourneyPagination,
+    JourneyPlanView,
+    JourneyViewSet,
+    RouteViewSet,
+    StationViewSet,
+    TrainViewSet,
+    filter_journeys,
+    itinerary_data,
+    journey_connections,
+    journey_list_etag,
+)
+
+
+class AsyncReadView(View):
+    """
+    Read-only endpoint served natively under ASGI.
+
+    Requests go through the DRF authentication and throttle classes and
+    must be authenticated, like the read side of the viewsets. Responses
+    are rendered exactly as the DRF views render them.
+    """
+
+    query_budget = None
+
+    async def get(self, request, *args, **kwargs):
+        request = Request(
+            request,
+            authenticators=[
+                authentication()
+                for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            ],
+        )
+        try:
+            await sync_to_async(self.check_request)(request)
+            return await self.read(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.error_response(request, exc)
+
+    async def read(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def check_request(self, request):
+        if not request.user or not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if not throttle.allow_request(request, self):
+                raise exceptions.Throttled(throttle.wait())
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            JSONRenderer().render(data),
+            content_type="application/json",
+            status=status,
+            headers=headers,
+        )
+
+    def error_response(self, request, exc):
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            headers["WWW-Authenticate"] = request.authenticators[0].authenticate_header(
+                request
+            )
+        if getattr(exc, "wait", None) is not None:
+            headers["Retry-After"] = str(math.ceil(exc.wait))
+
+        detail = exc.detail
+        if not isinstance(detail, (list, dict)):
+            detail = {"detail": detail}
+        return self.render(detail, status=exc.status_code, headers=headers)
+
+
+class AsyncCachedListView(AsyncReadView):
+    """
+    Unpaginated list read with the async ORM. ``cache_name`` is the
+    viewset's basename, so cache entries are shared with its ``list``.
+    """
+
+    viewset = None
+    cache_name = None
+    query_budget = 2
+
+    async def read(self, request):
+        key, data = await sync_to_async(self.cache_lookup)(request)
+        if data is not None:
+            await sync_to_async(response_cache.count)(self.cache_name, "hits")
+            return self.render(data, headers={"X-Cache": "HIT"})
+
+        instances = [instance async for instance in self.viewset.queryset.all()]
+        data = self.viewset.serializer_class(instances, many=True).data
+
+        await sync_to_async(response_cache.set)(key, data)
+        await sync_to_async(response_cache.count)(self.cache_name, "misses")
+        return self.render(data, headers={"X-Cache": "MISS"})
+
+    def cache_lookup(self, request):
+        key = response_cache.key(self.cache_name, self.viewset.cache_models, request)
+        return key, response_cache.get(key)
+
+
+class AsyncStationListView(AsyncCachedListView):
+    viewset = StationViewSet
+    cache_name = "station"
+
+
+class AsyncRouteListView(AsyncCachedListView):
+    viewset = RouteViewSet
+    cache_name = "route"
+
+
+class AsyncTrainListView(AsyncCachedListView):
+    viewset = TrainViewSet
+    cache_name = "train"
+
+
+class AsyncJourneyListView(AsyncReadView):
+    """Same filters, cursor pagination and validators as the journey list"""
+
+    query_budget = JourneyViewSet.query_budget["list"]
+
+    async def read(self, request):
+        params = request.query_params
+        etag = await sync_to_async(journey_list_etag)(params)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = await sync_to_async(filter_journeys)(
+            JourneySummary.objects.all(), params, use_timetable=True
+        )
+        if settings.FAST_LIST_SERIALIZATION:
+            queryset = JourneySummaryValuesSerializer.values(queryset)
+
+        paginator = JourneyPagination()
+        # DRF paginators are synchronous; the page query runs in the
+        # thread-sensitive executor, same as the async ORM in Django 4.2
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, request, self)
+        if settings.FAST_LIST_SERIALIZATION:
+            results = JourneySummaryValuesSerializer.serialize(page)
+        else:
+            results = JourneySummarySerializer(page, many=True).data
+
+        response = self.render(paginator.get_paginated_response(results).data)
+        return set_validators(response, etag)
+
+
+class AsyncJourneyDetailView(AsyncReadView):
+    query_budget = JourneyViewSet.query_budget["retrieve"]
+
+    async def read(self, request, pk):
+        last_modified = (
+            await Journey.objects.filter(pk=pk)
+            .values_list("updated_at", flat=True)
+            .afirst()
+        )
+        if last_modified is None:
+            raise exceptions.NotFound()
+
+        etag = make_etag(str(pk), last_modified)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            journey = await (
+                JourneyViewSet.queryset.select_related(
+                    "route__source", "route__destination"
+                )
+                .prefetch_related("tickets")
+                .aget(pk=pk)
+            )
+        except Journey.DoesNotExist:
+            raise exceptions.NotFound()
+
+        response = self.render(JourneyDetailSerializer(journey).data)
+        return set_validators(response, etag)
+
+
+class AsyncJourneySeatsView(AsyncReadView):
+    """Seat availability bitmap of a journey"""
+
+    query_budget = JourneyViewSet.query_budget["seats"]
+
+    async def read(self, request, pk):
+        try:
+            journey = await Journey.objects.select_related("train").aget(pk=pk)
+        except Journey.DoesNotExist:
+            raise exceptions.NotFound()
+
+        return self.render(JourneySeatMapSerializer(journey).data)
+
+
+class AsyncJourneyPlanView(AsyncReadView):
+    """Itineraries connecting journeys through intermediate stations"""
+
+    query_budget = JourneyPlanView.query_budget
+
+    async def read(self, request):
+        query = JourneyPlanQuerySerializer(data=request.query_params)
+        await sync_to_async(query.is_valid)(raise_exception=True)
+        depart_after = query.validated_data.get("depart_after") or timezone.now()
+
+        if settings.JOURNEY_TIMETABLE_INDEX:
+            connections = (await sync_to_async(get_timetable)()).connections(
+                depart_after, depart_after + settings.PLANNER_SEARCH_WINDOW
+            )
+        else:
+            connections = [
+                Connection(*journey)
+                async for journey in journey_connections(depart_after)
+            ]
+
+        itineraries = plan_itineraries(
+            connections,
+            origin=query.validated_data["from"],
+            destination=query.validated_data["to"],
+            depart_after=depart_after,
+            min_transfer=timedelta(minutes=query.validated_data["min_transfer"]),
+            limit=query.validated_data["limit"],
+        )
+        journeys = await JourneyPlanView.queryset.ain_bulk(
+            {leg.journey_id for legs in itineraries for leg in legs}
+        )
+        serializer = ItinerarySerializer(
+            itinerary_data(itineraries, journeys), many=True
+        )
+
+        return self.render(serializer.data)
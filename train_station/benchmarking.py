@@ -0,0 +1,74 @@
+import json
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+
+
+class LatencyStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.outcomes = {}
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+
+    def stop(self):
+        self.finished_at = time.perf_counter()
+
+    def record(self, seconds, outcome="ok"):
+        with self._lock:
+            self.latencies.append(seconds)
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def percentile(self, percent) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[rank]
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        return {
+            "requests": count,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "mean": round(sum(self.latencies) / count * 1000, 2) if count else 0.0,
+                "p50": round(self.percentile(50) * 1000, 2),
+                "p90": round(self.percentile(90) * 1000, 2),
+                "p99": round(self.percentile(99) * 1000, 2),
+            },
+            "outcomes": dict(self.outcomes),
+        }
+
+
+def http_request(method, url, data=None, headers=None, timeout=30):
+    """``(status, parsed JSON body)``, status 0 when the server can't be reached"""
+    request = urllib.request.Request(
+        url,
+        data=None if data is None else json.dumps(data).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        method=method,
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as exc:
+        status, body = exc.code, exc.read()
+    except (urllib.error.URLError, OSError):
+        return 0, None
+
+    try:
+        return status, json.loads(body) if body else None
+    except ValueError:
+        return status, None
@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.dispatch import Signal
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from train_station.serializers import BatchListSerializer
+
+
+# Sent after a bulk write, in place of the per-object post_save signals that
+# bulk_create/bulk_update skip. Arguments: instances, created.
+bulk_saved = Signal()
+
+
+class BulkListSerializer(BatchListSerializer):
+    """
+    Validates a whole batch with a fixed number of queries and writes it with
+    bulk_create/bulk_update. Errors are returned per item, aligned with the
+    payload ({} for valid items).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unique_fields = []
+        for name, field in self.child.fields.items():
+            unique_validators = [
+                validator
+                for validator in field.validators
+                if isinstance(validator, UniqueValidator)
+            ]
+            if unique_validators:
+                # Checked once for the whole batch in validate_unique
+                field.validators = [
+                    validator
+                    for validator in field.validators
+                    if validator not in unique_validators
+                ]
+                self.unique_fields.append((name, field.source))
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        self.load_related_objects(data)
+        items, errors = [], []
+        for index, item in enumerate(data):
+            self.child.instance = self.instance[index] if self.instance else None
+            try:
+                if self.instance is not None and self.child.instance is None:
+                    raise ValidationError({"id": ["Not found."]})
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except ValidationError as exc:
+                items.append(None)
+                errors.append(exc.detail)
+        self.child.instance = None
+
+        self.validate_unique(items, errors)
+        if any(errors):
+            raise ValidationError(errors)
+
+        return items
+
+    def validate_unique(self, items, errors):
+        model = self.child.Meta.model
+        excluded = [instance.pk for instance in self.instance or () if instance]
+        for name, source in self.unique_fields:
+            values = {}
+            for index, item in enumerate(items):
+                if item is None or source not in item:
+                    continue
+                if item[source] in values:
+                    errors[index].setdefault(name, []).append(
+                        f"Duplicates item {values[item[source]]} of this batch."
+                    )
+                else:
+                    values[item[source]] = index
+
+            existing = (
+                model.objects.filter(**{f"{source}__in": list(values)})
+                .exclude(pk__in=excluded)
+                .values_list(source, flat=True)
+            )
+            for value in existing:
+                errors[values[value]].setdefault(name, []).append(
+                    f"{model._meta.verbose_name} with this {name} already exists."
+                )
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = model.objects.bulk_create(
+            [model(**attrs) for attrs in validated_data]
+        )
+        bulk_saved.send(sender=model, instances=instances, created=True)
+        return instances
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for instance, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            fields.update(attrs)
+        if fields:
+            model.objects.bulk_update(instances, fields=sorted(fields))
+        bulk_saved.send(sender=model, instances=instances, created=False)
+        return instances
+
+
+class BulkMixin:
+    """
+    ``POST bulk/`` creates and ``PATCH bulk/`` partially updates a list of
+    objects in one transaction. Updated items are matched by their ``id``.
+    """
+
+    bulk_max_items = 1000
+
+    def get_bulk_serializer(self, instances=None, **kwargs):
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return BulkListSerializer(
+            instances,
+            child=serializer_class(
+                context=context, partial=kwargs.get("partial", False)
+            ),
+            context=context,
+            max_length=self.bulk_max_items,
+            **kwargs,
+        )
+
+    def get_bulk_instances(self, data):
+        if not isinstance(data, list):
+            return None
+        ids = [item.get("id") if isinstance(item, dict) else None for item in data]
+        instances = self.get_queryset().in_bulk(
+            [pk for pk in ids if isinstance(pk, int)]
+        )
+        return [instances.get(pk) if isinstance(pk, int) else None for pk in ids]
+
+    @action(methods=["POST", "PATCH"], detail=False, url_path="bulk")
+    def bulk(self, request):
+        if request.method == "POST":
+            serializer = self.get_bulk_serializer(data=request.data)
+            response_status = status.HTTP_201_CREATED
+        else:
+            serializer = self.get_bulk_serializer(
+                self.get_bulk_instances(request.data),
+                data=request.data,
+                partial=True,
+            )
+            response_status = status.HTTP_200_OK
+
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=response_status)
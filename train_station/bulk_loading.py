@@ -0,0 +1,17 @@
+import time
+from itertools import islice
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class BulkLoadReportMixin:
+    """Progress lines of the management commands writing rows in bulk"""
+
+    def report(self, label, rows, started_at):
+        elapsed = time.perf_counter() - started_at
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(f"{label}: {rows} rows in {elapsed:.1f}s ({rate:.0f} rows/s)")
@@ -0,0 +1,127 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, quote_etag
+from rest_framework.response import Response
+
+
+class ResponseCache:
+    """
+    Caches serialized list responses per endpoint and query string.
+
+    Every key embeds the version counters of the models the response is
+    built from, so bumping a counter on write invalidates all cached
+    responses depending on that model at once.
+    """
+
+    prefix = "response-cache"
+
+    @property
+    def cache(self):
+        return caches[settings.RESPONSE_CACHE["CACHE"]]
+
+    @property
+    def timeout(self):
+        return settings.RESPONSE_CACHE["TIMEOUT"]
+
+    def version_key(self, model):
+        return f"{self.prefix}:version:{model._meta.label_lower}"
+
+    def versions(self, models):
+        version_keys = [self.version_key(model) for model in models]
+        versions = self.cache.get_many(version_keys)
+        return ".".join(str(versions.get(key, 0)) for key in version_keys)
+
+    def key(self, name, models, request):
+        query = hashlib.md5(
+            "&".join(
+                f"{param}={value}"
+                for param, values in sorted(request.query_params.lists())
+                for value in values
+            ).encode()
+        ).hexdigest()
+        return "{}:{}:{}:{}".format(self.prefix, name, self.versions(models), query)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=self.timeout)
+
+    def invalidate(self, model):
+        key = self.version_key(model)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            pass
+
+    def count(self, name, outcome):
+        key = f"{self.prefix}:{outcome}:{name}"
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            pass
+
+    def stats(self, names):
+        keys = {
+            f"{self.prefix}:{outcome}:{name}": (name, outcome)
+            for name in names
+            for outcome in ("hits", "misses")
+        }
+        stats = {name: {"hits": 0, "misses": 0} for name in names}
+        for key, value in self.cache.get_many(list(keys)).items():
+            name, outcome = keys[key]
+            stats[name][outcome] = value
+        return stats
+
+
+response_cache = ResponseCache()
+
+
+class CachedListMixin:
+    """
+    Serves ``list`` from the response cache. ``cache_models`` lists every
+    model the list is serialized from, writes to any of them invalidate it.
+    """
+
+    cache_models = ()
+
+    @property
+    def cache_name(self):
+        return self.basename
+
+    def list(self, request, *args, **kwargs):
+        key = response_cache.key(self.cache_name, self.cache_models, request)
+        data = response_cache.get(key)
+        if data is not None:
+            response_cache.count(self.cache_name, "hits")
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response_cache.set(key, response.data)
+        response_cache.count(self.cache_name, "misses")
+        response["X-Cache"] = "MISS"
+        return response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def set_validators(response, etag):
+    # No Last-Modified, HTTP dates have whole seconds and two writes within
+    # the same second would answer If-Modified-Since with a stale 304
+    response["ETag"] = etag
+    return response
+
+
+def conditional_response(request, etag):
+    """A 304 (or 412) response if the client's ETag still matches"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_validators(response, etag)
+    return response
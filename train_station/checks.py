@@ -0,0 +1,14 @@
+from django.core.checks import Error, Tags, register
+from django.core.checks.security.base import check_secret_key
+
+
+@register(Tags.security, deploy=True)
+def check_deploy_secret_key(app_configs, **kwargs):
+    """
+    security.W009 as an error, so ``check --deploy`` fails on a weak key
+    while the HTTPS warnings of a plain HTTP deployment stay warnings
+    """
+    return [
+        Error(warning.msg, hint=warning.hint, id="train_station.E001")
+        for warning in check_secret_key(app_configs)
+    ]
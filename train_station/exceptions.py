@@ -0,0 +1,19 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatsAlreadyTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already taken."
+    default_code = "seats_taken"
+
+    def __init__(self, seats):
+        super().__init__()
+        self.seats = sorted(seats)
+        self.detail = {
+            "detail": self.detail,
+            "taken_seats": [
+                {"journey": journey_id, "cargo": cargo, "seat": seat}
+                for journey_id, cargo, seat in self.seats
+            ],
+        }
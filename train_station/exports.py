@@ -0,0 +1,45 @@
+import csv
+import json
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File-like object that hands each written line back to csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(
+            [
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row
+            ]
+        )
+
+
+def ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + "\n"
+
+
+def export_response(name, header, rows, output):
+    """Streams ``rows`` (tuples matching ``header``) as a CSV or NDJSON download"""
+    lines = csv_lines(header, rows) if output == "csv" else ndjson_lines(header, rows)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[output])
+    response["Content-Disposition"] = f'attachment; filename="{name}.{output}"'
+    return response
@@ -0,0 +1,218 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import F
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from train_station.models import Journey, Ticket
+from train_station.serializers import (
+    JourneyListSerializer,
+    JourneySummarySerializer,
+    OrderListSerializer,
+    TicketListSerializer,
+)
+
+
+# Fields whose to_representation() is a no-op for the values the database
+# driver already returns
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.JSONField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def iso_datetime_converter(field):
+    """Equivalent of DateTimeField.to_representation with the timezone resolved"""
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def get_converter(field):
+    if type(field) in PASSTHROUGH_FIELDS:
+        return None
+
+    if (
+        isinstance(field, serializers.DateTimeField)
+        and str(getattr(field, "format", api_settings.DATETIME_FORMAT)).lower()
+        == ISO_8601
+    ):
+        return iso_datetime_converter(field)
+
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """Builds the output of ``serializer_class(many=True)`` from .values() rows
+
+    The plain fields are compiled once into (name, lookup, field) extractors.
+    ``lookups`` overrides the values() lookup of a field, ``annotations``
+    computes fields that are model properties, and fields listed in
+    ``nested`` are filled in afterwards by ``attach``.
+    """
+
+    serializer_class = None
+    lookups = {}
+    annotations = {}
+    nested = ()
+    extra = ()
+
+    _extractors = {}
+
+    @classmethod
+    def get_extractors(cls):
+        if cls not in ValuesSerializer._extractors:
+            ValuesSerializer._extractors[cls] = [
+                (name, cls.lookups.get(name, field.source.replace(".", "__")), field)
+                for name, field in cls.serializer_class().fields.items()
+                if name not in cls.nested
+            ]
+        return ValuesSerializer._extractors[cls]
+
+    @classmethod
+    def values(cls, queryset):
+        lookups = [lookup for _, lookup, _ in cls.get_extractors()]
+        return (
+            queryset.prefetch_related(None)
+            .annotate(**cls.annotations)
+            .values(*lookups, *cls.extra)
+        )
+
+    @classmethod
+    def serialize(cls, rows):
+        # Converters are resolved per call so they pick up the active timezone
+        extractors = [
+            (name, lookup, get_converter(field))
+            for name, lookup, field in cls.get_extractors()
+        ]
+        data = [
+            {
+                name: (
+                    row[lookup]
+                    if convert is None or row[lookup] is None
+                    else convert(row[lookup])
+                )
+                for name, lookup, convert in extractors
+            }
+            for row in rows
+        ]
+        if cls.nested:
+            cls.attach(rows, data)
+        return data
+
+    @classmethod
+    def attach(cls, rows, data):
+        raise NotImplementedError
+
+
+class JourneySummaryValuesSerializer(ValuesSerializer):
+    serializer_class = JourneySummarySerializer
+    annotations = {"seats_available": F("capacity") - F("tickets_sold")}
+
+
+class JourneyValuesSerializer(ValuesSerializer):
+    serializer_class = JourneyListSerializer
+    lookups = {"train_type": "train__train_type__name"}
+    annotations = {
+        "seats_available": (
+            F("train__cargo_num") * F("train__places_in_cargo") - F("tickets_sold")
+        )
+    }
+    nested = ("crews",)
+
+    @classmethod
+    def attach(cls, rows, data):
+        crews = defaultdict(list)
+        for journey_id, first_name, last_name in (
+            Journey.crews.through.objects.filter(
+                journey_id__in=[row["id"] for row in rows]
+            )
+            .order_by("id")
+            .values_list("journey_id", "crew__first_name", "crew__last_name")
+        ):
+            crews[journey_id].append(f"{first_name} {last_name}")
+
+        for item in data:
+            item["crews"] = crews[item["id"]]
+
+
+class TicketValuesSerializer(ValuesSerializer):
+    serializer_class = TicketListSerializer
+    nested = ("journey",)
+    extra = ("journey_id", "order_id")
+
+    @classmethod
+    def attach(cls, rows, data):
+        journey_rows = JourneyValuesSerializer.values(
+            Journey.objects.filter(
+                pk__in={row["journey_id"] for row in rows}
+            ).order_by()
+        )
+        journeys = {
+            journey["id"]: journey
+            for journey in JourneyValuesSerializer.serialize(list(journey_rows))
+        }
+
+        for row, item in zip(rows, data):
+            item["journey"] = journeys[row["journey_id"]]
+
+
+class OrderValuesSerializer(ValuesSerializer):
+    serializer_class = OrderListSerializer
+    nested = ("tickets",)
+
+    @classmethod
+    def attach(cls, rows, data):
+        ticket_rows = list(
+            TicketValuesSerializer.values(
+                Ticket.objects.filter(order_id__in=[row["id"] for row in rows])
+            )
+        )
+        tickets = defaultdict(list)
+        for ticket_row, ticket in zip(
+            ticket_rows, TicketValuesSerializer.serialize(ticket_rows)
+        ):
+            tickets[ticket_row["order_id"]].append(ticket)
+
+        for item in data:
+            item["tickets"] = tickets[item["id"]]
+
+
+class ValuesListMixin:
+    """List action that serializes through ``values_serializer_class``
+
+    Only used when FAST_LIST_SERIALIZATION is enabled; the output is the
+    same as the regular list serializer.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        values_serializer = self.values_serializer_class
+        queryset = values_serializer.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+
+        return Response(values_serializer.serialize(list(queryset)))
@@ -0,0 +1,107 @@
+import heapq
+import math
+from collections import defaultdict, namedtuple
+
+from train_station.indexes import ProcessLocalIndex
+from train_station.models import Station
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+StationPoint = namedtuple("StationPoint", ("id", "name", "latitude", "longitude"))
+
+
+def haversine_km(latitude, longitude, other_latitude, other_longitude) -> float:
+    latitude, longitude, other_latitude, other_longitude = map(
+        math.radians, (latitude, longitude, other_latitude, other_longitude)
+    )
+    a = (
+        math.sin((other_latitude - latitude) / 2) ** 2
+        + math.cos(latitude)
+        * math.cos(other_latitude)
+        * math.sin((other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StationGridIndex(ProcessLocalIndex):
+    """
+    Stations bucketed into a grid of ``cell_size`` degree cells, so that a
+    radius search only measures the stations of the cells around the point.
+    Rebuilt on next use after any station change.
+    """
+
+    version_key = "station-grid-index:version"
+
+    def __init__(self, cell_size=0.5):
+        super().__init__()
+        self.cell_size = cell_size
+        self.lon_cells = math.ceil(360 / cell_size)
+        self._cells = defaultdict(list)
+
+    def load(self):
+        cells = defaultdict(list)
+        for point in Station.objects.order_by().values_list(
+            "id", "name", "latitude", "longitude"
+        ):
+            point = StationPoint(*point)
+            cells[self._cell(point.latitude, point.longitude)].append(point)
+        self._cells = cells
+
+    def _cell(self, latitude, longitude):
+        return (
+            math.floor(latitude / self.cell_size),
+            math.floor(longitude / self.cell_size) % self.lon_cells,
+        )
+
+    def _candidates(self, latitude, longitude, radius_km):
+        lat_span = radius_km / KM_PER_DEGREE
+        lat_cos = math.cos(math.radians(min(abs(latitude) + lat_span, 90)))
+        lon_span = radius_km / (KM_PER_DEGREE * lat_cos) if lat_cos > 1e-6 else 360
+
+        min_lat, max_lat = (
+            math.floor((latitude - lat_span) / self.cell_size),
+            math.floor((latitude + lat_span) / self.cell_size),
+        )
+        if lon_span >= 180:
+            lon_cells = range(self.lon_cells)
+        else:
+            lon_cells = {
+                cell % self.lon_cells
+                for cell in range(
+                    math.floor((longitude - lon_span) / self.cell_size),
+                    math.floor((longitude + lon_span) / self.cell_size) + 1,
+                )
+            }
+
+        if (max_lat - min_lat + 1) * len(lon_cells) > len(self._cells):
+            for points in self._cells.values():
+                yield from points
+            return
+
+        for lat_cell in range(min_lat, max_lat + 1):
+            for lon_cell in lon_cells:
+                yield from self._cells.get((lat_cell, lon_cell), ())
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        """``(station, distance_km)`` pairs within the radius, nearest first"""
+        with self._lock:
+            candidates = list(self._candidates(latitude, longitude, radius_km))
+
+        found = []
+        for point in candidates:
+            distance = haversine_km(
+                latitude, longitude, point.latitude, point.longitude
+            )
+            if distance <= radius_km:
+                found.append((point, distance))
+
+        return heapq.nsmallest(limit, found, key=lambda item: (item[1], item[0].id))
+
+
+station_grid = StationGridIndex()
+
+
+def get_station_grid() -> StationGridIndex:
+    return station_grid.ensure_fresh()
@@ -0,0 +1,250 @@
+import functools
+import heapq
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+class BaseSeatHoldBackend:
+    """
+    Keeps short-lived seat holds outside of the database.
+
+    Seats are ``(journey_id, cargo, seat)`` tuples, holds are dicts with
+    ``id``, ``journey``, ``user``, ``seats`` and ``expires_at`` keys.
+    """
+
+    def __init__(self, ttl=600, **options):
+        self.ttl = ttl
+
+    def acquire(self, journey_id, seats, user_id):
+        """Returns ``(hold, conflicting_seats)``, only one of them is set"""
+        raise NotImplementedError
+
+    def get(self, hold_id):
+        raise NotImplementedError
+
+    def release(self, hold_id, user_id) -> bool:
+        raise NotImplementedError
+
+    def release_seats(self, seats, user_id):
+        raise NotImplementedError
+
+    def holders(self, seats) -> dict:
+        """Maps every held seat of ``seats`` to the id of the holding user"""
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Drops expired holds, returns how many were removed"""
+        return 0
+
+    def new_hold(self, journey_id, seats, user_id):
+        return {
+            "id": uuid.uuid4().hex,
+            "journey": journey_id,
+            "user": user_id,
+            "seats": [{"cargo": cargo, "seat": seat} for _, cargo, seat in seats],
+            "expires_at": timezone.now() + timedelta(seconds=self.ttl),
+        }
+
+    @staticmethod
+    def hold_seats(hold):
+        return [
+            (hold["journey"], seat["cargo"], seat["seat"]) for seat in hold["seats"]
+        ]
+
+
+class LocalSeatHoldBackend(BaseSeatHoldBackend):
+    """Process-local stand-in for tests and single-process development"""
+
+    def __init__(self, ttl=600, **options):
+        super().__init__(ttl=ttl, **options)
+        self._lock = threading.Lock()
+        self._holds = {}
+        self._seats = {}
+        self._expiry = []
+
+    def acquire(self, journey_id, seats, user_id):
+        with self._lock:
+            self._sweep()
+            conflicts = {
+                seat
+                for seat in seats
+                if seat in self._seats
+                and self._holds[self._seats[seat]]["user"] != user_id
+            }
+            if conflicts:
+                return None, conflicts
+
+            hold = self.new_hold(journey_id, seats, user_id)
+            self._holds[hold["id"]] = hold
+            for seat in seats:
+                # Seats of the user's earlier holds stay with those holds
+                self._seats.setdefault(seat, hold["id"])
+            heapq.heappush(self._expiry, (hold["expires_at"], hold["id"]))
+            return hold, set()
+
+    def get(self, hold_id):
+        with self._lock:
+            self._sweep()
+            return self._holds.get(hold_id)
+
+    def release(self, hold_id, user_id):
+        with self._lock:
+            self._sweep()
+            hold = self._holds.get(hold_id)
+            if hold is None or hold["user"] != user_id:
+                return False
+            self._drop(hold)
+            return True
+
+    def release_seats(self, seats, user_id):
+        with self._lock:
+            for seat in seats:
+                hold = self._holds.get(self._seats.get(seat))
+                if hold is None or hold["user"] != user_id:
+                    continue
+                del self._seats[seat]
+                _, cargo, place = seat
+                hold["seats"].remove({"cargo": cargo, "seat": place})
+                if not hold["seats"]:
+                    del self._holds[hold["id"]]
+
+    def holders(self, seats):
+        with self._lock:
+            self._sweep()
+            return {
+                seat: self._holds[self._seats[seat]]["user"]
+                for seat in seats
+                if seat in self._seats
+            }
+
+    def sweep(self):
+        with self._lock:
+            return self._sweep()
+
+    def _sweep(self):
+        now = timezone.now()
+        swept = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, hold_id = heapq.heappop(self._expiry)
+            hold = self._holds.get(hold_id)
+            if hold is not None:
+                self._drop(hold)
+                swept += 1
+        return swept
+
+    def _drop(self, hold):
+        del self._holds[hold["id"]]
+        for seat in self.hold_seats(hold):
+            if self._seats.get(seat) == hold["id"]:
+                del self._seats[seat]
+
+
+class CacheSeatHoldBackend(BaseSeatHoldBackend):
+    """
+    Stores holds in a Django cache, one key per held seat claimed with the
+    atomic ``add``. Every key is written with the hold's TTL, so once a hold
+    expires its seats are free on the next read, without a write or a sweep.
+    There is no per-journey index that could keep expired holds around.
+    """
+
+    def __init__(self, ttl=600, cache="default", key_prefix="seat-hold", **options):
+        super().__init__(ttl=ttl, **options)
+        self.cache_alias = cache
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def seat_key(self, seat):
+        return "{}:{}:{}:{}".format(self.key_prefix, *seat)
+
+    def hold_key(self, hold_id):
+        return f"{self.key_prefix}:{hold_id}"
+
+    def acquire(self, journey_id, seats, user_id):
+        hold = self.new_hold(journey_id, seats, user_id)
+        claimed = []
+        conflicts = set()
+        owner = (hold["id"], user_id)
+        for seat in seats:
+            key = self.seat_key(seat)
+            if self.cache.add(key, owner, timeout=self.ttl):
+                claimed.append(key)
+                continue
+            current = self.cache.get(key)
+            if current is None and self.cache.add(key, owner, timeout=self.ttl):
+                # Expired between the two calls
+                claimed.append(key)
+            elif current is None or current[1] != user_id:
+                conflicts.add(seat)
+            # Seats of the user's earlier holds stay claimed by those holds
+
+        if conflicts:
+            self.cache.delete_many(claimed)
+            return None, conflicts
+
+        self.cache.set(self.hold_key(hold["id"]), hold, timeout=self.ttl)
+        return hold, set()
+
+    def get(self, hold_id):
+        hold = self.cache.get(self.hold_key(hold_id))
+        if hold is not None and hold["expires_at"] <= timezone.now():
+            # Caches rounding timeouts up to whole seconds keep it a bit longer
+            self.cache.delete(self.hold_key(hold_id))
+            return None
+        return hold
+
+    def release(self, hold_id, user_id):
+        hold = self.get(hold_id)
+        if hold is None or hold["user"] != user_id:
+            return False
+
+        keys = [self.seat_key(seat) for seat in self.hold_seats(hold)]
+        self.cache.delete_many(
+            [
+                key
+                for key, (owner_hold_id, _) in self.cache.get_many(keys).items()
+                if owner_hold_id == hold_id
+            ]
+        )
+        self.cache.delete(self.hold_key(hold_id))
+        return True
+
+    def release_seats(self, seats, user_id):
+        keys = [self.seat_key(seat) for seat in seats]
+        self.cache.delete_many(
+            [
+                key
+                for key, (_, owner_id) in self.cache.get_many(keys).items()
+                if owner_id == user_id
+            ]
+        )
+
+    def holders(self, seats):
+        keys = {self.seat_key(seat): seat for seat in seats}
+        return {
+            keys[key]: owner_id
+            for key, (_, owner_id) in self.cache.get_many(list(keys)).items()
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def get_seat_hold_backend() -> BaseSeatHoldBackend:
+    options = dict(settings.SEAT_HOLDS)
+    backend_class = import_string(options.pop("BACKEND"))
+    return backend_class(**{key.lower(): value for key, value in options.items()})
+
+
+@receiver(setting_changed)
+def reset_seat_hold_backend(setting, **kwargs):
+    if setting == "SEAT_HOLDS":
+        get_seat_hold_backend.cache_clear()
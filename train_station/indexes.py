@@ -0,0 +1,64 @@
+import threading
+import time
+
+from django.core.cache import cache
+
+
+class ProcessLocalIndex:
+    """
+    In-memory index shared by the threads of one process.
+
+    Writes in this process may be applied incrementally; writes elsewhere
+    bump a version counter in the shared cache, and a process that sees
+    another version than its own reloads the index on next use.
+    """
+
+    version_key = None
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def ensure_fresh(self):
+        version = self._shared_version()
+        with self._lock:
+            if self.version != version:
+                self.load()
+                self.version = version
+        return self
+
+    def invalidate(self):
+        self._bump_version()
+        with self._lock:
+            self.version = None
+
+    def apply(self, change, *args):
+        with self._lock:
+            expected = self.version
+            version = self._bump_version()
+            if expected is None:
+                return
+            if version is not None and version == expected + 1:
+                change(*args)
+                self.version = version
+            else:
+                self.version = None
+
+    def _shared_version(self):
+        self._init_version()
+        return cache.get(self.version_key, 0)
+
+    def _bump_version(self):
+        self._init_version()
+        try:
+            return cache.incr(self.version_key)
+        except ValueError:
+            return None
+
+    def _init_version(self):
+        # Starts from the clock, not 0, so a flushed or evicted counter can't
+        # come back at a version some process already holds
+        cache.add(self.version_key, time.time_ns(), timeout=None)
@@ -0,0 +1,124 @@
+import json
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from train_station.benchmarking import LatencyStats
+from train_station.exceptions import SeatsAlreadyTaken
+from train_station.models import Station, Route, TrainType, Train, Journey
+from train_station.serializers import OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammers a single throwaway journey with concurrent orders and reports "
+        "throughput and conflict rate"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--orders", type=int, default=50, help="Per thread")
+        parser.add_argument("--tickets", type=int, default=2, help="Per order")
+        parser.add_argument("--cargos", type=int, default=2)
+        parser.add_argument("--places", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        journey, users = self.create_fixtures(options)
+        stats = LatencyStats()
+        threads = [
+            threading.Thread(
+                target=self.book,
+                args=(journey, user, stats, random.Random(options["seed"] + number)),
+                kwargs={"orders": options["orders"], "tickets": options["tickets"]},
+            )
+            for number, user in enumerate(users)
+        ]
+
+        try:
+            stats.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stats.stop()
+        finally:
+            self.delete_fixtures(journey, users)
+
+        summary = stats.summary()
+        summary["threads"] = options["threads"]
+        summary["conflict_rate"] = round(
+            summary["outcomes"].get("conflict", 0) / max(summary["requests"], 1), 4
+        )
+        self.stdout.write(json.dumps(summary, indent=2))
+
+    def book(self, journey, user, stats, rng, orders, tickets):
+        seats = [
+            (cargo, seat)
+            for cargo in range(1, journey.train.cargo_num + 1)
+            for seat in range(1, journey.train.places_in_cargo + 1)
+        ]
+        try:
+            for _ in range(orders):
+                payload = {
+                    "tickets": [
+                        {"journey": journey.id, "cargo": cargo, "seat": seat}
+                        for cargo, seat in rng.sample(seats, tickets)
+                    ]
+                }
+                started_at = time.perf_counter()
+                outcome = "ok"
+                try:
+                    serializer = OrderSerializer(data=payload)
+                    serializer.is_valid(raise_exception=True)
+                    serializer.save(user=user)
+                except SeatsAlreadyTaken:
+                    outcome = "conflict"
+                except ValidationError:
+                    outcome = "invalid"
+                except Exception:
+                    outcome = "error"
+                stats.record(time.perf_counter() - started_at, outcome)
+        finally:
+            connections.close_all()
+
+    def create_fixtures(self, options):
+        suffix = f"{timezone.now():%Y%m%d%H%M%S%f}"
+        source = Station.objects.create(
+            name=f"benchmark-source-{suffix}", latitude=0, longitude=0
+        )
+        destination = Station.objects.create(
+            name=f"benchmark-destination-{suffix}", latitude=1, longitude=1
+        )
+        route = Route.objects.create(source=source, destination=destination)
+        train = Train.objects.create(
+            name=f"benchmark-{suffix}",
+            cargo_num=options["cargos"],
+            places_in_cargo=options["places"],
+            train_type=TrainType.objects.create(name=f"benchmark-{suffix}"),
+        )
+        journey = Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=timezone.now() + timedelta(days=1),
+            arrival_time=timezone.now() + timedelta(days=1, hours=2),
+        )
+        users = [
+            get_user_model().objects.create_user(f"benchmark-{suffix}-{number}@local")
+            for number in range(options["threads"])
+        ]
+        return journey, users
+
+    def delete_fixtures(self, journey, users):
+        for user in users:
+            user.delete()
+        journey.route.source.delete()
+        journey.route.destination.delete()
+        journey.train.train_type.delete()
@@ -0,0 +1,123 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from django.core.management.base import BaseCommand, CommandError
+
+from train_station.benchmarking import LatencyStats
+
+
+DEFAULT_ENDPOINTS = ("stations/", "routes/", "trains/", "journeys/")
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends concurrent GET requests to running deployments and reports "
+        "throughput and latency per deployment and endpoint, e.g. "
+        "--target wsgi=http://localhost:8000/api/train_station/ "
+        "--target asgi=http://localhost:8001/api/train_station/async/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            help="NAME=BASE_URL of a deployment, repeat to compare",
+        )
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            help="Path relative to every base URL, repeat for several "
+            f"({', '.join(DEFAULT_ENDPOINTS)} by default)",
+        )
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=1000, help="Per endpoint")
+        parser.add_argument("--warmup", type=int, default=20, help="Per endpoint")
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument("--token", help="JWT access token")
+        parser.add_argument(
+            "--email", help="Obtain a token from /api/user/token/ of every target"
+        )
+        parser.add_argument("--password")
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["target"]:
+            name, separator, base_url = target.partition("=")
+            if not separator or not base_url.startswith(("http://", "https://")):
+                raise CommandError(f"--target must be NAME=URL, got {target!r}")
+            targets.append((name, base_url.rstrip("/") + "/"))
+        endpoints = options["endpoint"] or DEFAULT_ENDPOINTS
+        self.timeout = options["timeout"]
+
+        results = []
+        for name, base_url in targets:
+            token = options["token"] or self.obtain_token(base_url, options)
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+            for endpoint in endpoints:
+                url = urljoin(base_url, endpoint.lstrip("/"))
+                for _ in range(options["warmup"]):
+                    self.fetch(url, headers)
+
+                summary = self.run(
+                    url, headers, options["concurrency"], options["requests"]
+                )
+                summary.update(
+                    target=name,
+                    endpoint=endpoint,
+                    concurrency=options["concurrency"],
+                )
+                results.append(summary)
+                self.stderr.write(
+                    f"{name} {endpoint}: {summary['throughput_rps']} req/s, "
+                    f"p50 {summary['latency_ms']['p50']}ms, "
+                    f"p99 {summary['latency_ms']['p99']}ms, "
+                    f"outcomes {summary['outcomes']}"
+                )
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def obtain_token(self, base_url, options):
+        if not options["email"]:
+            return None
+        request = urllib.request.Request(
+            urljoin(base_url, "/api/user/token/"),
+            data=json.dumps(
+                {"email": options["email"], "password": options["password"]}
+            ).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)["access"]
+        except (urllib.error.URLError, KeyError) as exc:
+            raise CommandError(f"Could not obtain a token from {base_url}: {exc}")
+
+    def run(self, url, headers, concurrency, requests):
+        stats = LatencyStats()
+
+        def worker(_):
+            started_at = time.perf_counter()
+            outcome = self.fetch(url, headers)
+            stats.record(time.perf_counter() - started_at, outcome)
+
+        stats.start()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, range(requests)))
+        stats.stop()
+        return stats.summary()
+
+    def fetch(self, url, headers):
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return str(response.status)
+        except urllib.error.HTTPError as exc:
+            return str(exc.code)
+        except (urllib.error.URLError, OSError):
+            return "error"
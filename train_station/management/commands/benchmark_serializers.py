@@ -0,0 +1,151 @@
+import json
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from train_station.benchmarking import LatencyStats
+from train_station.fast_serializers import (
+    JourneySummaryValuesSerializer,
+    OrderValuesSerializer,
+)
+from train_station.models import (
+    Crew,
+    Journey,
+    JourneySummary,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from train_station.serializers import JourneySummarySerializer, OrderListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rows per second of the DRF list serializers and the .values() "
+        "fast path on throwaway journeys and orders"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--journeys", type=int, default=2000)
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--tickets", type=int, default=4, help="Per order")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        results = {}
+        with transaction.atomic():
+            user = self.create_fixtures(options)
+            journeys = JourneySummary.objects.filter(
+                journey__route__source__name__startswith="benchmark-"
+            )
+            orders = Order.objects.filter(user=user)
+
+            results["journeys"] = self.compare(
+                lambda: JourneySummarySerializer(journeys, many=True).data,
+                lambda: JourneySummaryValuesSerializer.serialize(
+                    JourneySummaryValuesSerializer.values(journeys)
+                ),
+                rows=options["journeys"],
+                repeat=options["repeat"],
+            )
+            results["orders"] = self.compare(
+                lambda: OrderListSerializer(
+                    orders.prefetch_related(
+                        Prefetch(
+                            "tickets",
+                            queryset=Ticket.objects.select_related(
+                                "journey__train__train_type"
+                            ),
+                        ),
+                        "tickets__journey__crews",
+                    ),
+                    many=True,
+                ).data,
+                lambda: OrderValuesSerializer.serialize(
+                    OrderValuesSerializer.values(orders)
+                ),
+                rows=options["orders"],
+                repeat=options["repeat"],
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def compare(self, drf, fast, rows, repeat):
+        result = {}
+        for name, serialize in (("drf", drf), ("fast", fast)):
+            stats = LatencyStats()
+            stats.start()
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                serialize()
+                stats.record(time.perf_counter() - started_at)
+            stats.stop()
+            summary = stats.summary()
+            summary["rows_per_s"] = round(rows * repeat / stats.elapsed, 1)
+            result[name] = summary
+        result["speedup"] = round(
+            result["fast"]["rows_per_s"] / max(result["drf"]["rows_per_s"], 1e-9), 2
+        )
+        return result
+
+    def create_fixtures(self, options):
+        suffix = f"{timezone.now():%Y%m%d%H%M%S%f}"
+        source = Station.objects.create(
+            name=f"benchmark-source-{suffix}", latitude=0, longitude=0
+        )
+        destination = Station.objects.create(
+            name=f"benchmark-destination-{suffix}", latitude=1, longitude=1
+        )
+        route = Route.objects.create(source=source, destination=destination)
+        train = Train.objects.create(
+            name=f"benchmark-{suffix}",
+            cargo_num=10,
+            places_in_cargo=100,
+            train_type=TrainType.objects.create(name=f"benchmark-{suffix}"),
+        )
+        crews = Crew.objects.bulk_create(
+            Crew(first_name=f"benchmark-{number}", last_name=suffix)
+            for number in range(3)
+        )
+
+        departure_time = timezone.now() + timedelta(days=1)
+        journeys = Journey.objects.bulk_create(
+            Journey(
+                route=route,
+                train=train,
+                departure_time=departure_time + timedelta(minutes=number),
+                arrival_time=departure_time + timedelta(minutes=number, hours=2),
+            )
+            for number in range(options["journeys"])
+        )
+        Journey.crews.through.objects.bulk_create(
+            Journey.crews.through(journey_id=journey.id, crew_id=crew.id)
+            for journey in journeys
+            for crew in crews
+        )
+        JourneySummary.refresh([journey.id for journey in journeys])
+
+        user = get_user_model().objects.create_user(f"benchmark-{suffix}@local")
+        orders = Order.objects.bulk_create(
+            Order(user=user) for _ in range(options["orders"])
+        )
+        Ticket.objects.bulk_create(
+            Ticket(
+                order=order,
+                journey=journeys[number % len(journeys)],
+                cargo=number // len(journeys) % 10 + 1,
+                seat=seat,
+            )
+            for number, order in enumerate(orders)
+            for seat in range(1, options["tickets"] + 1)
+        )
+        return user
@@ -0,0 +1,333 @@
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from train_station.bulk_loading import BulkLoadReportMixin, batched
+from train_station.caching import response_cache
+from train_station.geo import haversine_km, station_grid
+from train_station.models import (
+    Crew,
+    Journey,
+    JourneySummary,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from train_station.seat_map import SeatMap
+from train_station.timetable import timetable
+
+
+TRAIN_TYPES = ("Intercity", "Regional", "Night Express", "Suburban")
+FIRST_NAMES = ("Olena", "Andrii", "Iryna", "Taras", "Oksana", "Dmytro", "Nadiia")
+LAST_NAMES = ("Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Melnyk")
+# Fixed, so the same --seed gives the same rows on any day
+DEFAULT_START_DATE = date(2030, 1, 1)
+
+
+class Command(BulkLoadReportMixin, BaseCommand):
+    help = (
+        "Generates a large synthetic dataset of stations, routes, trains, crews, "
+        "journeys, orders and tickets with bulk inserts, deterministic from "
+        "--seed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stations", type=int, default=200)
+        parser.add_argument("--journeys", type=int, default=10000)
+        parser.add_argument(
+            "--fill",
+            type=float,
+            default=0.8,
+            help="Share of every journey's seats that is sold, 0.8 by default",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--routes-per-station",
+            type=int,
+            default=4,
+            help="Routes from every station to its nearest neighbours",
+        )
+        parser.add_argument("--trains", type=int, default=100)
+        parser.add_argument("--crews", type=int, default=500)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--password",
+            default="generated-password",
+            help="Password of all generated users",
+        )
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            default=DEFAULT_START_DATE,
+            help=f"First departure day (YYYY-MM-DD), {DEFAULT_START_DATE} by default",
+        )
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument(
+            "--prefix",
+            default="gen",
+            help="Prefix of station, train and user names, must not exist yet",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for name in ("stations", "journeys", "trains", "crews", "users", "days"):
+            if options[name] < 1:
+                raise CommandError(f"--{name} must be at least 1")
+        if options["stations"] < 2:
+            raise CommandError("--stations must be at least 2")
+        if not 0 <= options["fill"] <= 1:
+            raise CommandError("--fill must be between 0 and 1")
+
+        self.options = options
+        self.prefix = options["prefix"]
+        self.batch_size = options["batch_size"]
+        self.rng = random.Random(options["seed"])
+        # Every model named after the prefix, crews and train types aren't
+        taken = {
+            "stations": Station.objects.filter(name__startswith=f"{self.prefix} "),
+            "trains": Train.objects.filter(name__startswith=f"{self.prefix} "),
+            "users": get_user_model().objects.filter(
+                email__startswith=f"{self.prefix}-user-"
+            ),
+        }
+        existing = [label for label, rows in taken.items() if rows.exists()]
+        if existing:
+            raise CommandError(
+                f"{', '.join(existing).capitalize()} prefixed {self.prefix!r} "
+                "already exist, pick another --prefix"
+            )
+
+        started_at = time.perf_counter()
+        try:
+            stations = self.generate_stations()
+            routes = self.generate_routes(stations)
+            trains = self.generate_trains()
+            crew_ids = self.generate_crews()
+            user_ids = self.generate_users()
+            self.generate_journeys(routes, trains, crew_ids, user_ids)
+        finally:
+            timetable.invalidate()
+            station_grid.invalidate()
+            for model in (Station, Route, TrainType, Train, Crew, Journey):
+                response_cache.invalidate(model)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dataset generated in {time.perf_counter() - started_at:.1f}s, "
+                f"users log in with {options['password']!r}"
+            )
+        )
+
+    def generate_stations(self):
+        started_at = time.perf_counter()
+        stations = [
+            Station(
+                name=f"{self.prefix} Station {number:06d}",
+                latitude=round(self.rng.uniform(44.5, 52.0), 6),
+                longitude=round(self.rng.uniform(22.5, 40.0), 6),
+            )
+            for number in range(self.options["stations"])
+        ]
+        Station.objects.bulk_create(stations, batch_size=self.batch_size)
+        self.report("Stations", len(stations), started_at)
+        return stations
+
+    def generate_routes(self, stations):
+        """Both directions between every station and its nearest neighbours"""
+        started_at = time.perf_counter()
+        neighbours = min(self.options["routes_per_station"], len(stations) - 1)
+        pairs = set()
+        for source, station in enumerate(stations):
+            # A random sample keeps this linear for large station counts
+            candidates = self.rng.sample(range(len(stations)), min(len(stations), 50))
+            nearest = sorted(
+                (candidate for candidate in candidates if candidate != source),
+                key=lambda candidate: self.distance(station, stations[candidate]),
+            )[:neighbours]
+            for destination in nearest:
+                pairs.update(((source, destination), (destination, source)))
+
+        routes = [
+            Route(
+                source=stations[source],
+                destination=stations[destination],
+                distance=round(self.distance(stations[source], stations[destination])),
+            )
+            for source, destination in sorted(pairs)
+        ]
+        Route.objects.bulk_create(routes, batch_size=self.batch_size)
+        self.report("Routes", len(routes), started_at)
+        return routes
+
+    @staticmethod
+    def distance(source, destination):
+        return haversine_km(
+            source.latitude,
+            source.longitude,
+            destination.latitude,
+            destination.longitude,
+        )
+
+    def generate_trains(self):
+        started_at = time.perf_counter()
+        # Train type names aren't unique, reuse the first one of each
+        train_types = {
+            name: TrainType.objects.filter(name=name).first()
+            or TrainType.objects.create(name=name)
+            for name in TRAIN_TYPES
+        }
+        trains = [
+            Train(
+                name=f"{self.prefix} Train {number:05d}",
+                cargo_num=self.rng.randint(4, 12),
+                places_in_cargo=self.rng.choice((36, 54, 60, 80)),
+                train_type=train_types[self.rng.choice(TRAIN_TYPES)],
+            )
+            for number in range(self.options["trains"])
+        ]
+        Train.objects.bulk_create(trains, batch_size=self.batch_size)
+        self.report("Trains", len(trains), started_at)
+        return trains
+
+    def generate_crews(self):
+        started_at = time.perf_counter()
+        crews = Crew.objects.bulk_create(
+            (
+                Crew(
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                )
+                for _ in range(self.options["crews"])
+            ),
+            batch_size=self.batch_size,
+        )
+        self.report("Crews", len(crews), started_at)
+        return [crew.id for crew in crews]
+
+    def generate_users(self):
+        started_at = time.perf_counter()
+        # Hashed once, hashing per user would dominate the run
+        password = make_password(self.options["password"])
+        users = get_user_model().objects.bulk_create(
+            (
+                get_user_model()(
+                    email=f"{self.prefix}-user-{number:07d}@example.com",
+                    password=password,
+                )
+                for number in range(self.options["users"])
+            ),
+            batch_size=self.batch_size,
+        )
+        self.report("Users", len(users), started_at)
+        return [user.id for user in users]
+
+    def generate_journeys(self, routes, trains, crew_ids, user_ids):
+        """
+        Journeys are written in chunks of about ``--batch-size`` tickets, each
+        with its seat bitmap, counter, crews, orders, tickets and summary in
+        one transaction, so memory stays flat for millions of tickets.
+        """
+        started_at = time.perf_counter()
+        first_day = timezone.make_aware(
+            datetime.combine(self.options["start_date"], datetime.min.time())
+        )
+        minutes = self.options["days"] * 24 * 60
+
+        chunk = []
+        chunk_tickets = 0
+        journeys = tickets = 0
+        for _ in range(self.options["journeys"]):
+            route = self.rng.choice(routes)
+            train = self.rng.choice(trains)
+            departure_time = first_day + timedelta(
+                minutes=self.rng.randrange(0, minutes, 5)
+            )
+            hours = max((route.distance or 0) / self.rng.uniform(60, 120), 0.5)
+            seats = self.rng.sample(
+                range(train.capacity), round(train.capacity * self.options["fill"])
+            )
+            chunk.append(
+                (
+                    Journey(
+                        route=route,
+                        train=train,
+                        departure_time=departure_time,
+                        arrival_time=departure_time
+                        + timedelta(minutes=round(hours * 60)),
+                    ),
+                    [divmod(position, train.places_in_cargo) for position in seats],
+                    self.rng.sample(crew_ids, min(2, len(crew_ids))),
+                    self.split_orders(len(seats), user_ids),
+                )
+            )
+            chunk_tickets += len(seats)
+            if chunk_tickets >= self.batch_size:
+                journeys += len(chunk)
+                tickets += self.write_journeys(chunk)
+                self.report("Journeys", journeys, started_at)
+                chunk, chunk_tickets = [], 0
+        if chunk:
+            journeys += len(chunk)
+            tickets += self.write_journeys(chunk)
+            self.report("Journeys", journeys, started_at)
+        self.report("Tickets", tickets, started_at)
+
+    def split_orders(self, seat_count, user_ids):
+        """Users of the orders taking the seats in turn, 1-4 tickets each"""
+        orders = []
+        while seat_count > 0:
+            size = min(self.rng.randint(1, 4), seat_count)
+            orders.append((self.rng.choice(user_ids), size))
+            seat_count -= size
+        return orders
+
+    @transaction.atomic
+    def write_journeys(self, chunk):
+        for journey, seats, _, _ in chunk:
+            seat_map = SeatMap(journey.train.cargo_num, journey.train.places_in_cargo)
+            for cargo, seat in seats:
+                seat_map.take(cargo + 1, seat + 1)
+            journey.seat_bitmap = seat_map.to_bytes()
+            journey.tickets_sold = seat_map.taken_count
+        Journey.objects.bulk_create([journey for journey, *_ in chunk])
+
+        Journey.crews.through.objects.bulk_create(
+            Journey.crews.through(journey_id=journey.id, crew_id=crew_id)
+            for journey, _, crew_ids, _ in chunk
+            for crew_id in crew_ids
+        )
+
+        orders = Order.objects.bulk_create(
+            Order(user_id=user_id)
+            for *_, journey_orders in chunk
+            for user_id, _ in journey_orders
+        )
+        order_ids = iter(order.id for order in orders)
+        tickets = []
+        for journey, seats, _, journey_orders in chunk:
+            remaining = iter(seats)
+            for _, size in journey_orders:
+                order_id = next(order_ids)
+                tickets.extend(
+                    Ticket(
+                        journey_id=journey.id,
+                        order_id=order_id,
+                        cargo=cargo + 1,
+                        seat=seat + 1,
+                    )
+                    for cargo, seat in (next(remaining) for _ in range(size))
+                )
+        for batch in batched(tickets, self.batch_size):
+            Ticket.objects.bulk_create(batch)
+
+        JourneySummary.refresh([journey.id for journey, *_ in chunk])
+        return len(tickets)
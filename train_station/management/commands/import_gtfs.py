@@ -0,0 +1,462 @@
+import csv
+import json
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from train_station.bulk_loading import BulkLoadReportMixin, batched
+from train_station.caching import response_cache
+from train_station.geo import haversine_km, station_grid
+from train_station.models import (
+    Journey,
+    JourneySummary,
+    Route,
+    Station,
+    Train,
+    TrainType,
+)
+from train_station.timetable import timetable
+
+
+ROUTE_TYPES = {
+    "0": "Tram",
+    "1": "Subway",
+    "2": "Rail",
+    "3": "Bus",
+    "4": "Ferry",
+    "100": "Rail",
+    "101": "High Speed Rail",
+    "102": "Long Distance Rail",
+    "103": "Inter Regional Rail",
+    "106": "Regional Rail",
+    "109": "Suburban Railway",
+}
+
+
+WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        yield from csv.DictReader(file)
+
+
+def parse_gtfs_time(value):
+    """GTFS times are offsets from the service day and may exceed 24:00:00"""
+    hours, minutes, seconds = map(int, value.strip().split(":"))
+    return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+
+
+class Command(BulkLoadReportMixin, BaseCommand):
+    help = (
+        "Imports a GTFS feed (stops, routes, trips, stop_times, calendar) into "
+        "stations, routes, trains and journeys for one service date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("feed", help="Directory with the unpacked GTFS files")
+        parser.add_argument(
+            "--service-date",
+            type=date.fromisoformat,
+            default=None,
+            help="Date the trips run on (YYYY-MM-DD), today by default",
+        )
+        parser.add_argument("--cargo-num", type=int, default=10)
+        parser.add_argument("--places-in-cargo", type=int, default=60)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Progress file for resuming, <feed>/.import_gtfs.json by default",
+        )
+        parser.add_argument(
+            "--restart", action="store_true", help="Ignore an existing checkpoint"
+        )
+
+    def handle(self, *args, **options):
+        self.feed = Path(options["feed"])
+        for name in ("stops.txt", "routes.txt", "trips.txt", "stop_times.txt"):
+            if not (self.feed / name).is_file():
+                raise CommandError(f"{name} not found in {self.feed}")
+
+        self.batch_size = options["batch_size"]
+        self.service_date = options["service_date"] or timezone.localdate()
+        self.timezone = self.feed_timezone()
+        self.checkpoint_path = Path(
+            options["checkpoint"] or self.feed / ".import_gtfs.json"
+        )
+        checkpoint = {} if options["restart"] else self.load_checkpoint()
+
+        try:
+            stations = self.import_stops()
+            trains = self.import_routes(
+                options["cargo_num"], options["places_in_cargo"]
+            )
+            trips = self.read_trips(stations, trains)
+            self.import_journeys(trips, checkpoint.get("journeys", 0))
+        finally:
+            timetable.invalidate()
+            station_grid.invalidate()
+            for model in (Station, Route, TrainType, Train, Journey):
+                response_cache.invalidate(model)
+
+        self.checkpoint_path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS("GTFS import finished"))
+
+    def feed_timezone(self):
+        agency = self.feed / "agency.txt"
+        if agency.is_file():
+            for row in read_csv(agency):
+                if row.get("agency_timezone"):
+                    return ZoneInfo(row["agency_timezone"].strip())
+        return ZoneInfo(settings.TIME_ZONE)
+
+    def load_checkpoint(self):
+        if not self.checkpoint_path.is_file():
+            return {}
+        checkpoint = json.loads(self.checkpoint_path.read_text())
+        if checkpoint.get("service_date") != self.service_date.isoformat():
+            return {}
+        self.stdout.write(
+            f"Resuming after {checkpoint['journeys']} journeys from "
+            f"{self.checkpoint_path}"
+        )
+        return checkpoint
+
+    def save_checkpoint(self, journeys):
+        self.checkpoint_path.write_text(
+            json.dumps(
+                {"service_date": self.service_date.isoformat(), "journeys": journeys}
+            )
+        )
+
+    def import_stops(self):
+        """
+        Upserts stations by GTFS stop_id; platforms are folded into their
+        parent. Station names are unique, so a name used by another stop or
+        station aborts the import, except for a station without a stop_id,
+        which is taken over.
+        """
+        started_at = time.perf_counter()
+        parents = {}
+        stations = {}
+        rows = 0
+        for row in read_csv(self.feed / "stops.txt"):
+            rows += 1
+            stop_id = row["stop_id"]
+            if row.get("parent_station"):
+                parents[stop_id] = row["parent_station"]
+            elif row.get("location_type", "") in ("", "0", "1"):
+                stations[stop_id] = Station(
+                    external_id=stop_id,
+                    name=row["stop_name"].strip(),
+                    latitude=float(row["stop_lat"]),
+                    longitude=float(row["stop_lon"]),
+                )
+
+        self.claim_station_names(stations)
+        station_ids = {}
+        for batch in batched(list(stations.values()), self.batch_size):
+            Station.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=["name", "latitude", "longitude"],
+            )
+            station_ids.update(
+                Station.objects.filter(
+                    external_id__in=[station.external_id for station in batch]
+                ).values_list("external_id", "id")
+            )
+
+        stop_stations = dict(station_ids)
+        for stop_id, parent_id in parents.items():
+            if parent_id in stop_stations:
+                stop_stations[stop_id] = stop_stations[parent_id]
+
+        self.stations = {
+            station_ids[stop_id]: station for stop_id, station in stations.items()
+        }
+        self.report("stops.txt", rows, started_at)
+        return stop_stations
+
+    def claim_station_names(self, stations):
+        """Checks every name is free before writing, takes over unkeyed ones"""
+        stop_ids = defaultdict(list)
+        for stop_id, station in stations.items():
+            stop_ids[station.name].append(stop_id)
+        collisions = [
+            f"{name!r} is used by stops {', '.join(ids)}"
+            for name, ids in stop_ids.items()
+            if len(ids) > 1
+        ]
+
+        unkeyed = {}
+        for batch in batched(list(stop_ids), self.batch_size):
+            for station in Station.objects.filter(name__in=batch).only(
+                "name", "external_id"
+            ):
+                stop_id = stop_ids[station.name][0]
+                if station.external_id is None:
+                    station.external_id = stop_id
+                    unkeyed[stop_id] = station
+                elif station.external_id not in stop_ids[station.name]:
+                    collisions.append(
+                        f"{station.name!r} of stop {stop_id} is used by station "
+                        f"{station.id} of stop {station.external_id}"
+                    )
+        for batch in batched(list(unkeyed), self.batch_size):
+            # The stop already has a station of another name
+            for stop_id in Station.objects.filter(external_id__in=batch).values_list(
+                "external_id", flat=True
+            ):
+                collisions.append(
+                    f"{unkeyed[stop_id].name!r} of stop {stop_id} is used by "
+                    f"station {unkeyed[stop_id].id}"
+                )
+        if collisions:
+            raise CommandError(
+                "Station names must be unique, rename the stops: "
+                + "; ".join(collisions)
+            )
+
+        Station.objects.bulk_update(
+            unkeyed.values(), ["external_id"], batch_size=self.batch_size
+        )
+
+    def import_routes(self, cargo_num, places_in_cargo):
+        """Upserts a train for every GTFS route, by route_id"""
+        started_at = time.perf_counter()
+        routes = {
+            row["route_id"]: (
+                (
+                    row.get("route_long_name")
+                    or row.get("route_short_name")
+                    or row["route_id"]
+                ).strip(),
+                ROUTE_TYPES.get(row.get("route_type", ""), "Rail"),
+            )
+            for row in read_csv(self.feed / "routes.txt")
+        }
+
+        train_types = dict(
+            TrainType.objects.filter(
+                name__in={type_name for _, type_name in routes.values()}
+            ).values_list("name", "id")
+        )
+        missing_types = {type_name for _, type_name in routes.values()} - set(
+            train_types
+        )
+        for train_type in TrainType.objects.bulk_create(
+            TrainType(name=name) for name in sorted(missing_types)
+        ):
+            train_types[train_type.name] = train_type.id
+
+        train_ids = {}
+        for batch in batched(list(routes.items()), self.batch_size):
+            # The layout of an existing train is kept, it may have sold seats
+            Train.objects.bulk_create(
+                (
+                    Train(
+                        external_id=route_id,
+                        name=name,
+                        cargo_num=cargo_num,
+                        places_in_cargo=places_in_cargo,
+                        train_type_id=train_types[type_name],
+                    )
+                    for route_id, (name, type_name) in batch
+                ),
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=["name", "train_type"],
+            )
+            train_ids.update(
+                Train.objects.filter(
+                    external_id__in=[route_id for route_id, _ in batch]
+                ).values_list("external_id", "id")
+            )
+
+        self.report("routes.txt", len(routes), started_at)
+        return train_ids
+
+    def read_trips(self, stations, trains):
+        """(trip_id, train_id, first stop, last stop) for every usable trip"""
+        started_at = time.perf_counter()
+        # trip_id -> [first seq, station, departure, last seq, station, arrival]
+        ends = {}
+        rows = 0
+        for row in read_csv(self.feed / "stop_times.txt"):
+            rows += 1
+            station_id = stations.get(row["stop_id"])
+            if station_id is None:
+                continue
+            sequence = int(row["stop_sequence"])
+            departure = row.get("departure_time") or row.get("arrival_time")
+            arrival = row.get("arrival_time") or row.get("departure_time")
+            trip = ends.get(row["trip_id"])
+            if trip is None:
+                ends[row["trip_id"]] = [
+                    sequence,
+                    station_id,
+                    departure,
+                    sequence,
+                    station_id,
+                    arrival,
+                ]
+                continue
+            if sequence < trip[0]:
+                trip[0:3] = sequence, station_id, departure
+            if sequence > trip[3]:
+                trip[3:6] = sequence, station_id, arrival
+        self.report("stop_times.txt", rows, started_at)
+
+        services = self.active_services()
+        trips = []
+        skipped = not_running = 0
+        for row in read_csv(self.feed / "trips.txt"):
+            if services is not None and row["service_id"].strip() not in services:
+                not_running += 1
+                continue
+            trip = ends.get(row["trip_id"])
+            if trip is None or trip[1] == trip[4] or row["route_id"] not in trains:
+                skipped += 1
+                continue
+            trips.append(
+                (row["trip_id"], trains[row["route_id"]], trip[1:3], trip[4:6])
+            )
+        if skipped:
+            self.stdout.write(
+                f"Skipped {skipped} trips without stop times or ending where "
+                "they start"
+            )
+        if not_running:
+            self.stdout.write(
+                f"Skipped {not_running} trips not running on {self.service_date}"
+            )
+        return trips
+
+    def active_services(self):
+        """
+        service_ids running on the service date: the weekday and date range
+        of calendar.txt, then the additions (exception_type 1) and removals
+        (2) of calendar_dates.txt. None for a feed without either file, all
+        its trips run every day.
+        """
+        calendar = self.feed / "calendar.txt"
+        calendar_dates = self.feed / "calendar_dates.txt"
+        if not calendar.is_file() and not calendar_dates.is_file():
+            return None
+
+        # GTFS dates are YYYYMMDD, they compare as strings
+        day = self.service_date.strftime("%Y%m%d")
+        weekday = WEEKDAYS[self.service_date.weekday()]
+        services = set()
+        if calendar.is_file():
+            for row in read_csv(calendar):
+                if (
+                    row[weekday].strip() == "1"
+                    and row["start_date"].strip() <= day <= row["end_date"].strip()
+                ):
+                    services.add(row["service_id"].strip())
+        if calendar_dates.is_file():
+            for row in read_csv(calendar_dates):
+                if row["date"].strip() != day:
+                    continue
+                if row["exception_type"].strip() == "1":
+                    services.add(row["service_id"].strip())
+                elif row["exception_type"].strip() == "2":
+                    services.discard(row["service_id"].strip())
+        return services
+
+    def get_routes(self, trips):
+        pairs = {(start[0], end[0]) for _, _, start, end in trips}
+        routes = {}
+        for batch in batched(sorted(pairs), self.batch_size):
+            routes.update(
+                (
+                    ((source_id, destination_id), route_id)
+                    for route_id, source_id, destination_id in Route.objects.filter(
+                        source_id__in={source_id for source_id, _ in batch},
+                        destination_id__in={
+                            destination_id for _, destination_id in batch
+                        },
+                    ).values_list("id", "source_id", "destination_id")
+                )
+            )
+
+        missing = [pair for pair in sorted(pairs) if pair not in routes]
+        for batch in batched(missing, self.batch_size):
+            for route in Route.objects.bulk_create(
+                Route(
+                    source_id=source_id,
+                    destination_id=destination_id,
+                    distance=round(self.distance(source_id, destination_id)),
+                )
+                for source_id, destination_id in batch
+            ):
+                routes[(route.source_id, route.destination_id)] = route.id
+        return routes
+
+    def distance(self, source_id, destination_id):
+        source = self.stations[source_id]
+        destination = self.stations[destination_id]
+        return haversine_km(
+            source.latitude,
+            source.longitude,
+            destination.latitude,
+            destination.longitude,
+        )
+
+    def import_journeys(self, trips, done):
+        started_at = time.perf_counter()
+        routes = self.get_routes(trips)
+        midnight = datetime.combine(self.service_date, datetime.min.time())
+        service_day = timezone.make_aware(midnight, self.timezone)
+
+        imported = 0
+        for batch in batched(trips[done:], self.batch_size):
+            journeys = [
+                Journey(
+                    external_id=f"{trip_id}@{self.service_date.isoformat()}",
+                    route_id=routes[(start[0], end[0])],
+                    train_id=train_id,
+                    departure_time=service_day + parse_gtfs_time(start[1]),
+                    arrival_time=service_day + parse_gtfs_time(end[1]),
+                )
+                for trip_id, train_id, start, end in batch
+            ]
+            with transaction.atomic():
+                Journey.objects.bulk_create(
+                    journeys,
+                    update_conflicts=True,
+                    unique_fields=["external_id"],
+                    update_fields=[
+                        "route",
+                        "train",
+                        "departure_time",
+                        "arrival_time",
+                        "updated_at",
+                    ],
+                )
+                JourneySummary.refresh(
+                    Journey.objects.filter(
+                        external_id__in=[journey.external_id for journey in journeys]
+                    ).values("pk")
+                )
+            imported += len(batch)
+            self.save_checkpoint(done + imported)
+            self.report("trips.txt", imported, started_at)
@@ -0,0 +1,374 @@
+import json
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer,
+    WSGIRequestHandler,
+    get_internal_wsgi_application,
+)
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.throttling import SimpleRateThrottle
+
+from train_station.benchmarking import LatencyStats, http_request
+from train_station.models import Journey, Route, Station, Train, TrainType
+
+
+SCENARIOS = ("register", "browse", "detail", "order")
+DEFAULT_MIX = "register=5,browse=50,detail=30,order=15"
+ENDPOINTS = ("register", "token", "journey_list", "journey_detail", "order_create")
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise CommandError(
+                f"Unknown scenario {name.strip()!r}, use {', '.join(SCENARIOS)}"
+            )
+        try:
+            mix[name.strip()] = float(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight in {part!r}")
+    if not any(mix.values()):
+        raise CommandError("At least one scenario needs a positive weight")
+    return mix
+
+
+def find_regressions(results, baseline, max_regression):
+    """Endpoints whose throughput dropped or p99 grew by more than the ratio"""
+    regressions = []
+    for endpoint, summary in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if not previous:
+            continue
+        if summary["throughput_rps"] < previous["throughput_rps"] * (
+            1 - max_regression
+        ):
+            regressions.append(
+                f"{endpoint} throughput {previous['throughput_rps']} -> "
+                f"{summary['throughput_rps']} req/s"
+            )
+        if summary["latency_ms"]["p99"] > previous["latency_ms"]["p99"] * (
+            1 + max_regression
+        ):
+            regressions.append(
+                f"{endpoint} p99 {previous['latency_ms']['p99']} -> "
+                f"{summary['latency_ms']['p99']} ms"
+            )
+    return regressions
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives weighted registration, browsing, journey detail and booking "
+        "scenarios against the API and reports throughput and latency "
+        "percentiles per endpoint as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            help="Running server to load, e.g. http://127.0.0.1:8000. By "
+            "default the app is served in-process on the configured database",
+        )
+        parser.add_argument("--users", type=int, default=16, help="Virtual users")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds")
+        parser.add_argument(
+            "--mix",
+            type=parse_mix,
+            default=DEFAULT_MIX,
+            help=f"Scenario weights ({DEFAULT_MIX} by default)",
+        )
+        parser.add_argument("--journeys", type=int, default=20)
+        parser.add_argument(
+            "--hot-journeys",
+            type=int,
+            default=2,
+            help="Popular journeys that receive --hot-share of the orders",
+        )
+        parser.add_argument("--hot-share", type=float, default=0.8)
+        parser.add_argument(
+            "--hot-seats",
+            type=int,
+            default=20,
+            help="Seats of the popular journeys' first cargo the orders compete for",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument(
+            "--throttle",
+            action="store_true",
+            help="Keep the configured rate limits of the in-process server",
+        )
+        parser.add_argument(
+            "--keep-fixtures",
+            action="store_true",
+            help="Don't delete the generated journeys and users afterwards",
+        )
+        parser.add_argument("--output", help="Write the JSON report to a file")
+        parser.add_argument(
+            "--baseline",
+            help="JSON report of an earlier run, fails on regressions against it",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Tolerated throughput drop / p99 growth ratio, 0.2 by default",
+        )
+
+    def handle(self, *args, **options):
+        if isinstance(options["mix"], str):
+            options["mix"] = parse_mix(options["mix"])
+        self.options = options
+        self.suffix = f"{timezone.now():%Y%m%d%H%M%S%f}"
+        self.stats = {name: LatencyStats() for name in ENDPOINTS}
+        self.total = LatencyStats()
+        self.user_count = 0
+        self.user_lock = threading.Lock()
+
+        if options["journeys"] < 1:
+            raise CommandError("--journeys must be at least 1")
+
+        try:
+            fixtures = self.create_fixtures()
+            if options["base_url"]:
+                self.base_url = options["base_url"].rstrip("/")
+                self.run_users(fixtures)
+            else:
+                with self.in_process_server():
+                    self.run_users(fixtures)
+        finally:
+            # Also after a failure halfway through create_fixtures
+            if not options["keep_fixtures"]:
+                self.delete_fixtures()
+
+        results = self.report()
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output)
+        self.stdout.write(output)
+
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            regressions = find_regressions(results, baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("Performance regressions: " + "; ".join(regressions))
+            self.stderr.write("No regressions against the baseline")
+
+    @contextmanager
+    def in_process_server(self):
+        """
+        Serves the app on a free port until the block exits. Without
+        --throttle the rate limits are off for exactly that long: DRF binds
+        the rates to the throttle class on import, so override_settings
+        can't reach them and they are patched on the class, process-wide.
+        """
+        with ExitStack() as stack:
+            if not self.options["throttle"]:
+                # A rate of None disables a throttle, virtual users share one IP
+                rates = dict.fromkeys(SimpleRateThrottle.THROTTLE_RATES)
+                stack.enter_context(
+                    mock.patch.object(SimpleRateThrottle, "THROTTLE_RATES", rates)
+                )
+            server = ThreadedWSGIServer(("127.0.0.1", 0), QuietRequestHandler)
+            server.set_app(get_internal_wsgi_application())
+            stack.callback(server.server_close)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            stack.callback(server.shutdown)
+            self.base_url = "http://{}:{}".format(*server.server_address)
+            yield
+
+    def run_users(self, fixtures):
+        deadline = time.perf_counter() + self.options["duration"]
+        threads = [
+            threading.Thread(
+                target=self.virtual_user,
+                args=(fixtures, deadline, random.Random(self.options["seed"] + number)),
+            )
+            for number in range(self.options["users"])
+        ]
+        self.total.start()
+        for stats in self.stats.values():
+            stats.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.total.stop()
+        for stats in self.stats.values():
+            stats.stop()
+
+    def virtual_user(self, fixtures, deadline, rng):
+        scenarios = list(self.options["mix"])
+        weights = list(self.options["mix"].values())
+        session = {}
+        try:
+            self.register(session, fixtures, rng)
+            while time.perf_counter() < deadline:
+                scenario = rng.choices(scenarios, weights)[0]
+                getattr(self, scenario)(session, fixtures, rng)
+        finally:
+            connections.close_all()
+
+    def call(self, endpoint, method, path, session=None, data=None):
+        headers = {}
+        if session and session.get("token"):
+            headers["Authorization"] = f"Bearer {session['token']}"
+        started_at = time.perf_counter()
+        status, body = http_request(
+            method,
+            self.base_url + path,
+            data=data,
+            headers=headers,
+            timeout=self.options["timeout"],
+        )
+        elapsed = time.perf_counter() - started_at
+        outcome = str(status) if status else "error"
+        self.stats[endpoint].record(elapsed, outcome)
+        self.total.record(elapsed, outcome)
+        return status, body
+
+    def register(self, session, fixtures, rng):
+        with self.user_lock:
+            self.user_count += 1
+            email = f"loadtest-{self.suffix}-{self.user_count}@example.com"
+        credentials = {"email": email, "password": f"loadtest-{self.suffix}"}
+
+        status, _ = self.call(
+            "register", "POST", reverse("user:create"), data=credentials
+        )
+        if status != 201:
+            return
+        status, body = self.call(
+            "token", "POST", reverse("user:token_obtain_pair"), data=credentials
+        )
+        if status == 200:
+            session["token"] = body["access"]
+
+    def browse(self, session, fixtures, rng):
+        journey = rng.choice(fixtures["journeys"])
+        params = rng.choice(
+            (
+                f"route={journey.route_id}",
+                f"train={journey.train_id}",
+                f"departure_date={journey.departure_time:%Y-%m-%d}",
+                "",
+            )
+        )
+        self.call(
+            "journey_list",
+            "GET",
+            f"{reverse('train_station:journey-list')}?{params}",
+            session,
+        )
+
+    def detail(self, session, fixtures, rng):
+        journey = rng.choice(fixtures["journeys"])
+        self.call(
+            "journey_detail",
+            "GET",
+            reverse("train_station:journey-detail", args=[journey.id]),
+            session,
+        )
+
+    def order(self, session, fixtures, rng):
+        """Most orders compete for a few seats of the popular journeys, 409 once sold"""
+        journeys = fixtures["journeys"]
+        hot = journeys[: self.options["hot_journeys"]]
+        train = fixtures["train"]
+        if hot and rng.random() < self.options["hot_share"]:
+            journey = rng.choice(hot)
+            cargo = 1
+            seat = rng.randint(1, min(self.options["hot_seats"], train.places_in_cargo))
+        else:
+            journey = rng.choice(journeys)
+            cargo = rng.randint(1, train.cargo_num)
+            seat = rng.randint(1, train.places_in_cargo)
+        self.call(
+            "order_create",
+            "POST",
+            reverse("train_station:order-list"),
+            session,
+            data={
+                "tickets": [
+                    {
+                        "journey": journey.id,
+                        "cargo": cargo,
+                        "seat": seat,
+                    }
+                ]
+            },
+        )
+
+    def create_fixtures(self):
+        options = self.options
+        stations = Station.objects.bulk_create(
+            Station(
+                name=f"loadtest-{self.suffix}-{number}", latitude=number, longitude=0
+            )
+            for number in range(4)
+        )
+        routes = Route.objects.bulk_create(
+            Route(source=source, destination=destination, distance=100)
+            for source, destination in zip(stations, stations[1:] + stations[:1])
+        )
+        train = Train.objects.create(
+            name=f"loadtest-{self.suffix}",
+            cargo_num=4,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name=f"loadtest-{self.suffix}"),
+        )
+        tomorrow = timezone.now() + timedelta(days=1)
+        journeys = [
+            Journey.objects.create(
+                route=routes[number % len(routes)],
+                train=train,
+                departure_time=tomorrow + timedelta(hours=number),
+                arrival_time=tomorrow + timedelta(hours=number + 3),
+            )
+            for number in range(options["journeys"])
+        ]
+        return {"stations": stations, "train": train, "journeys": journeys}
+
+    def delete_fixtures(self):
+        """Everything named after the run's suffix, routes and journeys cascade"""
+        get_user_model().objects.filter(
+            email__startswith=f"loadtest-{self.suffix}-"
+        ).delete()
+        Station.objects.filter(name__startswith=f"loadtest-{self.suffix}-").delete()
+        Train.objects.filter(name=f"loadtest-{self.suffix}").delete()
+        TrainType.objects.filter(name=f"loadtest-{self.suffix}").delete()
+
+    def report(self):
+        options = self.options
+        return {
+            "target": options["base_url"] or "in-process",
+            "users": options["users"],
+            "duration_s": options["duration"],
+            "mix": options["mix"],
+            "seed": options["seed"],
+            "throttled": bool(options["base_url"] or options["throttle"]),
+            "endpoints": {
+                name: stats.summary()
+                for name, stats in self.stats.items()
+                if stats.latencies
+            },
+            "total": self.total.summary(),
+        }
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from train_station.models import Journey, JourneySummary
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts tickets per journey and repairs drifted tickets_sold counters, "
+        "seat bitmaps and journey summaries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report journeys whose counters drifted",
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Journey.objects.order_by("id")
+            .annotate(ticket_count=Count("tickets"))
+            .filter(
+                ~Q(tickets_sold=F("ticket_count"))
+                | ~Q(summary__tickets_sold=F("ticket_count"))
+            )
+            .values_list("id", "tickets_sold", "ticket_count")
+        )
+
+        journey_ids = []
+        for journey_id, tickets_sold, ticket_count in drifted:
+            self.stdout.write(
+                f"Journey {journey_id}: counter {tickets_sold}, "
+                f"tickets {ticket_count}"
+            )
+            journey_ids.append(journey_id)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(journey_ids)} journeys drifted")
+            return
+
+        for journey_id in journey_ids:
+            Journey.update_seat_map(journey_id, rebuild=True)
+        JourneySummary.refresh(journey_ids)
+        self.stdout.write(self.style.SUCCESS(f"{len(journey_ids)} journeys repaired"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from train_station.caching import response_cache
+
+
+class Command(BaseCommand):
+    help = "Prints response cache hits and misses per endpoint"
+
+    def handle(self, *args, **kwargs):
+        stats = response_cache.stats(["station", "route", "train", "crew"])
+        for name, counters in stats.items():
+            requests = counters["hits"] + counters["misses"]
+            hit_rate = counters["hits"] / requests if requests else 0
+            self.stdout.write(
+                f"{name}: {counters['hits']} hits, {counters['misses']} misses "
+                f"({hit_rate:.1%} hit rate)"
+            )
@@ -1,17 +1,33 @@
 import time
-from django.db import connections
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
-    def handle(self, *args, **kwargs):
+    help = "Blocks until the database accepts connections and answers a query"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--timeout", type=float, default=60, help="Seconds before giving up"
+        )
+        parser.add_argument("--interval", type=float, default=1)
+
+    def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
+        connection = connections[options["database"]]
+        deadline = time.monotonic() + options["timeout"]
+        while True:
             try:
-                db_conn = connections["default"]
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                break
             except OperationalError:
+                if time.monotonic() >= deadline:
+                    raise CommandError(
+                        f"Database unavailable after {options['timeout']:g}s"
+                    )
                 self.stdout.write("Database unavailable, waiting ...")
-                time.sleep(1)
+                time.sleep(options["interval"])
         self.stdout.write(self.style.SUCCESS("Database available!"))
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-18 02:26
+
+from django.db import migrations, models
+
+
+def fill_seat_bitmaps(apps, schema_editor):
+    """The train_station.seat_map layout as of this migration, inlined"""
+    Journey = apps.get_model("train_station", "Journey")
+    Ticket = apps.get_model("train_station", "Ticket")
+
+    for journey in Journey.objects.select_related("train").iterator():
+        cargo_num = journey.train.cargo_num
+        places_in_cargo = journey.train.places_in_cargo
+        bits = bytearray((cargo_num * places_in_cargo + 7) // 8)
+        for cargo, seat in Ticket.objects.filter(journey=journey).values_list(
+            "cargo", "seat"
+        ):
+            if 1 <= cargo <= cargo_num and 1 <= seat <= places_in_cargo:
+                position = (cargo - 1) * places_in_cargo + (seat - 1)
+                bits[position >> 3] |= 1 << (position & 7)
+        journey.seat_bitmap = bytes(bits)
+        journey.save(update_fields=["seat_bitmap"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="seat_bitmap",
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(fill_seat_bitmaps, migrations.RunPython.noop),
+    ]
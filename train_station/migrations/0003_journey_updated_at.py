@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0002_journey_seat_bitmap"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
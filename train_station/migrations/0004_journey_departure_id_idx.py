@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0003_journey_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="journey",
+            options={"ordering": ["-departure_time", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["-departure_time", "-id"], name="journey_departure_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0004_journey_departure_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["route", "departure_time"], name="journey_route_departure_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["train", "departure_time"], name="journey_train_departure_idx"
+            ),
+        ),
+    ]
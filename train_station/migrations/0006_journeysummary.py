@@ -0,0 +1,114 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_journey_summaries(apps, schema_editor):
+    Journey = apps.get_model("train_station", "Journey")
+    JourneySummary = apps.get_model("train_station", "JourneySummary")
+
+    journeys = Journey.objects.select_related(
+        "route__source", "route__destination", "train__train_type"
+    ).prefetch_related("crews")
+    JourneySummary.objects.bulk_create(
+        (
+            JourneySummary(
+                journey=journey,
+                route=journey.route,
+                train=journey.train,
+                source=journey.route.source.name,
+                destination=journey.route.destination.name,
+                train_name=journey.train.name,
+                train_type=journey.train.train_type.name,
+                train_cargo_num=journey.train.cargo_num,
+                places_in_cargo=journey.train.places_in_cargo,
+                capacity=journey.train.cargo_num * journey.train.places_in_cargo,
+                # Taken seats are the set bits of the seat bitmap
+                tickets_sold=int.from_bytes(
+                    bytes(journey.seat_bitmap), "little"
+                ).bit_count(),
+                crews=[
+                    f"{crew.first_name} {crew.last_name}"
+                    for crew in journey.crews.all()
+                ],
+                departure_time=journey.departure_time,
+                arrival_time=journey.arrival_time,
+            )
+            for journey in journeys
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0005_journey_route_train_departure_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JourneySummary",
+            fields=[
+                (
+                    "journey",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="train_station.journey",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255)),
+                ("destination", models.CharField(max_length=255)),
+                ("train_name", models.CharField(max_length=255)),
+                ("train_type", models.CharField(max_length=255)),
+                ("train_cargo_num", models.IntegerField()),
+                ("places_in_cargo", models.IntegerField()),
+                ("capacity", models.IntegerField()),
+                ("tickets_sold", models.IntegerField(default=0)),
+                ("crews", models.JSONField(default=list)),
+                ("departure_time", models.DateTimeField()),
+                ("arrival_time", models.DateTimeField()),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="train_station.route",
+                    ),
+                ),
+                (
+                    "train",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="train_station.train",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-departure_time", "-pk"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="journeysummary",
+            index=models.Index(
+                fields=["-departure_time", "-journey"], name="summary_departure_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journeysummary",
+            index=models.Index(
+                fields=["route", "departure_time"], name="summary_route_departure_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journeysummary",
+            index=models.Index(
+                fields=["train", "departure_time"], name="summary_train_departure_idx"
+            ),
+        ),
+        migrations.RunPython(fill_journey_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_tickets_sold(apps, schema_editor):
+    Journey = apps.get_model("train_station", "Journey")
+    Ticket = apps.get_model("train_station", "Ticket")
+
+    Journey.objects.update(
+        tickets_sold=Coalesce(
+            Subquery(
+                Ticket.objects.filter(journey=OuterRef("pk"))
+                .order_by()
+                .values("journey")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0006_journeysummary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_tickets_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0007_journey_tickets_sold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
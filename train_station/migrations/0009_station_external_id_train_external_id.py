@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("train_station", "0008_journey_external_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="station",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="train",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
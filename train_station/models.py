@@ -1,6 +1,11 @@
-from django.db import models
+import functools
+
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
+from train_station.caching import response_cache
+from train_station.seat_map import SeatMap
 from train_station_api_service import settings
 
 
@@ -8,6 +13,8 @@ class Station(models.Model):
     name = models.CharField(max_length=255, unique=True)
     latitude = models.FloatField()
     longitude = models.FloatField()
+    # Identifies stations loaded from an external timetable (GTFS stop_id)
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
 
     def __str__(self):
         return self.name
@@ -65,6 +72,8 @@ class Train(models.Model):
     train_type = models.ForeignKey(
         to=TrainType, on_delete=models.CASCADE, related_name="trains"
     )
+    # Identifies trains loaded from an external timetable (GTFS route_id)
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
 
     class Meta:
         ordering = ["name"]
@@ -73,6 +82,27 @@ class Train(models.Model):
     def capacity(self) -> int:
         return self.cargo_num * self.places_in_cargo
 
+    @staticmethod
+    def validate_layout(train_id, cargo_num, places_in_cargo, error_to_raise):
+        # Seat maps store sold seats by their position in the layout
+        if (
+            Train.objects.filter(pk=train_id, journeys__tickets__isnull=False)
+            .exclude(cargo_num=cargo_num, places_in_cargo=places_in_cargo)
+            .exists()
+        ):
+            raise error_to_raise(
+                "cargo_num and places_in_cargo can't change once tickets are sold"
+            )
+
+    def clean(self):
+        if self.pk is not None:
+            Train.validate_layout(
+                self.pk,
+                self.cargo_num,
+                self.places_in_cargo,
+                ValidationError,
+            )
+
     def __str__(self):
         return self.name
 
@@ -82,7 +112,7 @@ class Crew(models.Model):
     last_name = models.CharField(max_length=255)
 
     @property
-    def full_name(self):
+    def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
 
     def __str__(self):
@@ -99,9 +129,25 @@ class Journey(models.Model):
     crews = models.ManyToManyField(to=Crew, related_name="journeys")
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
+    # Identifies journeys loaded from an external timetable (GTFS trip + date)
+    external_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    seat_bitmap = models.BinaryField(default=bytes)
+    tickets_sold = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
-        ordering = ["-departure_time"]
+        ordering = ["-departure_time", "-id"]
+        indexes = [
+            models.Index(
+                fields=["-departure_time", "-id"], name="journey_departure_id_idx"
+            ),
+            models.Index(
+                fields=["route", "departure_time"], name="journey_route_departure_idx"
+            ),
+            models.Index(
+                fields=["train", "departure_time"], name="journey_train_departure_idx"
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -109,6 +155,133 @@ class Journey(models.Model):
             f"{self.departure_time} - {self.arrival_time}"
         )
 
+    @property
+    def seats_available(self) -> int:
+        return self.train.capacity - self.tickets_sold
+
+    def get_seat_map(self) -> SeatMap:
+        return SeatMap(
+            self.train.cargo_num,
+            self.train.places_in_cargo,
+            bytes(self.seat_bitmap),
+        )
+
+    @staticmethod
+    def update_seat_map(journey_id, taken=(), released=(), rebuild=False):
+        with transaction.atomic():
+            journey = (
+                Journey.objects.select_for_update(of=("self",))
+                .select_related("train")
+                .filter(pk=journey_id)
+                .first()
+            )
+            if journey is None:
+                return
+
+            if rebuild:
+                seat_map = SeatMap(
+                    journey.train.cargo_num, journey.train.places_in_cargo
+                )
+                taken = journey.tickets.values_list("cargo", "seat")
+            else:
+                seat_map = journey.get_seat_map()
+
+            for cargo, seat in released:
+                seat_map.release(cargo, seat)
+            for cargo, seat in taken:
+                seat_map.take(cargo, seat)
+            Journey.objects.filter(pk=journey_id).update(
+                seat_bitmap=seat_map.to_bytes(),
+                tickets_sold=seat_map.taken_count,
+                updated_at=timezone.now(),
+            )
+            JourneySummary.objects.filter(journey_id=journey_id).update(
+                tickets_sold=seat_map.taken_count
+            )
+            transaction.on_commit(functools.partial(response_cache.invalidate, Journey))
+
+
+class JourneySummary(models.Model):
+    """Flat copy of the journey list row, refreshed on every related write"""
+
+    journey = models.OneToOneField(
+        to=Journey,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    route = models.ForeignKey(to=Route, on_delete=models.CASCADE, related_name="+")
+    train = models.ForeignKey(to=Train, on_delete=models.CASCADE, related_name="+")
+    source = models.CharField(max_length=255)
+    destination = models.CharField(max_length=255)
+    train_name = models.CharField(max_length=255)
+    train_type = models.CharField(max_length=255)
+    train_cargo_num = models.IntegerField()
+    places_in_cargo = models.IntegerField()
+    capacity = models.IntegerField()
+    tickets_sold = models.IntegerField(default=0)
+    crews = models.JSONField(default=list)
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-departure_time", "-pk"]
+        indexes = [
+            models.Index(
+                fields=["-departure_time", "-journey"],
+                name="summary_departure_idx",
+            ),
+            models.Index(
+                fields=["route", "departure_time"], name="summary_route_departure_idx"
+            ),
+            models.Index(
+                fields=["train", "departure_time"], name="summary_train_departure_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return str(self.journey_id)
+
+    @property
+    def seats_available(self) -> int:
+        return self.capacity - self.tickets_sold
+
+    @classmethod
+    def refresh(cls, journeys):
+        """Upsert the summaries of the given journeys (ids or a queryset)"""
+        summaries = [
+            cls(
+                journey=journey,
+                route=journey.route,
+                train=journey.train,
+                source=journey.route.source.name,
+                destination=journey.route.destination.name,
+                train_name=journey.train.name,
+                train_type=journey.train.train_type.name,
+                train_cargo_num=journey.train.cargo_num,
+                places_in_cargo=journey.train.places_in_cargo,
+                capacity=journey.train.capacity,
+                tickets_sold=journey.tickets_sold,
+                crews=[crew.full_name for crew in journey.crews.all()],
+                departure_time=journey.departure_time,
+                arrival_time=journey.arrival_time,
+            )
+            for journey in Journey.objects.filter(pk__in=journeys)
+            .order_by()
+            .select_related("route__source", "route__destination", "train__train_type")
+            .prefetch_related("crews")
+        ]
+        cls.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["journey"],
+            update_fields=[
+                field.name
+                for field in cls._meta.concrete_fields
+                if not field.primary_key
+            ],
+        )
+
 
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
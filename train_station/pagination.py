@@ -0,0 +1,96 @@
+from base64 import b64decode, b64encode
+from datetime import datetime
+from urllib import parse
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset pagination on ``(ordering_field, pk)``, both descending.
+
+    The cursor holds the field value and the pk of the row at the page edge,
+    so rows sharing a value are split by pk: rows inserted meanwhile never
+    shift or repeat later pages, and every page is an index range scan with
+    no offset, however deep it is.
+    """
+
+    ordering_field = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.pk_name = queryset.model._meta.pk.attname
+        cursor = self.decode_cursor(request)
+        self.reverse = cursor is not None and cursor[2]
+
+        field = self.ordering_field
+        if self.reverse:
+            queryset = queryset.order_by(field, "pk")
+        else:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+        if cursor is not None:
+            value, pk, _ = cursor
+            direction = "gt" if self.reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"{field}__{direction}": value})
+                | Q(**{field: value, f"pk__{direction}": pk})
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        if self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor((*self.get_key(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor((*self.get_key(self.page[0]), True))
+
+    def get_key(self, row):
+        if isinstance(row, dict):
+            return row[self.ordering_field], row[self.pk_name]
+        return getattr(row, self.ordering_field), row.pk
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"))
+            value = datetime.fromisoformat(tokens["v"][0])
+            pk = int(tokens["p"][0])
+            reverse = tokens.get("r", ["0"])[0] == "1"
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk, reverse
+
+    def encode_cursor(self, cursor):
+        value, pk, reverse = cursor
+        tokens = {"v": value.isoformat(), "p": pk}
+        if reverse:
+            tokens["r"] = "1"
+        encoded = b64encode(parse.urlencode(tokens).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
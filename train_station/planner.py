@@ -0,0 +1,77 @@
+from collections import namedtuple
+from datetime import timedelta
+
+
+Connection = namedtuple(
+    "Connection",
+    ("departure_time", "arrival_time", "source_id", "destination_id", "journey_id"),
+)
+
+
+def earliest_arrival(connections, origin, destination, depart_after, min_transfer):
+    """
+    Connection scan over ``connections`` sorted by departure time.
+
+    Returns the legs of the itinerary reaching ``destination`` first,
+    or an empty list if it can't be reached.
+    """
+    ready_at = {origin: depart_after}
+    arrival_at = {}
+    reached_by = {}
+
+    for connection in connections:
+        if connection.departure_time < depart_after:
+            continue
+        if destination in arrival_at and (
+            connection.departure_time >= arrival_at[destination]
+        ):
+            break
+        if connection.source_id not in ready_at:
+            continue
+        if connection.departure_time < ready_at[connection.source_id]:
+            continue
+        if connection.destination_id in arrival_at and (
+            connection.arrival_time >= arrival_at[connection.destination_id]
+        ):
+            continue
+        if connection.destination_id == origin:
+            continue
+
+        arrival_at[connection.destination_id] = connection.arrival_time
+        ready_at[connection.destination_id] = connection.arrival_time + min_transfer
+        reached_by[connection.destination_id] = connection
+
+    if destination not in reached_by:
+        return []
+
+    legs = []
+    stop = destination
+    while stop != origin:
+        legs.append(reached_by[stop])
+        stop = reached_by[stop].source_id
+
+    return legs[::-1]
+
+
+def plan_itineraries(
+    connections,
+    origin,
+    destination,
+    depart_after,
+    min_transfer=timedelta(minutes=10),
+    limit=3,
+):
+    """
+    Earliest-arrival itineraries with successively later first departures.
+    """
+    itineraries = []
+    while len(itineraries) < limit:
+        legs = earliest_arrival(
+            connections, origin, destination, depart_after, min_transfer
+        )
+        if not legs:
+            break
+        itineraries.append(legs)
+        depart_after = legs[0].departure_time + timedelta(microseconds=1)
+
+    return itineraries
@@ -0,0 +1,131 @@
+import logging
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger("train_station.queries")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` collecting SQL and its duration"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started_at))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def duplicates(self) -> dict:
+        """SQL shapes (parameters excluded) executed more than once"""
+        shapes = Counter(sql for sql, _ in self.queries)
+        return {sql: count for sql, count in shapes.items() if count > 1}
+
+
+def get_query_budget(view_func, method):
+    """
+    The budget a view declares in ``query_budget``, either one int for the
+    whole view or a dict of budgets per viewset action (per lowercase HTTP
+    method on other views).
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        method = method.lower()
+        actions = getattr(view_func, "actions", None) or {}
+        return budget.get(actions.get(method, method))
+
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the SQL query count, total DB time and duplicated query shapes
+    of every request, checks them against the view's declared query budget
+    and, with ``QUERY_STATS_HEADERS`` on, reports them in ``X-DB-Queries`` /
+    ``X-DB-Time`` headers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        return self.check_budget(request, response, recorder)
+
+    async def __acall__(self, request):
+        # The async ORM runs its queries on the request's sync thread, whose
+        # connection is a different object than the event loop thread's
+        recorder = QueryRecorder()
+        await sync_to_async(self.start_recording)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self.stop_recording)(recorder)
+        return self.check_budget(request, response, recorder)
+
+    @staticmethod
+    def start_recording(recorder):
+        connection.execute_wrappers.append(recorder)
+
+    @staticmethod
+    def stop_recording(recorder):
+        connection.execute_wrappers.remove(recorder)
+
+    def check_budget(self, request, response, recorder):
+        budget = getattr(request, "query_budget", None)
+        response.query_stats = {
+            "queries": recorder.count,
+            "time": recorder.total_time,
+            "duplicates": recorder.duplicates,
+            "budget": budget,
+        }
+        if settings.QUERY_STATS_HEADERS:
+            response["X-DB-Queries"] = str(recorder.count)
+            response["X-DB-Time"] = f"{recorder.total_time * 1000:.1f}ms"
+
+        if budget is not None and recorder.count > budget:
+            message = (
+                f"{request.method} {request.path} ran {recorder.count} queries, "
+                f"budget is {budget}"
+            )
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func, request.method)
@@ -0,0 +1,56 @@
+import base64
+
+
+class SeatMap:
+    """One bit per (cargo, seat) pair, cargo-major, 1 means the seat is taken."""
+
+    def __init__(self, cargo_num: int, places_in_cargo: int, data: bytes = b""):
+        self.cargo_num = cargo_num
+        self.places_in_cargo = places_in_cargo
+        self._bits = bytearray(data[: self.byte_size])
+        self._bits.extend(bytes(self.byte_size - len(self._bits)))
+
+    @property
+    def size(self) -> int:
+        return self.cargo_num * self.places_in_cargo
+
+    @property
+    def byte_size(self) -> int:
+        return (self.size + 7) // 8
+
+    def _position(self, cargo: int, seat: int) -> int:
+        if not (1 <= cargo <= self.cargo_num and 1 <= seat <= self.places_in_cargo):
+            raise IndexError(f"Seat ({cargo}, {seat}) is outside of the train")
+        return (cargo - 1) * self.places_in_cargo + (seat - 1)
+
+    def is_taken(self, cargo: int, seat: int) -> bool:
+        position = self._position(cargo, seat)
+        return bool(self._bits[position >> 3] & (1 << (position & 7)))
+
+    def take(self, cargo: int, seat: int) -> None:
+        position = self._position(cargo, seat)
+        self._bits[position >> 3] |= 1 << (position & 7)
+
+    def release(self, cargo: int, seat: int) -> None:
+        position = self._position(cargo, seat)
+        self._bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    @property
+    def taken_count(self) -> int:
+        return int.from_bytes(self._bits, "little").bit_count()
+
+    @property
+    def available_count(self) -> int:
+        return self.size - self.taken_count
+
+    def taken_seats(self):
+        for position in range(self.size):
+            if self._bits[position >> 3] & (1 << (position & 7)):
+                cargo, seat = divmod(position, self.places_in_cargo)
+                yield cargo + 1, seat + 1
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._bits)
+
+    def encode(self) -> str:
+        return base64.b64encode(self._bits).decode("ascii")
@@ -1,10 +1,16 @@
-from django.db import transaction
+from collections import defaultdict
+
+from django.db import transaction, IntegrityError
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.validators import UniqueTogetherValidator
 
+from train_station.exceptions import SeatsAlreadyTaken
+from train_station.holds import get_seat_hold_backend
 from train_station.models import (
     Train,
     Journey,
+    JourneySummary,
     Station,
     Route,
     TrainType,
@@ -14,12 +20,87 @@ from train_station.models import (
 )
 
 
+class BatchListSerializer(serializers.ListSerializer):
+    """Loads the related objects of the whole batch with one query per relation"""
+
+    def to_internal_value(self, data):
+        self.load_related_objects(data)
+        return super().to_internal_value(data)
+
+    def load_related_objects(self, data):
+        self.related_objects = {}
+        if not isinstance(data, list):
+            return
+
+        # Fields pointing at the same model share one query
+        fields = defaultdict(list)
+        for field in self.child.fields.values():
+            if isinstance(field, BatchPrimaryKeyRelatedField):
+                fields[field.get_queryset().model].append(field)
+
+        for related_fields in fields.values():
+            pks = {
+                str(item[field.field_name])
+                for field in related_fields
+                for item in data
+                if isinstance(item, dict) and item.get(field.field_name) is not None
+            }
+            objects = (
+                related_fields[0]
+                .get_queryset()
+                .in_bulk([pk for pk in pks if pk.isdigit()])
+            )
+            for field in related_fields:
+                self.related_objects[field.field_name] = objects
+
+
+class BatchPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    def to_internal_value(self, data):
+        batch = getattr(self.parent, "parent", None)
+        related_objects = getattr(batch, "related_objects", {}).get(self.field_name)
+        if related_objects and str(data).isdigit() and int(data) in related_objects:
+            return related_objects[int(data)]
+
+        return super().to_internal_value(data)
+
+
 class StationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Station
         fields = ("id", "name", "latitude", "longitude")
 
 
+class NearbyStationQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(min_value=0, max_value=2000, default=50)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class NearbyStationSerializer(StationSerializer):
+    distance_km = serializers.FloatField()
+
+    class Meta:
+        model = Station
+        fields = ("id", "name", "latitude", "longitude", "distance_km")
+
+
+class RouteWriteSerializer(serializers.ModelSerializer):
+    serializer_related_field = BatchPrimaryKeyRelatedField
+
+    class Meta:
+        model = Route
+        fields = ("id", "source", "destination", "distance")
+
+    def validate(self, attrs):
+        Route.validate_route(
+            attrs.get("source", getattr(self.instance, "source", None)),
+            attrs.get("destination", getattr(self.instance, "destination", None)),
+            ValidationError,
+        )
+        return attrs
+
+
 class RouteSerializer(serializers.ModelSerializer):
     source = StationSerializer(many=False, read_only=True)
     destination = StationSerializer(many=False, read_only=True)
@@ -36,6 +117,8 @@ class TrainTypeSerializer(serializers.ModelSerializer):
 
 
 class TrainSerializer(serializers.ModelSerializer):
+    serializer_related_field = BatchPrimaryKeyRelatedField
+
     class Meta:
         model = Train
         fields = (
@@ -47,6 +130,16 @@ class TrainSerializer(serializers.ModelSerializer):
             "train_type",
         )
 
+    def validate(self, attrs):
+        if self.instance is not None:
+            layout = (
+                attrs.get("cargo_num", self.instance.cargo_num),
+                attrs.get("places_in_cargo", self.instance.places_in_cargo),
+            )
+            if layout != (self.instance.cargo_num, self.instance.places_in_cargo):
+                Train.validate_layout(self.instance.pk, *layout, ValidationError)
+        return attrs
+
 
 class TrainDetailSerializer(TrainSerializer):
     train_type = TrainTypeSerializer(many=False, read_only=True)
@@ -83,6 +176,7 @@ class JourneyListSerializer(JourneySerializer):
     train_type = serializers.CharField(source="train.train_type")
     train_cargo_num = serializers.IntegerField(source="train.cargo_num")
     places_in_cargo = serializers.IntegerField(source="train.places_in_cargo")
+    seats_available = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Journey
@@ -93,12 +187,23 @@ class JourneyListSerializer(JourneySerializer):
             "train_type",
             "train_cargo_num",
             "places_in_cargo",
+            "seats_available",
             "crews",
             "departure_time",
             "arrival_time",
         )
 
 
+class JourneySummarySerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="journey_id")
+    route = serializers.IntegerField(source="route_id")
+    seats_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = JourneySummary
+        fields = JourneyListSerializer.Meta.fields
+
+
 class JourneyDetailSerializer(JourneySerializer):
     crews = CrewSerializer(many=True, read_only=True)
     train = TrainDetailSerializer(many=False, read_only=True)
@@ -109,6 +214,7 @@ class JourneyDetailSerializer(JourneySerializer):
     taken_cargo = serializers.SlugRelatedField(
         source="tickets", many=True, read_only=True, slug_field="cargo"
     )
+    seats_available = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Journey
@@ -117,6 +223,7 @@ class JourneyDetailSerializer(JourneySerializer):
             "route",
             "train",
             "crews",
+            "seats_available",
             "taken_cargo",
             "taken_seats",
             "departure_time",
@@ -124,7 +231,118 @@ class JourneyDetailSerializer(JourneySerializer):
         )
 
 
+class JourneySeatMapSerializer(serializers.ModelSerializer):
+    cargo_num = serializers.IntegerField(source="train.cargo_num")
+    places_in_cargo = serializers.IntegerField(source="train.places_in_cargo")
+    seats_available = serializers.SerializerMethodField()
+    seat_map = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Journey
+        fields = ("id", "cargo_num", "places_in_cargo", "seats_available", "seat_map")
+
+    def get_seats_available(self, obj) -> int:
+        return obj.get_seat_map().available_count
+
+    def get_seat_map(self, obj) -> str:
+        return obj.get_seat_map().encode()
+
+
+class JourneyFilterSerializer(serializers.Serializer):
+    route = serializers.IntegerField(required=False)
+    train = serializers.IntegerField(required=False)
+    departure_date = serializers.DateField(required=False)
+
+
+class JourneyPlanQuerySerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    depart_after = serializers.DateTimeField(required=False)
+    min_transfer = serializers.IntegerField(min_value=0, default=10)
+    limit = serializers.IntegerField(min_value=1, max_value=10, default=3)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["from"] = fields.pop("source")
+        fields["to"] = fields.pop("destination")
+        return fields
+
+    def validate(self, attrs):
+        Route.validate_route(attrs["from"], attrs["to"], ValidationError)
+        stations = set(
+            Station.objects.filter(pk__in=(attrs["from"], attrs["to"])).values_list(
+                "pk", flat=True
+            )
+        )
+        for param in ("from", "to"):
+            if attrs[param] not in stations:
+                raise ValidationError({param: f"Invalid station id {attrs[param]}."})
+
+        return attrs
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    journey = serializers.IntegerField(required=False)
+    route = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    output = serializers.ChoiceField(choices=("csv", "ndjson"), default="csv")
+
+    def validate(self, attrs):
+        if (
+            "date_from" in attrs
+            and "date_to" in attrs
+            and attrs["date_from"] > attrs["date_to"]
+        ):
+            raise ValidationError({"date_to": "date_to can't be before date_from."})
+
+        return attrs
+
+
+class ItineraryLegSerializer(serializers.ModelSerializer):
+    source = serializers.CharField(source="route.source.name")
+    destination = serializers.CharField(source="route.destination.name")
+    train_name = serializers.CharField(source="train.name")
+
+    class Meta:
+        model = Journey
+        fields = (
+            "id",
+            "source",
+            "destination",
+            "train_name",
+            "departure_time",
+            "arrival_time",
+        )
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    transfers = serializers.IntegerField()
+    legs = ItineraryLegSerializer(many=True)
+
+
+class TicketBatchSerializer(BatchListSerializer):
+    def validate(self, attrs):
+        seats = [
+            (ticket["journey"].id, ticket["cargo"], ticket["seat"]) for ticket in attrs
+        ]
+        if len(set(seats)) != len(seats):
+            raise ValidationError(
+                UniqueTogetherValidator.message.format(
+                    field_names="journey, cargo, seat"
+                )
+            )
+
+        return attrs
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    journey = BatchPrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train")
+    )
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
@@ -135,6 +353,9 @@ class TicketSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ticket
         fields = ("id", "cargo", "seat", "journey")
+        list_serializer_class = TicketBatchSerializer
+        # (journey, cargo, seat) uniqueness is checked once for the whole batch
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
@@ -147,6 +368,49 @@ class TicketSeatsSerializer(TicketSerializer):
         fields = ("cargo", "seat")
 
 
+class SeatSerializer(serializers.Serializer):
+    cargo = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    id = serializers.CharField(read_only=True)
+    journey = serializers.IntegerField(read_only=True)
+    seats = SeatSerializer(many=True, allow_empty=False)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+    def validate_seats(self, seats):
+        journey = self.context["journey"]
+        for seat in seats:
+            Ticket.validate_ticket(
+                seat["cargo"], seat["seat"], journey.train, ValidationError
+            )
+        if len({(seat["cargo"], seat["seat"]) for seat in seats}) != len(seats):
+            raise ValidationError("Seats must be unique")
+
+        return seats
+
+    def create(self, validated_data):
+        journey = self.context["journey"]
+        seats = [
+            (journey.id, seat["cargo"], seat["seat"])
+            for seat in validated_data["seats"]
+        ]
+        taken_seats = set(seats).intersection(
+            journey.tickets.values_list("journey_id", "cargo", "seat")
+        )
+        if taken_seats:
+            raise SeatsAlreadyTaken(taken_seats)
+
+        hold, held_seats = get_seat_hold_backend().acquire(
+            journey.id, seats, self.context["request"].user.id
+        )
+        if held_seats:
+            raise SeatsAlreadyTaken(held_seats)
+
+        return hold
+
+
 class OrderSerializer(serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
 
@@ -157,9 +421,62 @@ class OrderSerializer(serializers.ModelSerializer):
     @transaction.atomic
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
+        seats = {
+            (ticket_data["journey"].id, ticket_data["cargo"], ticket_data["seat"])
+            for ticket_data in tickets_data
+        }
+        journey_ids = {journey_id for journey_id, _, _ in seats}
+
+        # Booking a journey is serialized on its row lock, taken in pk order
+        # so that orders spanning several journeys can't deadlock each other.
+        list(
+            Journey.objects.select_for_update()
+            .filter(pk__in=journey_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        taken_seats = seats.intersection(
+            Ticket.objects.filter(
+                journey_id__in=journey_ids,
+                cargo__in={cargo for _, cargo, _ in seats},
+                seat__in={seat for _, _, seat in seats},
+            ).values_list("journey_id", "cargo", "seat")
+        )
+        if taken_seats:
+            raise SeatsAlreadyTaken(taken_seats)
+
+        hold_backend = get_seat_hold_backend()
+        user_id = validated_data["user"].id
+        held_seats = {
+            seat
+            for seat, holder_id in hold_backend.holders(seats).items()
+            if holder_id != user_id
+        }
+        if held_seats:
+            raise SeatsAlreadyTaken(held_seats)
+
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        try:
+            with transaction.atomic():
+                tickets = Ticket.objects.bulk_create(
+                    [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+                )
+        except IntegrityError:
+            raise SeatsAlreadyTaken(
+                seats.intersection(
+                    Ticket.objects.filter(journey_id__in=journey_ids).values_list(
+                        "journey_id", "cargo", "seat"
+                    )
+                )
+            )
+
+        journey_seats = defaultdict(list)
+        for ticket in tickets:
+            journey_seats[ticket.journey_id].append((ticket.cargo, ticket.seat))
+        for journey_id, booked_seats in journey_seats.items():
+            Journey.update_seat_map(journey_id, taken=booked_seats)
+        transaction.on_commit(lambda: hold_backend.release_seats(seats, user_id))
+
         return order
 
 
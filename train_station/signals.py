@@ -0,0 +1,195 @@
+import functools
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    post_save,
+    post_delete,
+    pre_delete,
+    pre_save,
+    m2m_changed,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from train_station.bulk import bulk_saved
+from train_station.caching import response_cache
+from train_station.geo import station_grid
+from train_station.models import (
+    Journey,
+    JourneySummary,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+    Crew,
+)
+from train_station.timetable import timetable
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_journey(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._previous_journey_id = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values_list("journey_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def take_ticket_seat(sender, instance, created, **kwargs):
+    if created:
+        Journey.update_seat_map(
+            instance.journey_id, taken=[(instance.cargo, instance.seat)]
+        )
+    else:
+        Journey.update_seat_map(instance.journey_id, rebuild=True)
+        previous_journey_id = getattr(instance, "_previous_journey_id", None)
+        if previous_journey_id not in (None, instance.journey_id):
+            Journey.update_seat_map(previous_journey_id, rebuild=True)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, **kwargs):
+    Journey.update_seat_map(
+        instance.journey_id, released=[(instance.cargo, instance.seat)]
+    )
+
+
+# The in-memory indexes only change once the write is committed, a rolled
+# back one would otherwise leave entries for rows that don't exist
+
+
+@receiver(post_save, sender=Journey)
+def index_journey(sender, instance, **kwargs):
+    transaction.on_commit(functools.partial(timetable.journey_saved, instance.id))
+    JourneySummary.refresh([instance.id])
+
+
+@receiver(post_delete, sender=Journey)
+def unindex_journey(sender, instance, **kwargs):
+    transaction.on_commit(functools.partial(timetable.journey_deleted, instance.id))
+
+
+@receiver(post_save, sender=Route)
+def reindex_route(sender, instance, created, **kwargs):
+    if not created:
+        transaction.on_commit(timetable.invalidate)
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+@receiver(bulk_saved, sender=Station)
+def reindex_stations(sender, **kwargs):
+    transaction.on_commit(station_grid.invalidate)
+
+
+@receiver([post_save, post_delete], sender=Station)
+@receiver([post_save, post_delete], sender=Route)
+@receiver([post_save, post_delete], sender=TrainType)
+@receiver([post_save, post_delete], sender=Train)
+@receiver([post_save, post_delete], sender=Crew)
+@receiver([post_save, post_delete], sender=Journey)
+@receiver(bulk_saved, sender=Station)
+@receiver(bulk_saved, sender=Route)
+@receiver(bulk_saved, sender=Train)
+@receiver(bulk_saved, sender=Crew)
+def invalidate_cached_responses(sender, **kwargs):
+    # Bumped before the commit, a concurrent request could cache the old
+    # rows under the new version
+    transaction.on_commit(functools.partial(response_cache.invalidate, sender))
+
+
+def touch_journeys(*args, **kwargs):
+    journeys = Journey.objects.filter(*args, **kwargs)
+    JourneySummary.refresh(journeys.values("pk"))
+    # Stamped on commit, a timestamp taken inside the transaction can be older
+    # than one committed meanwhile and keep the list's ETag
+    transaction.on_commit(lambda: journeys.update(updated_at=timezone.now()))
+    transaction.on_commit(functools.partial(response_cache.invalidate, Journey))
+
+
+@receiver(bulk_saved, sender=Station)
+def touch_bulk_station_journeys(sender, instances, created, **kwargs):
+    if not created:
+        touch_journeys(
+            Q(route__source__in=instances) | Q(route__destination__in=instances)
+        )
+
+
+@receiver(bulk_saved, sender=Route)
+def touch_bulk_route_journeys(sender, instances, created, **kwargs):
+    if not created:
+        transaction.on_commit(timetable.invalidate)
+        touch_journeys(route__in=instances)
+
+
+@receiver(bulk_saved, sender=Train)
+def touch_bulk_train_journeys(sender, instances, created, **kwargs):
+    if not created:
+        touch_journeys(train__in=instances)
+
+
+@receiver(bulk_saved, sender=Crew)
+def touch_bulk_crew_journeys(sender, instances, created, **kwargs):
+    if not created:
+        touch_journeys(crews__in=instances)
+
+
+def remember_crew_journeys(crew):
+    crew._journey_ids = list(crew.journeys.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Station)
+def touch_station_journeys(sender, instance, created, **kwargs):
+    if not created:
+        touch_journeys(Q(route__source=instance) | Q(route__destination=instance))
+
+
+@receiver(post_save, sender=Route)
+def touch_route_journeys(sender, instance, created, **kwargs):
+    if not created:
+        touch_journeys(route=instance)
+
+
+@receiver(post_save, sender=TrainType)
+def touch_train_type_journeys(sender, instance, created, **kwargs):
+    if not created:
+        touch_journeys(train__train_type=instance)
+
+
+@receiver(post_save, sender=Train)
+def touch_train_journeys(sender, instance, created, **kwargs):
+    if not created:
+        touch_journeys(train=instance)
+
+
+@receiver(post_save, sender=Crew)
+def touch_crew_journeys(sender, instance, created, **kwargs):
+    if not created:
+        touch_journeys(crews=instance)
+
+
+@receiver(pre_delete, sender=Crew)
+def remember_deleted_crew_journeys(sender, instance, **kwargs):
+    remember_crew_journeys(instance)
+
+
+@receiver(post_delete, sender=Crew)
+def touch_deleted_crew_journeys(sender, instance, **kwargs):
+    touch_journeys(pk__in=instance._journey_ids)
+
+
+@receiver(m2m_changed, sender=Journey.crews.through)
+def touch_crews_changed_journeys(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        remember_crew_journeys(instance)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if not reverse:
+            touch_journeys(pk=instance.pk)
+        elif action == "post_clear":
+            touch_journeys(pk__in=instance._journey_ids)
+        elif pk_set:
+            touch_journeys(pk__in=pk_set)
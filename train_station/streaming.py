@@ -0,0 +1,55 @@
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.utils.encoders import JSONEncoder
+
+from train_station.bulk_loading import batched
+
+
+def stream_json_array(chunks):
+    """Encodes an iterable of item lists as one JSON array, chunk by chunk"""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    yield "["
+    separator = ""
+    for chunk in chunks:
+        if chunk:
+            yield separator + ",".join(encoder.encode(item) for item in chunk)
+            separator = ","
+    yield "]"
+
+
+class StreamingListMixin:
+    """
+    ``?stream=true`` returns the whole, unpaginated list as a streamed JSON
+    array. Rows are read with ``.iterator()`` and serialized one chunk at a
+    time, so memory stays flat however long the list is. It reads the whole
+    table, so only staff may ask for it.
+    """
+
+    stream_chunk_size = 1000
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("stream") not in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+        if not request.user.is_staff:
+            raise PermissionDenied("Streaming the whole list is for staff only.")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            stream_json_array(self.serialize_chunks(queryset)),
+            content_type="application/json",
+        )
+
+    def serialize_chunks(self, queryset):
+        values_serializer = getattr(self, "values_serializer_class", None)
+        if values_serializer is not None and settings.FAST_LIST_SERIALIZATION:
+            rows = values_serializer.values(queryset).iterator(self.stream_chunk_size)
+            for chunk in batched(rows, self.stream_chunk_size):
+                yield values_serializer.serialize(chunk)
+            return
+
+        rows = queryset.iterator(self.stream_chunk_size)
+        for chunk in batched(rows, self.stream_chunk_size):
+            yield self.get_serializer(chunk, many=True).data
@@ -0,0 +1,19 @@
+class QueryBudgetTestMixin:
+    """Assertions on the query stats QueryBudgetMiddleware attaches"""
+
+    def assertWithinQueryBudget(self, response, allow_duplicates=False):
+        stats = response.query_stats
+        request = getattr(response, "wsgi_request", None) or response.asgi_request
+        path = request.path
+        self.assertIsNotNone(stats["budget"], f"{path} declares no query budget")
+        self.assertLessEqual(
+            stats["queries"],
+            stats["budget"],
+            f"{path} exceeded its query budget",
+        )
+        if not allow_duplicates:
+            self.assertEqual(
+                stats["duplicates"],
+                {},
+                f"{path} repeated queries",
+            )
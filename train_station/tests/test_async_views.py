@@ -0,0 +1,172 @@
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from train_station.models import Journey, Route
+from train_station.tests.query_budget import QueryBudgetTestMixin
+from train_station.tests.test_train_station_api import (
+    detail_url,
+    sample_journey,
+    sample_station,
+    sample_train,
+)
+
+
+def at(hour):
+    return datetime(2030, 1, 1, hour, tzinfo=timezone.utc)
+
+
+class AsyncReadApiTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    async def get(self, name, *args, **params):
+        headers = params.pop("headers", self.headers)
+        response = await self.async_client.get(
+            reverse(f"train_station:{name}", args=args), params, headers=headers
+        )
+        return response, json.loads(response.content or "null")
+
+    async def test_auth_required(self):
+        response, data = await self.get("async-station-list", headers={})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response, _ = await self.get(
+            "async-station-list", headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lists_match_sync_views(self):
+        for name in ("station", "route", "train"):
+            sync_response = self.client.get(reverse(f"train_station:{name}-list"))
+            response = self.client.get(
+                reverse(f"train_station:async-{name}-list"), headers=self.headers
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertWithinQueryBudget(response)
+            self.assertEqual(response.json(), sync_response.json())
+            # Cache entries are shared with the sync list
+            self.assertEqual(response["X-Cache"], "HIT")
+
+        sync_response = self.client.get(
+            reverse("train_station:journey-list"), {"route": self.journey.route_id}
+        )
+        response = self.client.get(
+            reverse("train_station:async-journey-list"),
+            {"route": self.journey.route_id},
+            headers=self.headers,
+        )
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(response.json()["results"], sync_response.json()["results"])
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+    async def test_journey_list_not_modified(self):
+        response, data = await self.get("async-journey-list")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [journey["id"] for journey in data["results"]], [self.journey.id]
+        )
+        self.assertIsNone(data["next"])
+
+        response, _ = await self.get(
+            "async-journey-list",
+            headers={**self.headers, "If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_journey_detail_and_seats(self):
+        sync_response = self.client.get(detail_url(self.journey.id))
+
+        response = self.client.get(
+            reverse("train_station:async-journey-detail", args=[self.journey.id]),
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+        response = self.client.get(
+            reverse("train_station:async-journey-seats", args=[self.journey.id]),
+            headers=self.headers,
+        )
+        self.assertEqual(
+            response.json(),
+            self.client.get(
+                reverse("train_station:journey-seats", args=[self.journey.id])
+            ).json(),
+        )
+
+    # Adapting a sync-only middleware is only logged in DEBUG
+    @override_settings(DEBUG=True)
+    @modify_settings(
+        MIDDLEWARE={"remove": "debug_toolbar.middleware.DebugToolbarMiddleware"}
+    )
+    async def test_async_stack_records_queries(self):
+        with self.assertNoLogs("django.request", level="DEBUG"):
+            response, _ = await self.get("async-journey-detail", self.journey.id)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(response.query_stats["queries"], 0)
+        self.assertWithinQueryBudget(response)
+
+    async def test_journey_not_found(self):
+        for name in ("async-journey-detail", "async-journey-seats"):
+            response, data = await self.get(name, 0)
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertIn("detail", data)
+
+    def test_plan_matches_sync_view(self):
+        train = sample_train()
+        kyiv, lviv, odesa = (
+            sample_station(name=name) for name in ("Kyiv", "Lviv", "Odesa")
+        )
+        for source, destination, departure in (
+            (kyiv, lviv, 8),
+            (lviv, odesa, 10),
+            (kyiv, odesa, 11),
+        ):
+            Journey.objects.create(
+                route=Route.objects.create(source=source, destination=destination),
+                train=train,
+                departure_time=at(departure),
+                arrival_time=at(departure + 1),
+            )
+        params = {"from": kyiv.id, "to": odesa.id, "depart_after": at(7).isoformat()}
+
+        sync_response = self.client.get(reverse("train_station:plan"), params)
+        response = self.client.get(
+            reverse("train_station:async-plan"), params, headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(response.json(), sync_response.json())
+
+        response = self.client.get(
+            reverse("train_station:async-plan"),
+            {"from": kyiv.id, "to": kyiv.id},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,177 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Crew, JourneySummary, Route, Station, Train
+from train_station.tests.query_budget import QueryBudgetTestMixin
+from train_station.tests.test_train_station_api import (
+    sample_journey,
+    sample_station,
+    sample_type,
+)
+
+
+STATION_BULK_URL = reverse("train_station:station-bulk")
+ROUTE_BULK_URL = reverse("train_station:route-bulk")
+TRAIN_BULK_URL = reverse("train_station:train-bulk")
+CREW_BULK_URL = reverse("train_station:crew-bulk")
+
+
+class BulkApiTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@gmail.com",
+            "adminpassword",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_create_stations(self):
+        self.client.get(reverse("train_station:station-list"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                STATION_BULK_URL,
+                [
+                    {"name": f"Station {number}", "latitude": number, "longitude": 1}
+                    for number in range(50)
+                ],
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(Station.objects.count(), 50)
+        self.assertEqual(response.data[49]["name"], "Station 49")
+        self.assertEqual(
+            len(self.client.get(reverse("train_station:station-list")).data), 50
+        )
+
+    def test_bulk_create_reports_item_errors(self):
+        sample_station(name="Kyiv")
+
+        response = self.client.post(
+            STATION_BULK_URL,
+            [
+                {"name": "Lviv", "latitude": 1, "longitude": 1},
+                {"name": "Kyiv", "latitude": 1, "longitude": 1},
+                {"name": "Odesa", "latitude": "north", "longitude": 1},
+                {"name": "Lviv", "latitude": 2, "longitude": 2},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("already exists", str(response.data[1]["name"]))
+        self.assertIn("latitude", response.data[2])
+        self.assertIn("Duplicates item 0", str(response.data[3]["name"]))
+        self.assertEqual(Station.objects.count(), 1)
+
+    def test_bulk_create_routes_and_trains(self):
+        kyiv, lviv = sample_station(name="Kyiv"), sample_station(name="Lviv")
+        train_type = sample_type()
+
+        response = self.client.post(
+            ROUTE_BULK_URL,
+            [
+                {"source": kyiv.id, "destination": lviv.id, "distance": 540},
+                {"source": lviv.id, "destination": kyiv.id},
+                {"source": kyiv.id, "destination": kyiv.id},
+                {"source": kyiv.id, "destination": 0},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[:2], [{}, {}])
+        self.assertIn("non_field_errors", response.data[2])
+        self.assertIn("destination", response.data[3])
+
+        response = self.client.post(
+            ROUTE_BULK_URL,
+            [{"source": kyiv.id, "destination": lviv.id, "distance": 540}] * 20,
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(Route.objects.count(), 20)
+
+        response = self.client.post(
+            TRAIN_BULK_URL,
+            [
+                {
+                    "name": f"Train {number}",
+                    "cargo_num": 5,
+                    "places_in_cargo": 40,
+                    "train_type": train_type.id,
+                }
+                for number in range(20)
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(Train.objects.filter(train_type=train_type).count(), 20)
+
+    def test_bulk_update_refreshes_journeys(self):
+        journey = sample_journey()
+        crew = journey.crews.first()
+        station = journey.route.source
+
+        response = self.client.patch(
+            CREW_BULK_URL,
+            [{"id": crew.id, "last_name": "Franko"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(response)
+        response = self.client.patch(
+            STATION_BULK_URL,
+            [{"id": station.id, "name": "Renamed"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        summary = JourneySummary.objects.get(journey=journey)
+        self.assertEqual(summary.source, "Renamed")
+        self.assertIn(f"{crew.first_name} Franko", summary.crews)
+        self.assertEqual(Crew.objects.get(pk=crew.pk).last_name, "Franko")
+
+    def test_bulk_update_unknown_and_taken(self):
+        kyiv, lviv = sample_station(name="Kyiv"), sample_station(name="Lviv")
+
+        response = self.client.patch(
+            STATION_BULK_URL,
+            [
+                {"id": kyiv.id, "name": "Lviv"},
+                {"id": lviv.id, "name": "Kyiv"},
+                {"id": 0, "name": "Odesa"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[:2], [{}, {}])
+        self.assertIn("id", response.data[2])
+
+        response = self.client.patch(
+            STATION_BULK_URL,
+            [{"id": kyiv.id, "name": "Lviv"}],
+            format="json",
+        )
+        self.assertIn("already exists", str(response.data[0]["name"]))
+
+    def test_bulk_requires_staff(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@gmail.com", "userpassword")
+        )
+
+        response = self.client.post(STATION_BULK_URL, [], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
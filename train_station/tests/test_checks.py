@@ -0,0 +1,15 @@
+from django.test import SimpleTestCase, override_settings
+
+from train_station.checks import check_deploy_secret_key
+
+
+class DeploySecretKeyCheckTests(SimpleTestCase):
+    @override_settings(SECRET_KEY="django-insecure-" + "x" * 50)
+    def test_generated_key_is_an_error(self):
+        errors = check_deploy_secret_key(None)
+
+        self.assertEqual([error.id for error in errors], ["train_station.E001"])
+
+    @override_settings(SECRET_KEY="kP9v-3xR_q7LmZ2wTb8NcY4hJs6FgD1eUa5oWi0rVt3yXn7Q2mLk")
+    def test_strong_key_passes(self):
+        self.assertEqual(check_deploy_secret_key(None), [])
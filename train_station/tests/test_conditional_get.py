@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Order, Ticket
+from train_station.tests.test_train_station_api import sample_journey, detail_url
+
+
+JOURNEY_URL = reverse("train_station:journey-list")
+
+
+class JourneyConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def test_list_not_modified_makes_no_queries(self):
+        response = self.client.get(JOURNEY_URL, {"route": self.journey.route_id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                JOURNEY_URL,
+                {"route": self.journey.route_id},
+                HTTP_IF_NONE_MATCH=response["ETag"],
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_changes_on_booking(self):
+        etag = self.client.get(JOURNEY_URL)["ETag"]
+
+        order = Order.objects.create(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(journey=self.journey, order=order, cargo=1, seat=1)
+
+        response = self.client.get(JOURNEY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["seats_available"], 299)
+
+    def test_list_etag_changes_on_journey_delete(self):
+        other = Journey.objects.create(
+            route=self.journey.route,
+            train=self.journey.train,
+            departure_time="2023-11-12",
+            arrival_time="2023-11-13",
+        )
+        etag = self.client.get(JOURNEY_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+
+        response = self.client.get(JOURNEY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [journey["id"] for journey in response.data["results"]], [self.journey.id]
+        )
+
+    def test_list_etag_changes_with_related_data(self):
+        etag = self.client.get(JOURNEY_URL)["ETag"]
+
+        self.journey.train.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journey.train.save()
+
+        response = self.client.get(JOURNEY_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_depends_on_filters(self):
+        etag = self.client.get(JOURNEY_URL)["ETag"]
+
+        response = self.client.get(
+            JOURNEY_URL, {"route": self.journey.route_id}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_changes_on_booking(self):
+        etag = self.client.get(detail_url(self.journey.id))["ETag"]
+
+        response = self.client.get(detail_url(self.journey.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(journey=self.journey, order=order, cargo=1, seat=1)
+
+        response = self.client.get(detail_url(self.journey.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["taken_seats"], [1])
+
+    def test_if_modified_since_alone_is_not_a_validator(self):
+        response = self.client.get(detail_url(self.journey.id))
+        self.assertNotIn("Last-Modified", response)
+
+        # Same second as the journey's updated_at, a write within it would be
+        # missed by a second-resolution date
+        response = self.client.get(
+            detail_url(self.journey.id),
+            HTTP_IF_MODIFIED_SINCE=http_date(self.journey.updated_at.timestamp()),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
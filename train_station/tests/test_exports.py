@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Order, Ticket
+from train_station.tests.test_train_station_api import sample_journey
+
+
+TICKET_EXPORT_URL = reverse("train_station:ticket-export")
+ORDER_EXPORT_URL = reverse("train_station:order-export")
+
+
+def content(response):
+    return b"".join(response.streaming_content).decode()
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@gmail.com",
+            "adminpassword",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.admin)
+
+        self.journey = sample_journey()
+        self.orders = []
+        for day, seats in ((1, (1, 2)), (2, (3,)), (3, (4, 5, 6))):
+            order = Order.objects.create(user=self.admin)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=datetime(2030, 1, day, 12, tzinfo=timezone.utc)
+            )
+            for seat in seats:
+                Ticket.objects.create(
+                    order=order, journey=self.journey, cargo=1, seat=seat
+                )
+            self.orders.append(order)
+
+    def test_ticket_csv_export(self):
+        response = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="tickets.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        self.assertEqual([row["seat"] for row in rows], ["1", "2", "3", "4", "5", "6"])
+        self.assertEqual(rows[0]["source"], self.journey.route.source.name)
+        self.assertEqual(rows[0]["ordered_at"], "2030-01-01T12:00:00+00:00")
+
+    def test_ticket_export_filters(self):
+        response = self.client.get(
+            TICKET_EXPORT_URL,
+            {
+                "route": self.journey.route_id,
+                "date_from": "2030-01-02",
+                "date_to": "2030-01-02",
+                "output": "ndjson",
+            },
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual([row["seat"] for row in rows], [3])
+        self.assertEqual(rows[0]["order_id"], self.orders[1].id)
+
+        response = self.client.get(TICKET_EXPORT_URL, {"journey": 0})
+        self.assertEqual(content(response).count("\n"), 1)
+
+    def test_order_export(self):
+        response = self.client.get(
+            ORDER_EXPORT_URL, {"date_from": "2030-01-02", "output": "ndjson"}
+        )
+
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual(
+            [(row["order_id"], row["tickets"]) for row in rows],
+            [(self.orders[1].id, 1), (self.orders[2].id, 3)],
+        )
+        self.assertEqual(rows[0]["user_email"], self.admin.email)
+
+    def test_order_export_journey_and_route_filters(self):
+        response = self.client.get(
+            ORDER_EXPORT_URL,
+            {
+                "journey": self.journey.id,
+                "route": self.journey.route_id,
+                "output": "ndjson",
+            },
+        )
+
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        self.assertEqual([row["tickets"] for row in rows], [2, 1, 3])
+
+    def test_invalid_params(self):
+        for params in (
+            {"output": "xml"},
+            {"date_from": "2030-01-02", "date_to": "2030-01-01"},
+        ):
+            response = self.client.get(TICKET_EXPORT_URL, params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@gmail.com", "userpassword")
+        )
+
+        for url in (TICKET_EXPORT_URL, ORDER_EXPORT_URL):
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
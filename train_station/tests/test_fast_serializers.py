@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.timezone import override
+from rest_framework.test import APIClient
+
+from train_station.fast_serializers import JourneySummaryValuesSerializer
+from train_station.models import Journey, JourneySummary, Order, Route, Ticket
+from train_station.serializers import JourneySummarySerializer
+from train_station.tests.test_train_station_api import (
+    sample_crew,
+    sample_station,
+    sample_train,
+)
+
+
+JOURNEY_URL = reverse("train_station:journey-list")
+ORDER_URL = reverse("train_station:order-list")
+
+
+class FastListSerializationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        stations = [sample_station(name=f"Station {number}") for number in range(4)]
+        departure_time = datetime(2030, 1, 1, 8, 30, 15, tzinfo=timezone.utc)
+        journeys = []
+        for number in range(3):
+            journey = Journey.objects.create(
+                route=Route.objects.create(
+                    source=stations[number], destination=stations[number + 1]
+                ),
+                train=sample_train(name=f"Train {number}"),
+                departure_time=departure_time + timedelta(hours=number),
+                arrival_time=departure_time + timedelta(hours=number + 1),
+            )
+            journey.crews.set(
+                [sample_crew(first_name=f"Driver {number}"), sample_crew()]
+            )
+            journeys.append(journey)
+
+        for number in range(7):
+            order = Order.objects.create(user=self.user)
+            for journey in journeys[number % 2 :]:
+                Ticket.objects.create(
+                    order=order, journey=journey, cargo=2, seat=10 - number
+                )
+
+    def assertSameResponse(self, url, params=None):
+        with override_settings(FAST_LIST_SERIALIZATION=False):
+            expected = self.client.get(url, params)
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected.json())
+
+    def test_journey_list(self):
+        self.assertSameResponse(JOURNEY_URL)
+        self.assertSameResponse(JOURNEY_URL, {"page_size": 2})
+        self.assertSameResponse(JOURNEY_URL, {"departure_date": "2030-01-01"})
+
+    def test_order_list(self):
+        self.assertSameResponse(ORDER_URL)
+        self.assertSameResponse(ORDER_URL, {"page": 2})
+
+    def test_datetimes_follow_active_timezone(self):
+        summaries = JourneySummary.objects.all()
+
+        with override(ZoneInfo("Europe/Kyiv")):
+            self.assertEqual(
+                JourneySummaryValuesSerializer.serialize(
+                    JourneySummaryValuesSerializer.values(summaries)
+                ),
+                JourneySummarySerializer(summaries, many=True).data,
+            )
@@ -0,0 +1,121 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, F
+from django.test import TestCase
+
+from train_station.management.commands.generate_dataset import DEFAULT_START_DATE
+from train_station.models import Journey, JourneySummary, Station, Ticket
+
+
+def generate(prefix, **options):
+    options = {
+        "stations": 6,
+        "journeys": 8,
+        "fill": 0.5,
+        "trains": 2,
+        "crews": 4,
+        "users": 3,
+        "seed": 7,
+        "start_date": "2030-01-01",
+        "batch_size": 100,
+        **options,
+    }
+    call_command(
+        "generate_dataset",
+        f"--prefix={prefix}",
+        *(
+            f"--{name.replace('_', '-')}={value}"
+            for name, value in options.items()
+            if value is not None
+        ),
+        stdout=StringIO(),
+    )
+
+
+def journey_rows(prefix):
+    return list(
+        Journey.objects.filter(train__name__startswith=f"{prefix} ")
+        .order_by("id")
+        .values_list(
+            "route__source__name",
+            "route__destination__name",
+            "train__name",
+            "departure_time",
+            "arrival_time",
+            "seat_bitmap",
+        )
+    )
+
+
+def unprefixed(rows, prefix):
+    return [
+        tuple(
+            value.removeprefix(prefix) if isinstance(value, str) else value
+            for value in row
+        )
+        for row in rows
+    ]
+
+
+class GenerateDatasetTests(TestCase):
+    def test_counters_match_tickets(self):
+        generate("a")
+
+        journeys = Journey.objects.select_related("train").annotate(
+            ticket_count=Count("tickets")
+        )
+        self.assertEqual(journeys.count(), 8)
+        for journey in journeys:
+            self.assertEqual(journey.tickets_sold, round(journey.train.capacity / 2))
+            self.assertEqual(journey.ticket_count, journey.tickets_sold)
+            self.assertEqual(
+                sorted(journey.get_seat_map().taken_seats()),
+                sorted(journey.tickets.values_list("cargo", "seat")),
+            )
+            self.assertEqual(journey.crews.count(), 2)
+        self.assertFalse(
+            JourneySummary.objects.exclude(
+                tickets_sold=F("journey__tickets_sold")
+            ).exists()
+        )
+        self.assertEqual(JourneySummary.objects.count(), 8)
+        self.assertTrue(Ticket.objects.filter(order__user__email__startswith="a-"))
+
+    def test_deterministic_from_seed(self):
+        generate("a")
+        generate("b")
+        generate("c", seed=8)
+
+        self.assertEqual(
+            unprefixed(journey_rows("a"), "a "), unprefixed(journey_rows("b"), "b ")
+        )
+        self.assertNotEqual(
+            unprefixed(journey_rows("a"), "a "), unprefixed(journey_rows("c"), "c ")
+        )
+
+    def test_existing_prefix_is_rejected(self):
+        generate("a")
+
+        with self.assertRaises(CommandError):
+            generate("a")
+        self.assertEqual(Station.objects.count(), 6)
+
+    def test_existing_users_of_the_prefix_are_rejected(self):
+        get_user_model().objects.create_user("a-user-0000000@example.com")
+
+        with self.assertRaises(CommandError) as error:
+            generate("a")
+
+        self.assertIn("Users prefixed 'a' already exist", str(error.exception))
+        self.assertFalse(Station.objects.exists())
+
+    def test_start_date_is_fixed_by_default(self):
+        generate("a", start_date=None)
+        generate("b", start_date=DEFAULT_START_DATE)
+
+        self.assertEqual(
+            unprefixed(journey_rows("a"), "a "), unprefixed(journey_rows("b"), "b ")
+        )
@@ -0,0 +1,203 @@
+import json
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from train_station.models import Journey, JourneySummary, Route, Station, Train
+from train_station.tests.test_train_station_api import sample_station, sample_train
+from train_station.timetable import timetable
+
+
+FEED = {
+    "agency.txt": "agency_id,agency_name,agency_url,agency_timezone\n"
+    "uz,Ukrzaliznytsia,https://uz.gov.ua,Europe/Kyiv\n",
+    "stops.txt": "stop_id,stop_name,stop_lat,stop_lon,location_type,parent_station\n"
+    "KYIV,Kyiv,50.4401,30.4897,1,\n"
+    "KYIV-1,Kyiv platform 1,50.4402,30.4898,0,KYIV\n"
+    "LVIV,Lviv,49.8397,23.9944,,\n"
+    "ODESA,Odesa,46.4695,30.7409,,\n",
+    "routes.txt": "route_id,route_short_name,route_long_name,route_type\n"
+    "IC,743,Intercity Kyiv - Lviv,2\n"
+    "R,,Regional,106\n",
+    "trips.txt": "route_id,service_id,trip_id\n"
+    "IC,daily,t1\n"
+    "IC,daily,t2\n"
+    "R,daily,t3\n"
+    "R,daily,loop\n",
+    # Deliberately out of order; t2 runs past midnight
+    "stop_times.txt": "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+    "t1,13:10:00,13:10:00,LVIV,2\n"
+    "t1,08:00:00,08:00:00,KYIV-1,1\n"
+    "t2,22:00:00,22:00:00,LVIV,1\n"
+    "t2,25:30:00,25:30:00,KYIV,2\n"
+    "t3,06:00:00,06:00:00,ODESA,1\n"
+    "t3,09:00:00,09:05:00,KYIV,2\n"
+    "t3,14:00:00,14:00:00,LVIV,3\n"
+    "loop,10:00:00,10:00:00,LVIV,1\n"
+    "loop,11:00:00,11:00:00,LVIV,2\n",
+}
+
+
+class ImportGtfsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.feed = Path(directory.name)
+        for name, content in FEED.items():
+            (self.feed / name).write_text(content)
+
+    def import_feed(self, *args):
+        out = StringIO()
+        call_command(
+            "import_gtfs",
+            str(self.feed),
+            "--service-date=2030-06-01",
+            *args,
+            stdout=out
+        )
+        return out.getvalue()
+
+    def test_import(self):
+        output = self.import_feed()
+
+        self.assertIn("rows/s", output)
+        self.assertIn("Skipped 1 trips", output)
+        self.assertEqual(
+            set(Station.objects.values_list("name", flat=True)),
+            {"Kyiv", "Lviv", "Odesa"},
+        )
+        self.assertEqual(
+            set(Train.objects.values_list("name", "train_type__name")),
+            {("Intercity Kyiv - Lviv", "Rail"), ("Regional", "Regional Rail")},
+        )
+
+        night_train = Journey.objects.get(external_id="t2@2030-06-01")
+        self.assertEqual(night_train.route.source.name, "Lviv")
+        self.assertEqual(night_train.route.destination.name, "Kyiv")
+        # Kyiv is UTC+3 in summer
+        self.assertEqual(
+            night_train.departure_time, datetime(2030, 6, 1, 19, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            night_train.arrival_time,
+            datetime(2030, 6, 1, 22, 30, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            Journey.objects.get(external_id="t3@2030-06-01").route.destination.name,
+            "Lviv",
+        )
+        self.assertEqual(Route.objects.get(source__name="Kyiv").distance, 468)
+        self.assertEqual(JourneySummary.objects.count(), 3)
+        self.assertEqual(
+            len(timetable.ensure_fresh().journey_ids(train_id=night_train.train_id)),
+            2,
+        )
+        self.assertFalse((self.feed / ".import_gtfs.json").exists())
+
+    def test_reimport_updates_in_place(self):
+        self.import_feed()
+        (self.feed / "stop_times.txt").write_text(
+            FEED["stop_times.txt"].replace("08:00:00,08:00:00", "08:15:00,08:15:00")
+        )
+
+        self.import_feed()
+
+        self.assertEqual(Journey.objects.count(), 3)
+        self.assertEqual(Route.objects.count(), 3)
+        self.assertEqual(Train.objects.count(), 2)
+        self.assertEqual(
+            JourneySummary.objects.get(
+                journey__external_id="t1@2030-06-01"
+            ).departure_time,
+            datetime(2030, 6, 1, 5, 15, tzinfo=timezone.utc),
+        )
+
+    def test_trips_follow_the_service_calendar(self):
+        (self.feed / "trips.txt").write_text(
+            FEED["trips.txt"].replace("IC,daily,t1", "IC,weekdays,t1")
+        )
+        (self.feed / "calendar.txt").write_text(
+            "service_id,monday,tuesday,wednesday,thursday,friday,saturday,"
+            "sunday,start_date,end_date\n"
+            "weekdays,1,1,1,1,1,0,0,20300101,20301231\n"
+            "daily,1,1,1,1,1,1,1,20300101,20301231\n"
+        )
+
+        # 2030-06-01 is a Saturday
+        output = self.import_feed()
+
+        self.assertIn("Skipped 1 trips not running on 2030-06-01", output)
+        self.assertEqual(
+            set(Journey.objects.values_list("external_id", flat=True)),
+            {"t2@2030-06-01", "t3@2030-06-01"},
+        )
+
+        Journey.objects.all().delete()
+        (self.feed / "calendar_dates.txt").write_text(
+            "service_id,date,exception_type\n"
+            "weekdays,20300601,1\n"
+            "daily,20300601,2\n"
+            "daily,20300602,1\n"
+        )
+
+        self.import_feed()
+
+        self.assertEqual(
+            list(Journey.objects.values_list("external_id", flat=True)),
+            ["t1@2030-06-01"],
+        )
+
+    def test_resume_from_checkpoint(self):
+        (self.feed / ".import_gtfs.json").write_text(
+            json.dumps({"service_date": "2030-06-01", "journeys": 2})
+        )
+
+        output = self.import_feed("--batch-size=1")
+
+        self.assertIn("Resuming after 2 journeys", output)
+        self.assertEqual(
+            list(Journey.objects.values_list("external_id", flat=True)),
+            ["t3@2030-06-01"],
+        )
+
+    def test_stations_and_trains_are_keyed_by_gtfs_ids(self):
+        kyiv = sample_station(name="Kyiv")
+        sample_train(name="Regional")
+        self.import_feed()
+        (self.feed / "stops.txt").write_text(
+            FEED["stops.txt"].replace("ODESA,Odesa,", "ODESA,Odesa-Holovna,")
+        )
+
+        self.import_feed()
+
+        self.assertEqual(Station.objects.get(external_id="KYIV"), kyiv)
+        self.assertEqual(
+            set(Station.objects.values_list("external_id", "name")),
+            {("KYIV", "Kyiv"), ("LVIV", "Lviv"), ("ODESA", "Odesa-Holovna")},
+        )
+        self.assertEqual(Train.objects.filter(name="Regional").count(), 2)
+        self.assertEqual(
+            Journey.objects.get(external_id="t3@2030-06-01").train.external_id, "R"
+        )
+
+    def test_station_name_collisions_abort(self):
+        Station.objects.create(
+            name="Lviv", latitude=49.8, longitude=24.0, external_id="LVIV-OLD"
+        )
+        (self.feed / "stops.txt").write_text(
+            FEED["stops.txt"] + "ODESA-2,Odesa,46.4,30.7,,\n"
+        )
+
+        with self.assertRaises(CommandError) as error:
+            self.import_feed()
+
+        self.assertIn("'Odesa' is used by stops ODESA, ODESA-2", str(error.exception))
+        self.assertIn("'Lviv' of stop LVIV is used by station", str(error.exception))
+        self.assertEqual(Station.objects.count(), 1)
+        self.assertFalse(Journey.objects.exists())
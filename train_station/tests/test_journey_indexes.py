@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase
+
+from train_station.models import Journey, Route
+from train_station.tests.test_train_station_api import sample_station, sample_train
+
+
+class JourneyIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        stations = [sample_station(name=f"Station {number}") for number in range(11)]
+        routes = [
+            Route.objects.create(source=source, destination=destination)
+            for source, destination in zip(stations, stations[1:])
+        ]
+        trains = [sample_train(name=f"Train {number}") for number in range(10)]
+        start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        Journey.objects.bulk_create(
+            Journey(
+                route=routes[number % len(routes)],
+                train=trains[number // 7 % len(trains)],
+                departure_time=start + timedelta(hours=number),
+                arrival_time=start + timedelta(hours=number + 2),
+            )
+            for number in range(2000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.route = routes[3]
+        cls.train = trains[5]
+        cls.day = (start + timedelta(days=30), start + timedelta(days=31))
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+
+        self.assertIn(index_name, plan)
+
+    def test_route_and_date_use_route_index(self):
+        self.assertUsesIndex(
+            Journey.objects.filter(
+                route=self.route,
+                departure_time__gte=self.day[0],
+                departure_time__lt=self.day[1],
+            ),
+            "journey_route_departure_idx",
+        )
+
+    def test_train_and_date_use_train_index(self):
+        self.assertUsesIndex(
+            Journey.objects.filter(
+                train=self.train,
+                departure_time__gte=self.day[0],
+                departure_time__lt=self.day[1],
+            ),
+            "journey_train_departure_idx",
+        )
+
+    def test_date_range_uses_departure_index(self):
+        self.assertUsesIndex(
+            Journey.objects.filter(
+                departure_time__gte=self.day[0], departure_time__lt=self.day[1]
+            ),
+            "journey_departure_id_idx",
+        )
@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Route
+from train_station.tests.test_train_station_api import sample_station, sample_train
+
+
+PLAN_URL = reverse("train_station:plan")
+
+
+def at(hour, minute=0):
+    return datetime(2030, 1, 1, hour, minute, tzinfo=timezone.utc)
+
+
+class JourneyPlanApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.train = sample_train()
+        self.kyiv, self.lviv, self.odesa = (
+            sample_station(name=name) for name in ("Kyiv", "Lviv", "Odesa")
+        )
+        self.first_leg = self.journey(self.kyiv, self.lviv, at(8), at(9))
+        self.journey(self.lviv, self.odesa, at(9, 5), at(10))
+        self.second_leg = self.journey(self.lviv, self.odesa, at(9, 30), at(10, 30))
+        self.direct = self.journey(self.kyiv, self.odesa, at(8, 30), at(11))
+
+    def journey(self, source, destination, departure_time, arrival_time):
+        return Journey.objects.create(
+            route=Route.objects.create(source=source, destination=destination),
+            train=self.train,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+        )
+
+    def test_plan_with_transfer(self):
+        response = self.client.get(
+            PLAN_URL,
+            {
+                "from": self.kyiv.id,
+                "to": self.odesa.id,
+                "depart_after": at(7).isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [[leg["id"] for leg in itinerary["legs"]] for itinerary in response.data],
+            [[self.first_leg.id, self.second_leg.id], [self.direct.id]],
+        )
+        self.assertEqual(response.data[0]["transfers"], 1)
+        self.assertEqual(response.data[0]["legs"][1]["source"], "Lviv")
+
+    def test_plan_without_connections(self):
+        response = self.client.get(
+            PLAN_URL,
+            {
+                "from": self.odesa.id,
+                "to": self.kyiv.id,
+                "depart_after": at(7).isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_same_source_and_destination(self):
+        response = self.client.get(PLAN_URL, {"from": self.kyiv.id, "to": self.kyiv.id})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_itinerary_with_missing_journey_is_dropped(self):
+        params = {
+            "from": self.kyiv.id,
+            "to": self.odesa.id,
+            "depart_after": at(7).isoformat(),
+        }
+        self.client.get(PLAN_URL, params)
+        # Deleted while the index still has it (its update waits for commit)
+        Journey.objects.filter(pk=self.second_leg.pk).delete()
+
+        response = self.client.get(PLAN_URL, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(
+            self.second_leg.id,
+            [leg["id"] for itinerary in response.data for leg in itinerary["legs"]],
+        )
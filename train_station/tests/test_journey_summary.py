@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from train_station.models import JourneySummary, Order, Ticket
+from train_station.serializers import JourneyListSerializer
+from train_station.tests.test_train_station_api import sample_crew, sample_journey
+
+
+JOURNEY_URL = reverse("train_station:journey-list")
+
+
+class JourneySummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.journey = sample_journey()
+        self.journey.refresh_from_db()
+        self.crew = sample_crew(first_name="Ivan", last_name="Franko")
+        self.journey.crews.add(self.crew)
+
+    def summary(self):
+        return JourneySummary.objects.get(journey=self.journey)
+
+    def test_list_matches_journey_serializer(self):
+        response = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(
+            response.data["results"],
+            JourneyListSerializer([self.journey], many=True).data,
+        )
+
+    def test_summary_follows_related_writes(self):
+        self.assertEqual(self.summary().source, self.journey.route.source.name)
+        self.assertEqual(self.summary().capacity, self.journey.train.capacity)
+
+        station = self.journey.route.destination
+        station.name = "Renamed"
+        station.save()
+        self.journey.train.train_type.name = "Express"
+        self.journey.train.train_type.save()
+        self.crew.last_name = "Shevchenko"
+        self.crew.save()
+
+        summary = self.summary()
+        self.assertEqual(summary.destination, "Renamed")
+        self.assertEqual(summary.train_type, "Express")
+        self.assertIn("Ivan Shevchenko", summary.crews)
+
+        self.crew.delete()
+        self.assertEqual(len(self.summary().crews), 2)
+
+        self.journey.crews.clear()
+        self.assertEqual(self.summary().crews, [])
+
+    def test_tickets_sold_follows_tickets(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            order=order, journey=self.journey, cargo=1, seat=1
+        )
+        Ticket.objects.create(order=order, journey=self.journey, cargo=1, seat=2)
+
+        self.assertEqual(self.summary().tickets_sold, 2)
+
+        ticket.delete()
+
+        self.assertEqual(self.summary().tickets_sold, 1)
+
+    def test_deleted_journey_drops_summary(self):
+        self.journey.delete()
+
+        self.assertFalse(JourneySummary.objects.exists())
@@ -0,0 +1,117 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase, TestCase, override_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from train_station.management.commands.load_test import (
+    Command,
+    find_regressions,
+    parse_mix,
+)
+from train_station.models import Journey, Station, Train, TrainType
+from user.models import User
+
+
+def summary(throughput, p99):
+    return {"throughput_rps": throughput, "latency_ms": {"p99": p99}}
+
+
+class LoadTestHelpersTests(SimpleTestCase):
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix("browse=3,order=1"), {"browse": 3.0, "order": 1.0})
+        with self.assertRaises(CommandError):
+            parse_mix("browse=3,refund=1")
+        with self.assertRaises(CommandError):
+            parse_mix("browse=0")
+
+    def test_find_regressions(self):
+        baseline = {
+            "endpoints": {
+                "journey_list": summary(100, 50),
+                "order_create": summary(20, 200),
+            }
+        }
+        results = {
+            "endpoints": {
+                "journey_list": summary(85, 59),
+                "order_create": summary(15, 300),
+                "register": summary(1, 1000),
+            }
+        }
+
+        self.assertEqual(
+            find_regressions(results, baseline, 0.2),
+            [
+                "order_create throughput 20 -> 15 req/s",
+                "order_create p99 200 -> 300 ms",
+            ],
+        )
+
+
+class LoadTestCleanupTests(TestCase):
+    def run_load_test(self):
+        call_command(
+            "load_test",
+            "--users=1",
+            "--duration=0",
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+    def test_partial_fixtures_are_deleted(self):
+        with patch.object(Journey.objects, "create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.run_load_test()
+
+        self.assertFalse(Station.objects.exists())
+        self.assertFalse(Train.objects.exists())
+        self.assertFalse(TrainType.objects.exists())
+
+    def test_rate_limits_are_restored_after_a_failed_run(self):
+        rates = SimpleRateThrottle.THROTTLE_RATES
+
+        def run_users(command, fixtures):
+            self.assertEqual(set(SimpleRateThrottle.THROTTLE_RATES.values()), {None})
+            raise RuntimeError
+
+        with patch.object(Command, "run_users", run_users):
+            with self.assertRaises(RuntimeError):
+                self.run_load_test()
+
+        self.assertIs(SimpleRateThrottle.THROTTLE_RATES, rates)
+        self.assertFalse(Journey.objects.exists())
+
+
+# The live server threads share the SQLite test connection, so each request's
+# query count includes the concurrent ones
+@override_settings(QUERY_BUDGET_STRICT=False)
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_reports_endpoints_and_cleans_up(self):
+        out = StringIO()
+
+        call_command(
+            "load_test",
+            f"--base-url={self.live_server_url}",
+            "--users=2",
+            "--duration=3",
+            "--journeys=2",
+            "--mix=browse=2,detail=1,order=1",
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        results = json.loads(out.getvalue())
+        self.assertEqual(results["endpoints"]["register"]["outcomes"], {"201": 2})
+        self.assertEqual(results["endpoints"]["token"]["outcomes"], {"200": 2})
+        self.assertGreater(results["total"]["requests"], 4)
+        self.assertLessEqual(
+            set(results["endpoints"]),
+            {"register", "token", "journey_list", "journey_detail", "order_create"},
+        )
+        self.assertFalse(Journey.objects.exists())
+        self.assertFalse(Station.objects.exists())
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Order, Ticket
+from train_station.tests.test_train_station_api import sample_journey
+
+
+ORDER_URL = reverse("train_station:order-list")
+
+
+def ticket_payload(journey, count, first_cargo=1):
+    return [
+        {
+            "journey": journey.id,
+            "cargo": first_cargo + number // journey.train.places_in_cargo,
+            "seat": 1 + number % journey.train.places_in_cargo,
+        }
+        for number in range(count)
+    ]
+
+
+class OrderCreateApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def test_create_order(self):
+        payload = {"tickets": ticket_payload(self.journey, 3)}
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tickets"]), 3)
+        self.assertEqual(Ticket.objects.filter(order__user=self.user).count(), 3)
+        self.assertEqual(self.journey.get_seat_map().available_count, 300)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.get_seat_map().available_count, 297)
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        query_counts = []
+        for first_cargo, count in ((1, 1), (2, 10), (3, 100)):
+            payload = {"tickets": ticket_payload(self.journey, count, first_cargo)}
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(ORDER_URL, payload, format="json")
+
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+        self.assertLessEqual(query_counts[0], 15)
+
+    def test_seat_out_of_range(self):
+        payload = {"tickets": [{"journey": self.journey.id, "cargo": 1, "seat": 51}]}
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tickets"][0]["seat"][0],
+            "seat number must be in available range: (1, places_in_cargo): (1, 50)",
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_seat_already_taken(self):
+        payload = {"tickets": ticket_payload(self.journey, 2)}
+        self.client.post(ORDER_URL, payload, format="json")
+
+        payload["tickets"].append(ticket_payload(self.journey, 1, first_cargo=2)[0])
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["taken_seats"],
+            [
+                {"journey": self.journey.id, "cargo": 1, "seat": 1},
+                {"journey": self.journey.id, "cargo": 1, "seat": 2},
+            ],
+        )
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_same_seat_twice_in_one_order(self):
+        payload = {"tickets": ticket_payload(self.journey, 1) * 2}
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
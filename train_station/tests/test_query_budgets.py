@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Order, Route, Ticket
+from train_station.tests.query_budget import QueryBudgetTestMixin
+from train_station.tests.test_train_station_api import (
+    sample_crew,
+    sample_station,
+    sample_train,
+)
+
+
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        stations = [sample_station(name=f"Station {number}") for number in range(4)]
+        departure_time = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        self.journeys = []
+        for number in range(3):
+            journey = Journey.objects.create(
+                route=Route.objects.create(
+                    source=stations[number], destination=stations[number + 1]
+                ),
+                train=sample_train(name=f"Train {number}"),
+                departure_time=departure_time + timedelta(hours=number),
+                arrival_time=departure_time + timedelta(hours=number + 1),
+            )
+            journey.crews.set(
+                [sample_crew(first_name=f"Driver {number}"), sample_crew()]
+            )
+            self.journeys.append(journey)
+
+        for _ in range(3):
+            order = Order.objects.create(user=self.user)
+            for journey in self.journeys:
+                Ticket.objects.create(
+                    order=order,
+                    journey=journey,
+                    cargo=1,
+                    seat=journey.tickets.count() + 1,
+                )
+
+    def test_read_endpoints_within_budget(self):
+        journey = self.journeys[0]
+        for url, params in (
+            (reverse("train_station:station-list"), {}),
+            (
+                reverse("train_station:station-nearby"),
+                {"lat": 0, "lon": 0, "radius_km": 2000},
+            ),
+            (reverse("train_station:route-list"), {}),
+            (reverse("train_station:train-list"), {}),
+            (reverse("train_station:crew-list"), {}),
+            (reverse("train_station:journey-list"), {}),
+            (reverse("train_station:journey-list"), {"route": journey.route_id}),
+            (reverse("train_station:journey-detail", args=[journey.id]), {}),
+            (reverse("train_station:journey-seats", args=[journey.id]), {}),
+            (
+                reverse("train_station:plan"),
+                {
+                    "from": journey.route.source_id,
+                    "to": self.journeys[-1].route.destination_id,
+                    "depart_after": "2030-01-01T00:00Z",
+                },
+            ),
+            (reverse("train_station:order-list"), {}),
+        ):
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertWithinQueryBudget(response)
+
+    def test_order_create_within_budget(self):
+        response = self.client.post(
+            reverse("train_station:order-list"),
+            {
+                "tickets": [
+                    {"journey": self.journeys[0].id, "cargo": 2, "seat": seat}
+                    for seat in range(1, 21)
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertWithinQueryBudget(response)
+
+    @override_settings(QUERY_STATS_HEADERS=True)
+    def test_query_stats_headers(self):
+        response = self.client.get(reverse("train_station:station-list"))
+
+        self.assertEqual(response["X-DB-Queries"], str(response.query_stats["queries"]))
+        self.assertIn("X-DB-Time", response)
+
+    @override_settings(QUERY_STATS_HEADERS=False)
+    def test_no_query_stats_headers_in_production(self):
+        response = self.client.get(reverse("train_station:station-list"))
+
+        self.assertNotIn("X-DB-Queries", response)
+        self.assertNotIn("X-DB-Time", response)
+        self.assertIsNotNone(response.query_stats["budget"])
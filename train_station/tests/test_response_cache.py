@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from train_station.caching import response_cache
+from train_station.tests.test_train_station_api import sample_route, sample_station
+
+
+STATION_URL = reverse("train_station:station-list")
+ROUTE_URL = reverse("train_station:route-list")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.route = sample_route()
+
+    def test_cached_list_skips_database(self):
+        self.assertEqual(self.client.get(STATION_URL)["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(STATION_URL)
+
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(
+            response_cache.stats(["station"]),
+            {"station": {"hits": 1, "misses": 1}},
+        )
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(STATION_URL)
+
+        self.assertEqual(self.client.get(STATION_URL, {"a": 1})["X-Cache"], "MISS")
+
+    def test_write_invalidates_dependent_lists(self):
+        self.client.get(STATION_URL)
+        self.client.get(ROUTE_URL)
+
+        self.route.source.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.route.source.save()
+
+        response = self.client.get(ROUTE_URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data[0]["source"]["name"], "Renamed")
+        self.assertEqual(self.client.get(STATION_URL)["X-Cache"], "MISS")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_station(name="Station3")
+
+        self.assertEqual(len(self.client.get(STATION_URL).data), 3)
+
+    def test_rolled_back_write_keeps_cached_lists(self):
+        self.client.get(STATION_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    sample_station(name="Station3")
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.client.get(STATION_URL)["X-Cache"], "HIT")
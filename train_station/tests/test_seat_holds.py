@@ -0,0 +1,176 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.holds import CacheSeatHoldBackend, LocalSeatHoldBackend
+from train_station.tests.test_train_station_api import sample_journey
+
+
+ORDER_URL = reverse("train_station:order-list")
+
+
+def holds_url(journey_id):
+    return reverse("train_station:journey-holds", args=[journey_id])
+
+
+def release_url(journey_id, hold_id):
+    return reverse("train_station:journey-release-hold", args=[journey_id, hold_id])
+
+
+class LocalSeatHoldBackendTests(SimpleTestCase):
+    def test_conflicting_hold(self):
+        backend = LocalSeatHoldBackend()
+        hold, conflicts = backend.acquire(1, [(1, 1, 1), (1, 1, 2)], user_id=1)
+
+        _, conflicts = backend.acquire(1, [(1, 1, 2), (1, 1, 3)], user_id=2)
+
+        self.assertEqual(conflicts, {(1, 1, 2)})
+        self.assertEqual(backend.holders([(1, 1, 2), (1, 1, 3)]), {(1, 1, 2): 1})
+
+    def test_expired_holds_are_swept(self):
+        backend = LocalSeatHoldBackend(ttl=0)
+        hold, _ = backend.acquire(1, [(1, 1, 1), (1, 1, 2)], user_id=1)
+
+        self.assertEqual(backend.sweep(), 1)
+        self.assertIsNone(backend.get(hold["id"]))
+        self.assertEqual(backend.holders([(1, 1, 1), (1, 1, 2)]), {})
+
+    def test_released_seats_leave_the_hold(self):
+        backend = LocalSeatHoldBackend()
+        hold, _ = backend.acquire(1, [(1, 1, 1), (1, 1, 2)], user_id=1)
+
+        backend.release_seats([(1, 1, 1)], user_id=1)
+        self.assertEqual(backend.get(hold["id"])["seats"], [{"cargo": 1, "seat": 2}])
+
+        backend.release_seats([(1, 1, 2)], user_id=1)
+        self.assertIsNone(backend.get(hold["id"]))
+
+
+class CacheSeatHoldBackendTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.backend = CacheSeatHoldBackend()
+
+    def test_conflict_keeps_earlier_claims(self):
+        first, _ = self.backend.acquire(1, [(1, 1, 1)], user_id=1)
+        self.backend.acquire(1, [(1, 1, 2)], user_id=2)
+
+        hold, conflicts = self.backend.acquire(
+            1, [(1, 1, 1), (1, 1, 2), (1, 1, 3)], user_id=1
+        )
+
+        self.assertIsNone(hold)
+        self.assertEqual(conflicts, {(1, 1, 2)})
+        self.assertEqual(
+            self.backend.holders([(1, 1, 1), (1, 1, 2), (1, 1, 3)]),
+            {(1, 1, 1): 1, (1, 1, 2): 2},
+        )
+        self.assertTrue(self.backend.release(first["id"], user_id=1))
+        self.assertEqual(self.backend.holders([(1, 1, 1)]), {})
+
+    def test_claimed_seat_is_never_overwritten(self):
+        self.backend.acquire(1, [(1, 1, 1)], user_id=2)
+
+        with patch.object(self.backend.cache, "get", return_value=None):
+            _, conflicts = self.backend.acquire(1, [(1, 1, 1)], user_id=1)
+
+        self.assertEqual(conflicts, {(1, 1, 1)})
+        self.assertEqual(self.backend.holders([(1, 1, 1)]), {(1, 1, 1): 2})
+
+    def test_expired_hold_frees_seats_without_a_write(self):
+        hold, _ = self.backend.acquire(1, [(1, 1, 1)], user_id=1)
+        expired = hold["expires_at"] + timedelta(seconds=1)
+
+        with patch("train_station.holds.timezone.now", return_value=expired):
+            self.assertIsNone(self.backend.get(hold["id"]))
+            with patch(
+                "django.core.cache.backends.locmem.time.time",
+                return_value=expired.timestamp(),
+            ):
+                self.assertEqual(self.backend.holders([(1, 1, 1)]), {})
+                _, conflicts = self.backend.acquire(1, [(1, 1, 1)], user_id=2)
+
+        self.assertEqual(conflicts, set())
+        self.assertEqual(self.backend.holders([(1, 1, 1)]), {(1, 1, 1): 2})
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            "other@gmail.com",
+            "userpassword",
+        )
+        self.journey = sample_journey()
+
+    def hold(self, user, seats):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            holds_url(self.journey.id),
+            {"seats": [{"cargo": cargo, "seat": seat} for cargo, seat in seats]},
+            format="json",
+        )
+
+    def order(self, user, seats):
+        self.client.force_authenticate(user)
+        return self.client.post(
+            ORDER_URL,
+            {
+                "tickets": [
+                    {"journey": self.journey.id, "cargo": cargo, "seat": seat}
+                    for cargo, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_held_seats_are_reserved_for_the_holder(self):
+        response = self.hold(self.user, [(1, 1), (1, 2)])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(
+            self.hold(self.other_user, [(1, 2)]).status_code,
+            status.HTTP_409_CONFLICT,
+        )
+        self.assertEqual(
+            self.order(self.other_user, [(1, 1)]).status_code,
+            status.HTTP_409_CONFLICT,
+        )
+        self.assertEqual(
+            self.order(self.user, [(1, 1), (1, 2)]).status_code,
+            status.HTTP_201_CREATED,
+        )
+
+    def test_cannot_hold_booked_seat(self):
+        self.order(self.user, [(1, 1)])
+
+        response = self.hold(self.other_user, [(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_release_hold(self):
+        hold_id = self.hold(self.user, [(1, 1)]).data["id"]
+
+        self.client.force_authenticate(self.other_user)
+        response = self.client.delete(release_url(self.journey.id, hold_id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.delete(release_url(self.journey.id, hold_id))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(
+            self.order(self.other_user, [(1, 1)]).status_code,
+            status.HTTP_201_CREATED,
+        )
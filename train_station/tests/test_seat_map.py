@@ -0,0 +1,121 @@
+import base64
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase, SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Order, Ticket
+from train_station.seat_map import SeatMap
+from train_station.tests.test_train_station_api import sample_journey
+
+
+def seats_url(journey_id):
+    return reverse("train_station:journey-seats", args=[journey_id])
+
+
+class SeatMapTests(SimpleTestCase):
+    def test_take_and_release(self):
+        seat_map = SeatMap(cargo_num=2, places_in_cargo=5)
+
+        seat_map.take(1, 1)
+        seat_map.take(2, 5)
+
+        self.assertEqual(seat_map.byte_size, 2)
+        self.assertTrue(seat_map.is_taken(2, 5))
+        self.assertFalse(seat_map.is_taken(1, 2))
+        self.assertEqual(list(seat_map.taken_seats()), [(1, 1), (2, 5)])
+        self.assertEqual(seat_map.available_count, 8)
+
+        seat_map.release(2, 5)
+        self.assertEqual(list(seat_map.taken_seats()), [(1, 1)])
+
+    def test_seat_outside_of_train(self):
+        seat_map = SeatMap(cargo_num=2, places_in_cargo=5)
+
+        with self.assertRaises(IndexError):
+            seat_map.take(3, 1)
+
+
+class JourneySeatsApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def test_seat_map_follows_booking_and_cancellation(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(journey=self.journey, order=order, cargo=1, seat=2)
+        Ticket.objects.create(journey=self.journey, order=order, cargo=2, seat=1)
+
+        response = self.client.get(seats_url(self.journey.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["seats_available"], 298)
+        seat_map = SeatMap(6, 50, base64.b64decode(response.data["seat_map"]))
+        self.assertEqual(list(seat_map.taken_seats()), [(1, 2), (2, 1)])
+
+        order.delete()
+
+        response = self.client.get(seats_url(self.journey.id))
+        self.assertEqual(response.data["seats_available"], 300)
+
+    def test_moved_ticket_frees_the_old_journey_seat(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            journey=self.journey, order=order, cargo=1, seat=2
+        )
+        other_journey = Journey.objects.create(
+            route=self.journey.route,
+            train=self.journey.train,
+            departure_time=self.journey.departure_time,
+            arrival_time=self.journey.arrival_time,
+        )
+
+        ticket.journey = other_journey
+        ticket.save()
+
+        self.journey.refresh_from_db()
+        other_journey.refresh_from_db()
+        self.assertEqual(list(self.journey.get_seat_map().taken_seats()), [])
+        self.assertEqual(self.journey.tickets_sold, 0)
+        self.assertEqual(list(other_journey.get_seat_map().taken_seats()), [(1, 2)])
+
+    def test_train_layout_is_fixed_once_tickets_are_sold(self):
+        train = self.journey.train
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                "admin@gmail.com", "adminpassword", is_staff=True
+            )
+        )
+        url = reverse("train_station:train-bulk")
+
+        response = self.client.patch(
+            url, [{"id": train.id, "places_in_cargo": 40}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(journey=self.journey, order=order, cargo=1, seat=2)
+
+        response = self.client.patch(
+            url, [{"id": train.id, "cargo_num": 8}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(
+            url,
+            [{"id": train.id, "name": "Renamed", "places_in_cargo": 40}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        train.refresh_from_db()
+        train.cargo_num = 8
+        with self.assertRaises(ValidationError):
+            train.full_clean()
@@ -0,0 +1,89 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.geo import StationGridIndex, haversine_km
+from train_station.models import Station
+from train_station.tests.test_train_station_api import sample_station
+
+
+NEARBY_URL = reverse("train_station:station-nearby")
+
+
+class NearbyStationsApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        sample_station(name="Kyiv", latitude=50.4401, longitude=30.4897)
+        sample_station(name="Bila Tserkva", latitude=49.8067, longitude=30.1056)
+        sample_station(name="Lviv", latitude=49.8397, longitude=23.9944)
+
+    def test_nearby_stations_nearest_first(self):
+        response = self.client.get(
+            NEARBY_URL, {"lat": 50.45, "lon": 30.52, "radius_km": 100}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [station["name"] for station in response.data], ["Kyiv", "Bila Tserkva"]
+        )
+        self.assertLess(response.data[0]["distance_km"], 3)
+
+    def test_new_station_is_found(self):
+        self.client.get(NEARBY_URL, {"lat": 50.45, "lon": 30.52})
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_station(name="Darnytsia", latitude=50.4558, longitude=30.6135)
+
+        response = self.client.get(NEARBY_URL, {"lat": 50.45, "lon": 30.52, "limit": 1})
+
+        self.assertEqual([station["name"] for station in response.data], ["Kyiv"])
+        response = self.client.get(NEARBY_URL, {"lat": 50.45, "lon": 30.62, "limit": 1})
+        self.assertEqual([station["name"] for station in response.data], ["Darnytsia"])
+
+    def test_invalid_coordinates(self):
+        response = self.client.get(NEARBY_URL, {"lat": 91, "lon": 30})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_grid_matches_full_scan(self):
+        rng = random.Random(7)
+        Station.objects.bulk_create(
+            Station(
+                name=f"Stop {number}",
+                latitude=rng.uniform(-89, 89),
+                longitude=rng.uniform(-180, 180),
+            )
+            for number in range(500)
+        )
+        grid = StationGridIndex(cell_size=1).ensure_fresh()
+        stations = list(Station.objects.values_list("id", "latitude", "longitude"))
+
+        for latitude, longitude, radius_km in (
+            (0, 179.9, 800),
+            (85, 10, 1500),
+            (-30, -60, 3000),
+        ):
+            expected = sorted(
+                (haversine_km(latitude, longitude, lat, lon), station_id)
+                for station_id, lat, lon in stations
+                if haversine_km(latitude, longitude, lat, lon) <= radius_km
+            )[:20]
+
+            self.assertEqual(
+                [
+                    point.id
+                    for point, _ in grid.nearby(latitude, longitude, radius_km, 20)
+                ],
+                [station_id for _, station_id in expected],
+            )
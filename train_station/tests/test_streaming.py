@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Route
+from train_station.streaming import stream_json_array
+from train_station.tests.test_train_station_api import sample_station, sample_train
+from train_station.views import JourneyViewSet
+
+
+STATION_URL = reverse("train_station:station-list")
+ROUTE_URL = reverse("train_station:route-list")
+JOURNEY_URL = reverse("train_station:journey-list")
+
+
+def streamed_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+class StreamingListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@gmail.com",
+            "adminpassword",
+            is_staff=True,
+        )
+        self.client.force_authenticate(self.user)
+
+        stations = [sample_station(name=f"Станція {number}") for number in range(6)]
+        departure_time = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        train = sample_train()
+        for number in range(5):
+            route = Route.objects.create(
+                source=stations[number], destination=stations[number + 1]
+            )
+            for hour in range(5):
+                Journey.objects.create(
+                    route=route,
+                    train=train,
+                    departure_time=departure_time + timedelta(hours=hour),
+                    arrival_time=departure_time + timedelta(hours=hour + 2),
+                )
+
+    def test_stream_matches_regular_list(self):
+        for url, results in (
+            (STATION_URL, lambda data: data),
+            (ROUTE_URL, lambda data: data),
+            (JOURNEY_URL, lambda data: data["results"]),
+        ):
+            with self.subTest(url=url):
+                expected = results(self.client.get(url, {"page_size": 100}).json())
+                response = self.client.get(url, {"stream": "true"})
+
+                self.assertTrue(response.streaming)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertEqual(streamed_json(response), expected)
+
+    @override_settings(FAST_LIST_SERIALIZATION=True)
+    def test_stream_with_fast_serialization(self):
+        expected = self.client.get(JOURNEY_URL, {"page_size": 100}).json()
+        response = self.client.get(
+            JOURNEY_URL, {"stream": "1", "route": Route.objects.first().id}
+        )
+
+        self.assertEqual(
+            streamed_json(response),
+            [
+                journey
+                for journey in expected["results"]
+                if journey["route"] == Route.objects.first().id
+            ],
+        )
+
+    def test_first_chunk_is_sent_before_rows_are_fetched(self):
+        JourneyViewSet.stream_chunk_size = 10
+        self.addCleanup(setattr, JourneyViewSet, "stream_chunk_size", 1000)
+        response = self.client.get(JOURNEY_URL, {"stream": "true"})
+        content = iter(response.streaming_content)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(next(content), b"[")
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(len(json.loads(b"[" + b"".join(content))), 25)
+
+    def test_stream_requires_staff(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("user@gmail.com", "userpassword")
+        )
+
+        response = self.client.get(JOURNEY_URL, {"stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(JOURNEY_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stream_json_array(self):
+        self.assertEqual(
+            "".join(stream_json_array([[1, {"a": "ї"}], [], [None]])),
+            '[1,{"a":"ї"},null]',
+        )
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from train_station.tests.test_train_station_api import sample_journey
+from train_station.throttling import (
+    CacheRateLimitBackend,
+    ScopedSlidingWindowThrottle,
+    UserSlidingWindowThrottle,
+)
+
+
+LOCAL_RATE_LIMITS = {"BACKEND": "train_station.throttling.LocalRateLimitBackend"}
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@override_settings(RATE_LIMITS=LOCAL_RATE_LIMITS)
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.request = Request(RequestFactory().get("/"))
+        self.request.user = self.user
+        self.clock = Clock(6000)
+
+    def throttle(self):
+        throttle = UserSlidingWindowThrottle()
+        throttle.num_requests, throttle.duration = 10, 60
+        throttle.timer = self.clock
+        return throttle
+
+    def hit(self, count):
+        return [self.throttle().allow_request(self.request, None) for _ in range(count)]
+
+    def test_window_limit(self):
+        self.assertEqual(self.hit(11), [True] * 10 + [False])
+
+        throttle = self.throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(throttle.wait(), 60 * (1 + 0.25))
+
+    def test_previous_window_slides_out(self):
+        self.hit(10)
+
+        # A quarter into the next window 3/4 of the previous one still count
+        self.clock.now += 75
+        self.assertEqual(self.hit(3), [True, True, False])
+
+        throttle = self.throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertAlmostEqual(throttle.wait(), 60 * (0.5 - 0.25))
+
+        self.clock.now += 60
+        self.assertEqual(self.hit(8), [True] * 7 + [False])
+
+    def test_cache_backend_shares_counters(self):
+        cache.clear()
+        workers = [CacheRateLimitBackend(), CacheRateLimitBackend()]
+
+        counts = [workers[number % 2].hit("key", 100, 60) for number in range(4)]
+        next_window = workers[0].hit("key", 101, 60)
+
+        self.assertEqual(counts, [(1, 0), (2, 0), (3, 0), (4, 0)])
+        self.assertEqual(next_window, (1, 4))
+
+
+@override_settings(RATE_LIMITS=LOCAL_RATE_LIMITS)
+@patch.object(
+    ScopedSlidingWindowThrottle,
+    "THROTTLE_RATES",
+    {"booking": "2/min", "user": "50/min"},
+)
+class BookingThrottleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def test_booking_has_its_own_budget(self):
+        holds_url = reverse("train_station:journey-holds", args=[self.journey.id])
+        statuses = [
+            self.client.post(
+                holds_url, {"seats": [{"cargo": 1, "seat": seat}]}, format="json"
+            ).status_code
+            for seat in (1, 2)
+        ]
+        response = self.client.post(
+            reverse("train_station:order-list"),
+            {"tickets": [{"journey": self.journey.id, "cargo": 1, "seat": 3}]},
+            format="json",
+        )
+
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * 2)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(
+            self.client.get(reverse("train_station:journey-list")).status_code,
+            status.HTTP_200_OK,
+        )
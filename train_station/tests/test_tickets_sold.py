@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, JourneySummary, Order, Ticket
+from train_station.tests.test_train_station_api import detail_url, sample_journey
+
+
+JOURNEY_URL = reverse("train_station:journey-list")
+ORDER_URL = reverse("train_station:order-list")
+
+
+class TicketsSoldTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+        self.capacity = self.journey.train.capacity
+
+    def book(self, *seats):
+        response = self.client.post(
+            ORDER_URL,
+            {
+                "tickets": [
+                    {"journey": self.journey.id, "cargo": 1, "seat": seat}
+                    for seat in seats
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_seats_available_follows_orders(self):
+        self.book(1, 2, 3)
+        Ticket.objects.filter(seat=2).delete()
+
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 2)
+        self.assertEqual(
+            self.client.get(JOURNEY_URL).data["results"][0]["seats_available"],
+            self.capacity - 2,
+        )
+        self.assertEqual(
+            self.client.get(detail_url(self.journey.id)).data["seats_available"],
+            self.capacity - 2,
+        )
+
+    def test_reconcile_repairs_drifted_counters(self):
+        self.book(1, 2)
+        Journey.objects.update(tickets_sold=7)
+        JourneySummary.objects.update(tickets_sold=0)
+
+        out = StringIO()
+        call_command("reconcile_tickets_sold", "--dry-run", stdout=out)
+        self.assertIn("1 journeys drifted", out.getvalue())
+        self.assertEqual(Journey.objects.get().tickets_sold, 7)
+
+        call_command("reconcile_tickets_sold", stdout=StringIO())
+
+        self.assertEqual(Journey.objects.get().tickets_sold, 2)
+        self.assertEqual(JourneySummary.objects.get().tickets_sold, 2)
+        out = StringIO()
+        call_command("reconcile_tickets_sold", stdout=out)
+        self.assertIn("0 journeys repaired", out.getvalue())
+
+    def test_cancelled_order_releases_seats(self):
+        self.book(4)
+        Order.objects.get().delete()
+
+        self.assertEqual(Journey.objects.get().tickets_sold, 0)
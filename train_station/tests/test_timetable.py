@@ -0,0 +1,119 @@
+from datetime import date, datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from train_station.models import Journey, Route
+from train_station.timetable import TimetableIndex, timetable
+from train_station.tests.test_train_station_api import sample_station, sample_train
+
+
+JOURNEY_URL = reverse("train_station:journey-list")
+
+
+class TimetableIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+        kyiv = sample_station(name="Kyiv")
+        lviv = sample_station(name="Lviv")
+        self.route = Route.objects.create(source=kyiv, destination=lviv)
+        self.back_route = Route.objects.create(source=lviv, destination=kyiv)
+        self.train = sample_train(name="Intercity")
+        self.other_train = sample_train(name="Regional")
+        self.journeys = [
+            self.journey(self.route, self.train, datetime(2030, 1, 1, 8)),
+            self.journey(self.route, self.other_train, datetime(2030, 1, 1, 23)),
+            self.journey(self.back_route, self.train, datetime(2030, 1, 2, 6)),
+        ]
+
+    @staticmethod
+    def journey(route, train, departure_time):
+        departure_time = departure_time.replace(tzinfo=timezone.utc)
+        return Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=departure_time,
+            arrival_time=departure_time + timedelta(hours=1),
+        )
+
+    def list_ids(self, **params):
+        response = self.client.get(JOURNEY_URL, params)
+        return [journey["id"] for journey in response.data["results"]]
+
+    def test_filters_match_database(self):
+        for params in (
+            {"route": self.route.id},
+            {"train": self.train.id},
+            {"route": self.route.id, "train": self.train.id},
+            {"departure_date": "2030-01-01"},
+            {"departure_date": "2030-01-02", "train": self.train.id},
+        ):
+            with override_settings(JOURNEY_TIMETABLE_INDEX=False):
+                expected = self.list_ids(**params)
+
+            self.assertEqual(self.list_ids(**params), expected, params)
+
+    def test_index_follows_saves_and_deletes(self):
+        index = timetable.ensure_fresh()
+        self.assertEqual(
+            index.journey_ids(route_id=self.route.id),
+            [self.journeys[1].id, self.journeys[0].id],
+        )
+
+        moved = self.journeys[0]
+        moved.route = self.back_route
+        with self.captureOnCommitCallbacks(execute=True):
+            moved.save()
+            self.journeys[1].delete()
+
+        self.assertEqual(index.journey_ids(route_id=self.route.id), [])
+        self.assertEqual(
+            index.journey_ids(route_id=self.back_route.id),
+            [self.journeys[2].id, moved.id],
+        )
+
+    def test_stale_index_reloads(self):
+        other_process = TimetableIndex().ensure_fresh()
+        with self.captureOnCommitCallbacks(execute=True):
+            journey = self.journey(self.back_route, self.train, datetime(2030, 1, 3, 6))
+
+        self.assertEqual(
+            other_process.ensure_fresh().journey_ids(departure_date=date(2030, 1, 3)),
+            [journey.id],
+        )
+
+    def test_rolled_back_save_is_not_indexed(self):
+        index = timetable.ensure_fresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.journey(self.back_route, self.train, datetime(2030, 1, 3, 6))
+                transaction.set_rollback(True)
+
+        self.assertEqual(index.journey_ids(departure_date=date(2030, 1, 3)), [])
+
+    def test_large_matches_use_the_database(self):
+        with override_settings(JOURNEY_TIMETABLE_MAX_IDS=1):
+            self.assertEqual(
+                self.list_ids(route=self.route.id),
+                [self.journeys[1].id, self.journeys[0].id],
+            )
+
+    def test_invalid_filters(self):
+        for params in ({"route": "kyiv"}, {"departure_date": "01.01.2030"}):
+            response = self.client.get(JOURNEY_URL, params)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.data)
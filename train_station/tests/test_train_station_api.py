@@ -124,7 +124,7 @@ class AuthenticatedJourneyAPITests(TestCase):
         serializer = JourneyListSerializer(journeys, many=True)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_journey_detail(self):
         journey = sample_journey()
@@ -192,3 +192,83 @@ class AdminAPITests(TestCase):
 
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class JourneyPaginationTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_pagination(self):
+        journey = sample_journey(departure_time="2023-11-11 10:00Z")
+        for hour in (8, 10, 12):
+            Journey.objects.create(
+                route=journey.route,
+                train=journey.train,
+                departure_time=f"2023-11-11 {hour}:00Z",
+                arrival_time="2023-11-12",
+            )
+        expected = list(
+            Journey.objects.order_by("-departure_time", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+        first_page = self.client.get(JOURNEY_URL, {"page_size": 2}).data
+        Journey.objects.create(
+            route=journey.route,
+            train=journey.train,
+            departure_time="2023-11-12 10:00Z",
+            arrival_time="2023-11-13",
+        )
+        second_page = self.client.get(first_page["next"]).data
+
+        self.assertEqual(
+            [item["id"] for item in first_page["results"] + second_page["results"]],
+            expected,
+        )
+        self.assertIsNone(second_page["next"])
+
+    def test_cursor_splits_equal_departure_times_by_id(self):
+        journey = sample_journey(departure_time="2023-11-11 10:00Z")
+        for _ in range(4):
+            Journey.objects.create(
+                route=journey.route,
+                train=journey.train,
+                departure_time="2023-11-11 10:00Z",
+                arrival_time="2023-11-12",
+            )
+        expected = list(Journey.objects.order_by("-id").values_list("id", flat=True))
+
+        first_page = self.client.get(JOURNEY_URL, {"page_size": 2}).data
+        Journey.objects.create(
+            route=journey.route,
+            train=journey.train,
+            departure_time="2023-11-11 10:00Z",
+            arrival_time="2023-11-12",
+        )
+        pages = [first_page]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+
+        self.assertEqual(
+            [item["id"] for page in pages for item in page["results"]], expected
+        )
+        previous_page = self.client.get(pages[1]["previous"]).data
+        self.assertEqual(previous_page["results"], first_page["results"])
+        # The journey inserted meanwhile sorts before the first page
+        newest_page = self.client.get(previous_page["previous"]).data
+        self.assertEqual(
+            [item["id"] for item in newest_page["results"]],
+            [Journey.objects.latest("id").id],
+        )
+        self.assertIsNone(newest_page["previous"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(JOURNEY_URL, {"cursor": "bm90LWEtY3Vyc29y"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
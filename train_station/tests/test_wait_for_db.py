@@ -0,0 +1,32 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.utils import OperationalError
+from django.test import TestCase
+
+
+@patch("train_station.management.commands.wait_for_db.time.sleep")
+class WaitForDbTests(TestCase):
+    def test_waits_until_database_is_available(self, sleep):
+        out = StringIO()
+        with patch.object(
+            connection,
+            "ensure_connection",
+            side_effect=[OperationalError, OperationalError, None],
+        ):
+            call_command("wait_for_db", stdout=out)
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertIn("Database available!", out.getvalue())
+
+    def test_gives_up_after_timeout(self, sleep):
+        with patch.object(
+            connection, "ensure_connection", side_effect=OperationalError
+        ):
+            with self.assertRaises(CommandError):
+                call_command("wait_for_db", "--timeout=0", stdout=StringIO())
+
+        sleep.assert_not_called()
@@ -0,0 +1,155 @@
+import functools
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class BaseRateLimitBackend:
+    """
+    Request counters per throttle key and fixed window, shared by every
+    process that uses the same backend.
+    """
+
+    def __init__(self, **options):
+        pass
+
+    def hit(self, key, window, duration):
+        """
+        Atomically counts one request in ``window`` and returns the counts
+        of that window and of the one before it.
+        """
+        raise NotImplementedError
+
+
+class LocalRateLimitBackend(BaseRateLimitBackend):
+    """Process-local stand-in for tests and single-process development"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def hit(self, key, window, duration):
+        with self._lock:
+            counter_window, count, previous = self._counters.get(key, (window, 0, 0))
+            if counter_window != window:
+                previous = count if counter_window == window - 1 else 0
+                count = 0
+            count += 1
+            self._counters[key] = (window, count, previous)
+            return count, previous
+
+
+class CacheRateLimitBackend(BaseRateLimitBackend):
+    """
+    One counter per key and window in a Django cache, bumped with the
+    atomic ``incr`` (INCR on Redis). Counters expire after two windows.
+    """
+
+    def __init__(self, cache="default", key_prefix="rate-limit", **options):
+        super().__init__(**options)
+        self.cache_alias = cache
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def hit(self, key, window, duration):
+        current_key = f"{self.key_prefix}:{key}:{window}"
+        self.cache.add(current_key, 0, timeout=duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add and incr
+            self.cache.set(current_key, 1, timeout=duration * 2)
+            current = 1
+        previous = self.cache.get(f"{self.key_prefix}:{key}:{window - 1}", 0)
+        return current, previous
+
+
+@functools.lru_cache(maxsize=None)
+def get_rate_limit_backend() -> BaseRateLimitBackend:
+    options = dict(settings.RATE_LIMITS)
+    backend_class = import_string(options.pop("BACKEND"))
+    return backend_class(**{key.lower(): value for key, value in options.items()})
+
+
+@receiver(setting_changed)
+def reset_rate_limit_backend(setting, **kwargs):
+    if setting == "RATE_LIMITS":
+        get_rate_limit_backend.cache_clear()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter. Requests are counted in fixed windows of the
+    rate's duration and the last ``duration`` seconds are estimated as the
+    current window plus the previous one weighted by how much of it is
+    still inside the sliding window. Every check is one atomic increment
+    in the shared backend, rejected requests count as well.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now / self.duration - window
+        self.current, self.previous = get_rate_limit_backend().hit(
+            self.key, window, self.duration
+        )
+
+        return self.previous * (1 - self.elapsed) + self.current <= self.num_requests
+
+    def wait(self):
+        # Time until the next request, which counts as well, would pass
+        if self.current < self.num_requests and self.previous:
+            slid_out = 1 - (self.num_requests - self.current - 1) / self.previous
+            return max(slid_out - self.elapsed, 0) * self.duration
+
+        slid_out = max(1 - (self.num_requests - 1) / self.current, 0)
+        return (1 - self.elapsed + slid_out) * self.duration
+
+
+class AnonSlidingWindowThrottle(AnonRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(UserRateThrottle, SlidingWindowRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    """
+    Budget per endpoint. ``throttle_scope`` is either one scope for the
+    whole view or a dict of scopes per viewset action, like
+    ``query_budget``. Views without a scope are not limited by it.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if isinstance(scope, dict):
+            scope = scope.get(getattr(view, "action", None))
+        if not scope:
+            return True
+
+        self.scope = scope
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return SlidingWindowRateThrottle.allow_request(self, request, view)
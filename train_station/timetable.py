@@ -0,0 +1,156 @@
+import bisect
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from train_station.indexes import ProcessLocalIndex
+from train_station.models import Journey
+from train_station.planner import Connection
+
+
+TimetableEntry = namedtuple(
+    "TimetableEntry",
+    (
+        "id",
+        "route_id",
+        "train_id",
+        "source_id",
+        "destination_id",
+        "departure_time",
+        "arrival_time",
+    ),
+)
+
+
+class TimetableIndex(ProcessLocalIndex):
+    """
+    All journeys, departures sorted globally and per source station,
+    route and train. Journey writes are applied incrementally.
+    """
+
+    version_key = "timetable-index:version"
+    entry_fields = (
+        "id",
+        "route_id",
+        "train_id",
+        "route__source_id",
+        "route__destination_id",
+        "departure_time",
+        "arrival_time",
+    )
+
+    def __init__(self):
+        super().__init__()
+        self._entries = {}
+        self._departures = []
+        self._by_source = defaultdict(list)
+        self._by_route = defaultdict(list)
+        self._by_train = defaultdict(list)
+
+    def journey_saved(self, journey_id):
+        row = (
+            Journey.objects.filter(pk=journey_id)
+            .values_list(*self.entry_fields)
+            .first()
+        )
+        if row is None:
+            self.journey_deleted(journey_id)
+        else:
+            self.apply(self._add, TimetableEntry(*row))
+
+    def journey_deleted(self, journey_id):
+        self.apply(self._remove, journey_id)
+
+    def journey_ids(self, route_id=None, train_id=None, departure_date=None):
+        """Ids of matching journeys, latest departure first"""
+        with self._lock:
+            if route_id is not None:
+                departures = self._by_route.get(route_id, [])
+            elif train_id is not None:
+                departures = self._by_train.get(train_id, [])
+            else:
+                departures = self._departures
+
+            if departure_date is not None:
+                start = timezone.make_aware(datetime.combine(departure_date, time.min))
+                departures = self._between(departures, start, start + timedelta(days=1))
+
+            return [
+                journey_id
+                for _, journey_id in reversed(departures)
+                if train_id is None or self._entries[journey_id].train_id == train_id
+            ]
+
+    def connections(self, start, end):
+        with self._lock:
+            return [
+                Connection(
+                    entry.departure_time,
+                    entry.arrival_time,
+                    entry.source_id,
+                    entry.destination_id,
+                    entry.id,
+                )
+                for entry in (
+                    self._entries[journey_id]
+                    for _, journey_id in self._between(self._departures, start, end)
+                )
+            ]
+
+    @staticmethod
+    def _between(departures, start, end):
+        first = bisect.bisect_left(departures, (start,))
+        last = bisect.bisect_left(departures, (end,))
+        return departures[first:last]
+
+    def load(self):
+        self._entries = {}
+        self._departures = []
+        self._by_source = defaultdict(list)
+        self._by_route = defaultdict(list)
+        self._by_train = defaultdict(list)
+
+        for row in Journey.objects.order_by().values_list(*self.entry_fields):
+            entry = TimetableEntry(*row)
+            self._entries[entry.id] = entry
+            for departures in self._departures_of(entry):
+                departures.append((entry.departure_time, entry.id))
+
+        for departures in (
+            self._departures,
+            *self._by_source.values(),
+            *self._by_route.values(),
+            *self._by_train.values(),
+        ):
+            departures.sort()
+
+    def _departures_of(self, entry):
+        return (
+            self._departures,
+            self._by_source[entry.source_id],
+            self._by_route[entry.route_id],
+            self._by_train[entry.train_id],
+        )
+
+    def _add(self, entry):
+        self._remove(entry.id)
+        self._entries[entry.id] = entry
+        for departures in self._departures_of(entry):
+            bisect.insort(departures, (entry.departure_time, entry.id))
+
+    def _remove(self, journey_id):
+        entry = self._entries.pop(journey_id, None)
+        if entry is None:
+            return
+        for departures in self._departures_of(entry):
+            position = bisect.bisect_left(departures, (entry.departure_time, entry.id))
+            if position < len(departures) and departures[position][1] == entry.id:
+                del departures[position]
+
+
+timetable = TimetableIndex()
+
+
+def get_timetable() -> TimetableIndex:
+    return timetable.ensure_fresh()
@@ -1,13 +1,25 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from train_station.async_views import (
+    AsyncStationListView,
+    AsyncRouteListView,
+    AsyncTrainListView,
+    AsyncJourneyListView,
+    AsyncJourneyDetailView,
+    AsyncJourneySeatsView,
+    AsyncJourneyPlanView,
+)
 from train_station.views import (
     StationViewSet,
     RouteViewSet,
     TrainViewSet,
     CrewViewSet,
     JourneyViewSet,
+    JourneyPlanView,
     OrderViewSet,
+    TicketExportView,
+    OrderExportView,
 )
 
 router = routers.DefaultRouter()
@@ -18,6 +30,34 @@ router.register("crews", CrewViewSet)
 router.register("journeys", JourneyViewSet)
 router.register("orders", OrderViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("plan/", JourneyPlanView.as_view(), name="plan"),
+    path("exports/tickets/", TicketExportView.as_view(), name="ticket-export"),
+    path("exports/orders/", OrderExportView.as_view(), name="order-export"),
+    path(
+        "async/stations/",
+        AsyncStationListView.as_view(),
+        name="async-station-list",
+    ),
+    path("async/routes/", AsyncRouteListView.as_view(), name="async-route-list"),
+    path("async/trains/", AsyncTrainListView.as_view(), name="async-train-list"),
+    path(
+        "async/journeys/",
+        AsyncJourneyListView.as_view(),
+        name="async-journey-list",
+    ),
+    path(
+        "async/journeys/<int:pk>/",
+        AsyncJourneyDetailView.as_view(),
+        name="async-journey-detail",
+    ),
+    path(
+        "async/journeys/<int:pk>/seats/",
+        AsyncJourneySeatsView.as_view(),
+        name="async-journey-seats",
+    ),
+    path("async/plan/", AsyncJourneyPlanView.as_view(), name="async-plan"),
+]
 
 app_name = "train_station"
@@ -1,50 +1,235 @@
-from datetime import datetime
-from django.db.models import F, Count
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count, Prefetch
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets, mixins
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import generics, viewsets, mixins, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from train_station.bulk import BulkMixin
+from train_station.caching import (
+    CachedListMixin,
+    conditional_response,
+    make_etag,
+    response_cache,
+    set_validators,
+)
+from train_station.exports import export_response
+from train_station.fast_serializers import (
+    JourneySummaryValuesSerializer,
+    OrderValuesSerializer,
+    ValuesListMixin,
+)
+from train_station.geo import get_station_grid
+from train_station.holds import get_seat_hold_backend
 from train_station.models import (
     Train,
     Journey,
+    JourneySummary,
     Station,
     Route,
     Crew,
     Order,
+    Ticket,
 )
+from train_station.pagination import KeysetCursorPagination
 from train_station.permissions import IsAdminOrIfAuthenticatedReadOnly
+from train_station.planner import Connection, plan_itineraries
+from train_station.streaming import StreamingListMixin
+from train_station.timetable import get_timetable
 from train_station.serializers import (
     StationSerializer,
+    NearbyStationQuerySerializer,
+    NearbyStationSerializer,
     RouteSerializer,
+    RouteWriteSerializer,
     TrainSerializer,
     CrewSerializer,
+    ExportQuerySerializer,
+    JourneyFilterSerializer,
     JourneySerializer,
-    JourneyListSerializer,
+    JourneySummarySerializer,
     JourneyDetailSerializer,
+    JourneySeatMapSerializer,
+    JourneyPlanQuerySerializer,
+    ItinerarySerializer,
+    SeatHoldSerializer,
     OrderSerializer,
     OrderListSerializer,
 )
 
 
-class StationViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+JOURNEY_FILTERS = ("route", "train", "departure_date")
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_journeys(queryset, params, use_timetable=False):
+    """Applies the train, route and departure_date filters of the journey list"""
+    query = JourneyFilterSerializer(
+        data={name: params[name] for name in JOURNEY_FILTERS if params.get(name)}
+    )
+    query.is_valid(raise_exception=True)
+    departure_date = query.validated_data.get("departure_date")
+    train_id = query.validated_data.get("train")
+    route_id = query.validated_data.get("route")
+
+    if use_timetable and settings.JOURNEY_TIMETABLE_INDEX and query.validated_data:
+        journey_ids = get_timetable().journey_ids(
+            route_id=route_id, train_id=train_id, departure_date=departure_date
+        )
+        # Larger matches are left to the (route|train, departure) indexes
+        if len(journey_ids) <= settings.JOURNEY_TIMETABLE_MAX_IDS:
+            return queryset.filter(pk__in=journey_ids)
+
+    if departure_date:
+        queryset = queryset.filter(
+            departure_time__gte=start_of_day(departure_date),
+            departure_time__lt=start_of_day(departure_date + timedelta(days=1)),
+        )
+    if train_id:
+        queryset = queryset.filter(train_id=train_id)
+    if route_id:
+        queryset = queryset.filter(route_id=route_id)
+
+    return queryset
+
+
+def journey_list_etag(params):
+    """
+    Validator of the journey list, no query: the Journey version counter is
+    bumped on commit by every write changing a journey or its list row
+    """
+    return make_etag(sorted(params.lists()), response_cache.versions([Journey]))
+
+
+def journey_connections(depart_after):
+    """Planner connections departing within PLANNER_SEARCH_WINDOW"""
+    return (
+        Journey.objects.filter(
+            departure_time__gte=depart_after,
+            departure_time__lt=depart_after + settings.PLANNER_SEARCH_WINDOW,
+        )
+        .order_by("departure_time")
+        .values_list(
+            "departure_time",
+            "arrival_time",
+            "route__source_id",
+            "route__destination_id",
+            "id",
+        )
+    )
+
+
+def itinerary_data(itineraries, journeys):
+    """Itineraries with a leg deleted since the search are dropped"""
+    return [
+        {
+            "departure_time": legs[0].departure_time,
+            "arrival_time": legs[-1].arrival_time,
+            "transfers": len(legs) - 1,
+            "legs": [journeys[leg.journey_id] for leg in legs],
+        }
+        for legs in itineraries
+        if all(leg.journey_id in journeys for leg in legs)
+    ]
+
+
+class StationViewSet(
+    BulkMixin,
+    StreamingListMixin,
+    CachedListMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Station,)
+    query_budget = {"list": 2, "nearby": 2, "create": 4, "bulk": 10}
+
+    def get_serializer_class(self):
+        if self.action == "nearby":
+            return NearbyStationSerializer
+
+        return StationSerializer
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "lat", type=OpenApiTypes.FLOAT, required=True, description="Latitude"
+            ),
+            OpenApiParameter(
+                "lon", type=OpenApiTypes.FLOAT, required=True, description="Longitude"
+            ),
+            OpenApiParameter(
+                "radius_km",
+                type=OpenApiTypes.FLOAT,
+                description="Search radius in kilometers, 50 by default",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of stations (1-100), 10 by default",
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="nearby")
+    def nearby(self, request):
+        """Stations within radius_km of a point, nearest first"""
+        query = NearbyStationQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        stations = get_station_grid().nearby(
+            query.validated_data["lat"],
+            query.validated_data["lon"],
+            query.validated_data["radius_km"],
+            query.validated_data["limit"],
+        )
+        serializer = self.get_serializer(
+            [
+                {**station._asdict(), "distance_km": round(distance, 3)}
+                for station, distance in stations
+            ],
+            many=True,
+        )
+
+        return Response(serializer.data)
 
 
 class RouteViewSet(
+    BulkMixin,
+    StreamingListMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
-    queryset = Route.objects.all()
+    queryset = Route.objects.select_related("source", "destination")
     serializer_class = RouteSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Route, Station)
+    query_budget = {"list": 2, "create": 5, "bulk": 10}
+
+    def get_serializer_class(self):
+        if self.action in ("create", "bulk"):
+            return RouteWriteSerializer
+
+        return RouteSerializer
 
 
 class TrainViewSet(
+    BulkMixin,
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet,
@@ -52,54 +237,129 @@ class TrainViewSet(
     queryset = Train.objects.select_related("train_type")
     serializer_class = TrainSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Train,)
+    query_budget = {"list": 2, "create": 3, "bulk": 10}
 
 
-class CrewViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class CrewViewSet(
+    BulkMixin,
+    CachedListMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Crew,)
+    query_budget = {"list": 2, "create": 2, "bulk": 10}
+
 
+class JourneyPagination(KeysetCursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering_field = "departure_time"
 
-class JourneyViewSet(viewsets.ModelViewSet):
+
+class JourneyViewSet(
+    StreamingListMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = (
         Journey.objects.all()
-        .select_related("route", "train")
+        .select_related("route", "train__train_type")
         .prefetch_related("crews")
-        .annotate(
-            taken_seats=(
-                F("train__cargo_num") * F("train__places_in_cargo") - Count("tickets")
-            )
-        )
     )
     serializer_class = JourneySerializer
+    values_serializer_class = JourneySummaryValuesSerializer
+    pagination_class = JourneyPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    query_budget = {"list": 3, "retrieve": 5, "seats": 2, "holds": 3}
+    throttle_scope = {"holds": "booking"}
 
     def get_queryset(self):
-        departure_date = self.request.query_params.get("departure_date")
-        train_type_id = self.request.query_params.get("train")
-        route_id = self.request.query_params.get("route")
+        if self.action in ("seats", "holds"):
+            return Journey.objects.select_related("train")
+
+        if self.action == "retrieve":
+            return self.queryset.select_related(
+                "route__source", "route__destination"
+            ).prefetch_related("tickets")
 
-        queryset = self.queryset
+        if self.action == "list":
+            return self.filter_journeys(JourneySummary.objects.all())
 
-        if departure_date:
-            departure_date = datetime.strptime(departure_date, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__date=departure_date)
-        if train_type_id:
-            queryset = queryset.filter(train_id=train_type_id)
-        if route_id:
-            queryset = queryset.filter(route_id=route_id)
+        return self.filter_journeys(self.queryset)
 
-        return queryset
+    def filter_journeys(self, queryset):
+        return filter_journeys(
+            queryset,
+            self.request.query_params,
+            use_timetable=self.action == "list",
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
-            return JourneyListSerializer
+            return JourneySummarySerializer
 
         if self.action == "retrieve":
             return JourneyDetailSerializer
 
+        if self.action == "seats":
+            return JourneySeatMapSerializer
+
+        if self.action == "holds":
+            return SeatHoldSerializer
+
         return JourneySerializer
 
+    @action(methods=["GET"], detail=True, url_path="seats")
+    def seats(self, request, pk=None):
+        """Seat availability as a base64 bitmap, one bit per (cargo, seat)"""
+        journey = self.get_object()
+        serializer = self.get_serializer(journey)
+
+        return Response(serializer.data)
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="holds",
+        permission_classes=(IsAuthenticated,),
+    )
+    def holds(self, request, pk=None):
+        """Reserve seats for a short time before the order is created"""
+        journey = self.get_object()
+        serializer = self.get_serializer(
+            data=request.data,
+            context={**self.get_serializer_context(), "journey": journey},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(
+        methods=["DELETE"],
+        detail=True,
+        url_path=r"holds/(?P<hold_id>[0-9a-f]+)",
+        permission_classes=(IsAuthenticated,),
+    )
+    def release_hold(self, request, pk=None, hold_id=None):
+        hold_backend = get_seat_hold_backend()
+        hold = hold_backend.get(hold_id)
+        if (
+            hold is None
+            or str(hold["journey"]) != pk
+            or hold["user"] != request.user.id
+        ):
+            raise NotFound("Hold not found.")
+        hold_backend.release(hold_id, request.user.id)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -116,14 +376,115 @@ class JourneyViewSet(viewsets.ModelViewSet):
                 "departure_date",
                 type=OpenApiTypes.DATE,
                 description=(
-                        "Filter by departure_time of Journey "
-                        "(ex. ?departure_date=2023-11-11)"
+                    "Filter by departure_time of Journey "
+                    "(ex. ?departure_date=2023-11-11)"
                 ),
             ),
+            OpenApiParameter(
+                "stream",
+                type=OpenApiTypes.BOOL,
+                description="Stream the whole list as one JSON array (staff only)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        etag = journey_list_etag(request.query_params)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified = None
+        if str(kwargs["pk"]).isdigit():
+            last_modified = (
+                Journey.objects.filter(pk=kwargs["pk"])
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(kwargs["pk"], last_modified)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag)
+
+
+class JourneyPlanView(generics.GenericAPIView):
+    queryset = Journey.objects.select_related(
+        "route__source", "route__destination", "train"
+    )
+    serializer_class = ItinerarySerializer
+    permission_classes = (IsAuthenticated,)
+    query_budget = 3
+
+    def get_connections(self, depart_after):
+        if settings.JOURNEY_TIMETABLE_INDEX:
+            return get_timetable().connections(
+                depart_after, depart_after + settings.PLANNER_SEARCH_WINDOW
+            )
+
+        return [Connection(*journey) for journey in journey_connections(depart_after)]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Departure station id (ex. ?from=1)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=OpenApiTypes.INT,
+                required=True,
+                description="Arrival station id (ex. ?to=2)",
+            ),
+            OpenApiParameter(
+                "depart_after",
+                type=OpenApiTypes.DATETIME,
+                description="Earliest departure, now by default",
+            ),
+            OpenApiParameter(
+                "min_transfer",
+                type=OpenApiTypes.INT,
+                description="Minimum transfer time in minutes, 10 by default",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description="Maximum number of itineraries (1-10), 3 by default",
+            ),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        """Itineraries connecting journeys through intermediate stations"""
+        query = JourneyPlanQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        depart_after = query.validated_data.get("depart_after") or timezone.now()
+
+        itineraries = plan_itineraries(
+            self.get_connections(depart_after),
+            origin=query.validated_data["from"],
+            destination=query.validated_data["to"],
+            depart_after=depart_after,
+            min_transfer=timedelta(minutes=query.validated_data["min_transfer"]),
+            limit=query.validated_data["limit"],
+        )
+        journeys = self.get_queryset().in_bulk(
+            {leg.journey_id for legs in itineraries for leg in legs}
+        )
+        serializer = self.get_serializer(
+            itinerary_data(itineraries, journeys), many=True
+        )
+
+        return Response(serializer.data)
 
 
 class OrderPagination(PageNumberPagination):
@@ -132,19 +493,27 @@ class OrderPagination(PageNumberPagination):
 
 
 class OrderViewSet(
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     GenericViewSet,
 ):
     queryset = Order.objects.prefetch_related(
-        "tickets__journey__train", "tickets__journey__route"
+        Prefetch(
+            "tickets",
+            queryset=Ticket.objects.select_related("journey__train__train_type"),
+        ),
+        "tickets__journey__crews",
     )
     serializer_class = OrderSerializer
+    values_serializer_class = OrderValuesSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
+    query_budget = {"list": 5, "create": 16}
+    throttle_scope = {"create": "booking"}
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        return self.queryset.filter(user=self.request.user)
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -154,3 +523,109 @@ class OrderViewSet(
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+class ExportView(generics.GenericAPIView):
+    """Base for staff-only CSV/NDJSON downloads streamed in constant memory"""
+
+    permission_classes = (IsAdminUser,)
+    query_budget = 2
+    export_name = None
+    columns = ()
+    chunk_size = 2000
+
+    # Lookups used by the journey, route and date range filters
+    journey_lookup = None
+    route_lookup = None
+    created_at_lookup = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def filter_export(self, queryset, params):
+        # One filter() call, so lookups across tickets share a single join
+        lookups = {}
+        if "journey" in params:
+            lookups[self.journey_lookup] = params["journey"]
+        if "route" in params:
+            lookups[self.route_lookup] = params["route"]
+        if "date_from" in params:
+            lookups[f"{self.created_at_lookup}__gte"] = start_of_day(
+                params["date_from"]
+            )
+        if "date_to" in params:
+            lookups[f"{self.created_at_lookup}__lt"] = start_of_day(
+                params["date_to"] + timedelta(days=1)
+            )
+        return queryset.filter(**lookups)
+
+    @extend_schema(
+        parameters=[ExportQuerySerializer],
+        responses={(200, "text/csv"): OpenApiTypes.STR},
+    )
+    def get(self, request, *args, **kwargs):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        rows = (
+            self.filter_export(self.get_queryset(), query.validated_data)
+            .values_list(*(lookup for _, lookup in self.columns))
+            .iterator(chunk_size=self.chunk_size)
+        )
+        return export_response(
+            self.export_name,
+            [name for name, _ in self.columns],
+            rows,
+            query.validated_data["output"],
+        )
+
+
+class TicketExportView(ExportView):
+    """Tickets with their order and journey, filterable by order date"""
+
+    export_name = "tickets"
+    columns = (
+        ("ticket_id", "id"),
+        ("order_id", "order_id"),
+        ("user_id", "order__user_id"),
+        ("ordered_at", "order__created_at"),
+        ("journey_id", "journey_id"),
+        ("route_id", "journey__route_id"),
+        ("source", "journey__route__source__name"),
+        ("destination", "journey__route__destination__name"),
+        ("departure_time", "journey__departure_time"),
+        ("cargo", "cargo"),
+        ("seat", "seat"),
+    )
+    journey_lookup = "journey_id"
+    route_lookup = "journey__route_id"
+    created_at_lookup = "order__created_at"
+
+    def get_queryset(self):
+        return Ticket.objects.order_by("id")
+
+
+class OrderExportView(ExportView):
+    """Orders with their ticket count (only matching tickets when filtered)"""
+
+    export_name = "orders"
+    columns = (
+        ("order_id", "id"),
+        ("user_id", "user_id"),
+        ("user_email", "user__email"),
+        ("created_at", "created_at"),
+        ("tickets", "ticket_count"),
+    )
+    journey_lookup = "tickets__journey_id"
+    route_lookup = "tickets__journey__route_id"
+    created_at_lookup = "created_at"
+
+    def get_queryset(self):
+        return Order.objects.order_by("id")
+
+    def filter_export(self, queryset, params):
+        return (
+            super()
+            .filter_export(queryset, params)
+            .annotate(ticket_count=Count("tickets"))
+        )
@@ -13,16 +13,35 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-%eqxjv_s1w1eq2y6p&h2g^+(_s3llmian6o+j5d5%t-dut@!wa"
+# The fallback is for development only, check --deploy rejects it
+SECRET_KEY = os.environ.get(
+    "DJANGO_SECRET_KEY",
+    "django-insecure-%eqxjv_s1w1eq2y6p&h2g^+(_s3llmian6o+j5d5%t-dut@!wa",
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DJANGO_DEBUG", "True") == "True"
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
+
+# Opt-in for the TLS deployment, check --deploy warns while they are off.
+# Secure cookies follow the redirect, a browser drops them over plain HTTP
+SECURE_SSL_REDIRECT = os.environ.get("DJANGO_SECURE_SSL_REDIRECT") == "True"
+SECURE_HSTS_SECONDS = int(os.environ.get("DJANGO_SECURE_HSTS_SECONDS", 0))
+SESSION_COOKIE_SECURE = SECURE_SSL_REDIRECT
+CSRF_COOKIE_SECURE = SECURE_SSL_REDIRECT
+
+SILENCED_SYSTEM_CHECKS = [
+    check
+    for check in os.environ.get("DJANGO_SILENCED_SYSTEM_CHECKS", "").split(",")
+    if check
+]
 # Application definition
 
 INSTALLED_APPS = [
@@ -32,7 +51,6 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "rest_framework",
     "drf_spectacular",
     "train_station",
@@ -41,15 +59,20 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "train_station.query_budget.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if DEBUG:
+    # Sync-only, under ASGI it would run every async view in a thread
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "train_station_api_service.urls"
 
 TEMPLATES = [
@@ -81,10 +104,49 @@ DATABASES = {
         "NAME": os.environ["POSTGRES_DB"],
         "USER": os.environ["POSTGRES_USER"],
         "PASSWORD": os.environ["POSTGRES_PASSWORD"],
+        # Every worker thread keeps its connection open for CONN_MAX_AGE
+        # seconds and checks it is still alive before reusing it. Set
+        # DB_CONN_MAX_AGE=0 for ASGI workers, which can't reuse connections.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+TOKEN_REVOCATION_CACHE_BACKEND = os.environ.get(
+    "TOKEN_REVOCATION_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    },
+    # Must be shared by all workers and kept apart from evictable entries,
+    # a lost entry lets revoked access tokens through (see user/checks.py).
+    # The database cache default costs a query per authenticated request,
+    # .env.sample points it at Redis
+    "token-revocation": {
+        "BACKEND": TOKEN_REVOCATION_CACHE_BACKEND,
+        "LOCATION": os.environ.get(
+            "TOKEN_REVOCATION_CACHE_LOCATION", "token_revocation_cache"
+        ),
+    },
+}
+
+if TOKEN_REVOCATION_CACHE_BACKEND.endswith(".DatabaseCache"):
+    # Culling at the default 300 entries would drop live revocations
+    CACHES["token-revocation"]["OPTIONS"] = {"MAX_ENTRIES": 1_000_000}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -132,13 +194,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "train_station.throttling.AnonSlidingWindowThrottle",
+        "train_station.throttling.UserSlidingWindowThrottle",
+        "train_station.throttling.ScopedSlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "20/min", "user": "50/min"},
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "20/min",
+        "user": "50/min",
+        # Orders and seat holds, on top of the user rate
+        "booking": "10/min",
+    },
+    "DEFAULT_AUTHENTICATION_CLASSES": ("user.authentication.ClaimsJWTAuthentication",),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -154,10 +220,49 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Raise QueryBudgetExceeded instead of logging, the test runner turns it on
+QUERY_BUDGET_STRICT = False
+
+TEST_RUNNER = "train_station_api_service.test_runner.QueryBudgetTestRunner"
+
+# X-DB-Queries / X-DB-Time response headers, development only
+QUERY_STATS_HEADERS = DEBUG
+
+RESPONSE_CACHE = {
+    "CACHE": "default",
+    "TIMEOUT": 60 * 60,
+}
+
+SEAT_HOLDS = {
+    "BACKEND": "train_station.holds.CacheSeatHoldBackend",
+    "CACHE": "default",
+    "TTL": 600,
+}
+
+# Throttle counters, shared between workers when the cache is (Redis)
+RATE_LIMITS = {
+    "BACKEND": "train_station.throttling.CacheRateLimitBackend",
+    "CACHE": "default",
+}
+
+JOURNEY_TIMETABLE_INDEX = True
+# Filtered lists matching more journeys are queried through the indexes
+JOURNEY_TIMETABLE_MAX_IDS = 500
+PLANNER_SEARCH_WINDOW = timedelta(days=2)
+
+# Serialize the journey and order lists straight from .values() rows
+FAST_LIST_SERIALIZATION = False
+
 ACCESS_TOKEN_LIFETIME = timedelta(minutes=120)
 REFRESH_TOKEN_LIFETIME = timedelta(days=1)
 
+TOKEN_REVOCATION = {
+    "CACHE": "token-revocation",
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": ACCESS_TOKEN_LIFETIME,
     "REFRESH_TOKEN_LIFETIME": REFRESH_TOKEN_LIFETIME,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.VersionedTokenRefreshSerializer",
 }
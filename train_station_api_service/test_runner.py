@@ -0,0 +1,10 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryBudgetTestRunner(DiscoverRunner):
+    """Runs the tests with QUERY_BUDGET_STRICT, an overrun fails the request"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_STRICT = True
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+TOKEN_VERSION_CLAIM = "ver"
+# Mirrored from the user row into every token, request.user is built from them
+USER_CLAIMS = ("email", "is_active", "is_staff", "is_superuser")
+
+
+def set_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    return token
+
+
+def revocation_cache():
+    return caches[settings.TOKEN_REVOCATION["CACHE"]]
+
+
+def revocation_key(user_id):
+    return f"token-revocation:{user_id}"
+
+
+def revoke_tokens(user_id, version):
+    """
+    Rejects the user's access tokens with a version below ``version``. The
+    entry only has to outlive the access tokens issued before it.
+    """
+    revocation_cache().set(
+        revocation_key(user_id),
+        version,
+        timeout=settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds(),
+    )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Trusts the signed user claims of the access token instead of loading
+    the user row on every request. The user is an unsaved instance carrying
+    only the claims, so views that edit the user load it themselves.
+    Tokens without a version claim fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not validated_token.get("is_active"):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        revoked_below = revocation_cache().get(revocation_key(user_id))
+        if (
+            revoked_below is not None
+            and validated_token[TOKEN_VERSION_CLAIM] < revoked_below
+        ):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        user = get_user_model()(
+            **{api_settings.USER_ID_FIELD: user_id},
+            **{claim: validated_token.get(claim) for claim in USER_CLAIMS},
+            token_version=validated_token[TOKEN_VERSION_CLAIM],
+        )
+        user._state.adding = False
+        return user
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches)
+def check_token_revocation_cache(app_configs, **kwargs):
+    """Revocations have to reach every worker, or revoked tokens stay valid"""
+    alias = settings.TOKEN_REVOCATION["CACHE"]
+    if alias not in settings.CACHES:
+        return [
+            Error(
+                f"TOKEN_REVOCATION uses the undefined cache {alias!r}.",
+                id="user.E001",
+            )
+        ]
+    if settings.CACHES[alias]["BACKEND"] in PROCESS_LOCAL_CACHES:
+        return [
+            Error(
+                f"The token revocation cache {alias!r} is process-local.",
+                hint="Use a shared backend such as RedisCache or DatabaseCache.",
+                id="user.E002",
+            )
+        ]
+    return []
@@ -0,0 +1,5 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.ClaimsJWTAuthentication"
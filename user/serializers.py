@@ -1,5 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from user.authentication import TOKEN_VERSION_CLAIM, set_user_claims
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -20,3 +29,32 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return set_user_claims(super().get_token(user), user)
+
+
+class VersionedTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refreshing checks the token version against the user row"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if TOKEN_VERSION_CLAIM in refresh:
+            is_current = (
+                get_user_model()
+                .objects.filter(
+                    **{
+                        api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM],
+                        "token_version": refresh[TOKEN_VERSION_CLAIM],
+                        "is_active": True,
+                    }
+                )
+                .exists()
+            )
+            if not is_current:
+                raise InvalidToken(_("Token has been revoked"))
+
+        return super().validate(attrs)
@@ -0,0 +1,52 @@
+import functools
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from user.authentication import USER_CLAIMS, revoke_tokens
+from user.models import User
+
+
+# Changing any of these invalidates the tokens issued so far
+TOKEN_FIELDS = ("password", *USER_CLAIMS)
+
+
+@receiver(pre_save, sender=User)
+def check_token_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_token_version = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(TOKEN_FIELDS):
+        return
+
+    previous = (
+        User.objects.filter(pk=instance.pk)
+        .values("token_version", *TOKEN_FIELDS)
+        .first()
+    )
+    if previous is not None and any(
+        previous[field] != getattr(instance, field) for field in TOKEN_FIELDS
+    ):
+        instance._previous_token_version = previous["token_version"]
+
+
+@receiver(post_save, sender=User)
+def bump_token_version(sender, instance, **kwargs):
+    if getattr(instance, "_previous_token_version", None) is None:
+        return
+
+    instance.token_version = instance._previous_token_version + 1
+    instance._previous_token_version = None
+    User.objects.filter(pk=instance.pk).update(token_version=instance.token_version)
+    # A rolled back change must not reject the tokens issued meanwhile
+    transaction.on_commit(
+        functools.partial(revoke_tokens, instance.pk, instance.token_version)
+    )
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    transaction.on_commit(
+        functools.partial(revoke_tokens, instance.pk, instance.token_version + 1)
+    )
@@ -1,3 +1,206 @@
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from train_station.models import Order
+from train_station.tests.query_budget import QueryBudgetTestMixin
+from user.checks import check_token_revocation_cache
+from train_station.tests.test_train_station_api import sample_journey
+
+
+REGISTER_URL = reverse("user:create")
+TOKEN_URL = reverse("user:token_obtain_pair")
+REFRESH_URL = reverse("user:token_refresh")
+ME_URL = reverse("user:manage")
+STATION_URL = reverse("train_station:station-list")
+# Process-local revocation cache, rejected by the user.E002 check
+LOCAL_REVOCATION_CACHES = {
+    **settings.CACHES,
+    "token-revocation": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "token-revocation-tests",
+    },
+}
+
+
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "user@gmail.com",
+            "userpassword",
+        )
+
+    def login(self, email="user@gmail.com", password="userpassword"):
+        tokens = self.client.post(
+            TOKEN_URL, {"email": email, "password": password}
+        ).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return tokens
+
+    def test_token_carries_user_claims(self):
+        token = AccessToken(self.login()["access"])
+
+        self.assertEqual(token["email"], self.user.email)
+        self.assertIs(token["is_staff"], False)
+        self.assertEqual(token["ver"], self.user.token_version)
+
+    def test_read_makes_only_the_revocation_query(self):
+        self.login()
+        self.client.get(STATION_URL)
+
+        # The user row isn't loaded, the default database cache still costs
+        # one query for the revocation entry (none with Redis)
+        with self.assertNumQueries(1):
+            response = self.client.get(STATION_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_staff_claim_allows_writes(self):
+        self.login()
+        payload = {"name": "Kyiv", "latitude": 50.4, "longitude": 30.5}
+        response = self.client.post(STATION_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.login()
+        response = self.client.post(STATION_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_changed_user_tokens_are_revoked(self):
+        tokens = self.login()
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        response = self.client.get(STATION_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(REFRESH_URL, {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rolled_back_change_does_not_revoke(self):
+        self.login()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.user.is_staff = True
+                self.user.save()
+                transaction.set_rollback(True)
+
+        self.assertEqual(callbacks, [])
+        self.login()
+        self.assertEqual(self.client.get(STATION_URL).status_code, status.HTTP_200_OK)
+
+    def test_last_login_does_not_revoke(self):
+        self.login()
+        version = get_user_model().objects.get(pk=self.user.pk).token_version
+
+        self.login()
+
+        self.assertEqual(self.client.get(STATION_URL).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            get_user_model().objects.get(pk=self.user.pk).token_version, version
+        )
+
+    def test_manage_user(self):
+        old_tokens = self.login()
+
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.data["email"], self.user.email)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(ME_URL, {"password": "newpassword"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        response = self.client.post(REFRESH_URL, {"refresh": old_tokens["refresh"]})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.login(password="newpassword")
+        self.assertEqual(self.client.get(ME_URL).status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            REFRESH_URL, {"refresh": self.login(password="newpassword")["refresh"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_order_created_for_claims_user(self):
+        journey = sample_journey()
+        self.login()
+
+        response = self.client.post(
+            reverse("train_station:order-list"),
+            {"tickets": [{"journey": journey.id, "cargo": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.get().user, self.user)
+
+    def test_token_without_claims_loads_user(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+        self.client.get(STATION_URL)
+
+        with self.assertNumQueries(1):
+            self.client.get(STATION_URL)
+
+        self.user.delete()
+        self.assertEqual(
+            self.client.get(STATION_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+
+class UserQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_user_endpoints_within_budget(self):
+        response = self.client.post(
+            REGISTER_URL, {"email": "user@gmail.com", "password": "userpassword"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertWithinQueryBudget(response)
+
+        tokens = self.client.post(
+            TOKEN_URL, {"email": "user@gmail.com", "password": "userpassword"}
+        ).data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get(ME_URL)
+        self.assertWithinQueryBudget(response)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(ME_URL, {"email": "new@gmail.com"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(response)
+
+
+class TokenRevocationCacheCheckTests(TestCase):
+    def test_process_local_cache_is_rejected(self):
+        with override_settings(CACHES=LOCAL_REVOCATION_CACHES):
+            errors = check_token_revocation_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["user.E002"])
+        self.assertEqual(check_token_revocation_cache(None), [])
+
+
+class SchemaTests(TestCase):
+    def test_schema_has_bearer_scheme(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertEqual(
+            schema["components"]["securitySchemes"]["jwtAuth"]["scheme"], "bearer"
+        )
@@ -1,3 +1,4 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
@@ -6,11 +7,15 @@ from user.serializers import UserSerializer
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    query_budget = 2
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
+    # Writes revoke the old tokens, on the database cache that's 4-5 queries
+    query_budget = {"get": 2, "put": 11, "patch": 11}
 
     def get_object(self):
-        return self.request.user
+        # request.user only carries the token claims
+        return get_user_model().objects.get(pk=self.request.user.pk)